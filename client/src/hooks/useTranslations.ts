@@ -4,6 +4,40 @@ import { Language, defaultLanguage } from '@/lib/i18n';
 // Cache for loaded translations
 const translationCache: Record<string, Record<string, any>> = {};
 
+// Compiled bundles from scripts/build-locale-bundles.mjs (production builds):
+// one shared bundle per language plus one per route, each holding several namespaces
+const compiledManifest = Object.values(
+  import.meta.glob('../locales-compiled/manifest.json', { eager: true, import: 'default' })
+)[0] as { namespaces: Record<string, string> } | undefined;
+const compiledBundles = import.meta.glob('../locales-compiled/*/*.json', { import: 'default' });
+
+// Bundle loads in flight, so namespaces of the same bundle share one request
+const bundleRequests: Record<string, Promise<Record<string, any> | undefined>> = {};
+
+async function loadBundle(lang: Language, namespace: string): Promise<Record<string, any> | undefined> {
+  const bundle = import.meta.env.PROD ? compiledManifest?.namespaces[namespace] : undefined;
+  const load = bundle && compiledBundles[`../locales-compiled/${lang}/${bundle}.json`];
+  if (!load) {
+    return undefined;
+  }
+
+  const bundleKey = `${lang}/${bundle}`;
+  bundleRequests[bundleKey] ??= (load() as Promise<Record<string, Record<string, any>>>).then((data) => {
+    // Cache every namespace of the bundle
+    for (const [ns, translation] of Object.entries(data)) {
+      translationCache[`${lang}/${ns}`] ??= translation;
+    }
+    return data;
+  }).catch((error) => {
+    delete bundleRequests[bundleKey];
+    console.warn(`Failed to load locale bundle ${bundleKey}`, error);
+    return undefined;
+  });
+
+  const data = await bundleRequests[bundleKey];
+  return data?.[namespace];
+}
+
 // Dynamic import function for translation files
 async function loadTranslation(lang: Language, namespace: string): Promise<Record<string, any>> {
   const cacheKey = `${lang}/${namespace}`;
@@ -13,6 +47,11 @@ async function loadTranslation(lang: Language, namespace: string): Promise<Recor
     return translationCache[cacheKey];
   }
 
+  const bundled = await loadBundle(lang, namespace);
+  if (bundled) {
+    return bundled;
+  }
+
   try {
     // Dynamic import of JSON file
     const module = await import(`../locales/${lang}/${namespace}.json`);
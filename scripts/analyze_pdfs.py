@@ -1,21 +1,10 @@
 import json
 import os
-import subprocess
-import re
 
-def extract_text_from_pdf(pdf_path):
-    try:
-        # Use pdftotext to extract first 2 pages which usually contain title and abstract
-        result = subprocess.run(['pdftotext', '-f', '1', '-l', '2', pdf_path, '-'], capture_output=True, text=True)
-        return result.stdout
-    except Exception as e:
-        print(f"Error reading {pdf_path}: {e}")
-        return ""
-
-def clean_text(text):
-    # Remove multiple spaces and newlines
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+from pdf_text import extract_many, ExtractionStats, TextCache
+from pdf_store import load_store, study_pdf_path
+from pdf_metadata import read_pdf_metadata, plausible_title
+import pdf_sections
 
 def guess_title(text, filename):
     # Heuristic: Title is often the first significant line, or lines in larger font (which we can't see in plain text)
@@ -35,18 +24,17 @@ def guess_title(text, filename):
             
     return filename.replace('.pdf', '').replace('-', ' ').replace('_', ' ')
 
-def extract_abstract(text):
-    # Look for "Abstract" or "Summary" keyword
-    match = re.search(r'(?:Abstract|Summary|Zusammenfassung)[:\s](.*?)(?:Introduction|Einleitung|Keywords|1\.)', text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return clean_text(match.group(1))[:500] + "..."
+def extract_abstract(sections):
+    # Look for the "Abstract" or "Summary" section
+    abstract = pdf_sections.extract_abstract(sections, max_len=500)
+    if abstract:
+        return abstract[:500] + ("" if abstract.endswith("...") else "...")
     
     # Fallback: Take the first substantial paragraph after the title
     # This is a rough heuristic
-    paragraphs = text.split('\n\n')
-    for p in paragraphs[1:5]: # Skip first paragraph (likely title/metadata)
+    for p in list(pdf_sections.paragraphs(sections))[1:5]: # Skip first paragraph (likely title/metadata)
         if len(p) > 100:
-            return clean_text(p)[:500] + "..."
+            return p[:500] + "..."
             
     return "Zusammenfassung wird generiert..."
 
@@ -57,41 +45,52 @@ def main():
     with open(json_path, 'r') as f:
         studies = json.load(f)
     
-    updated_studies = []
-    
-    # Create a map of existing IDs to avoid duplicates if needed, 
-    # but here we are mainly updating the PDF entries we created earlier
+    # Byte-identical copies resolve to one canonical file, extracted once
+    store = load_store(pdf_dir)
+    pdf_jobs = {}
     
     for study in studies:
         # Check if this is a PDF entry (we marked them with type 'pdf_document' or if ID is filename)
         if study.get('type') == 'pdf_document' or study['id'].endswith('.pdf'):
-            pdf_filename = study['id']
-            pdf_path = os.path.join(pdf_dir, pdf_filename)
+            pdf_path = study_pdf_path(study, pdf_dir, store)
+            if pdf_path:
+                pdf_jobs.setdefault(pdf_path, []).append(study)
+    
+    # Use pdftotext to extract first 2 pages which usually contain title and abstract,
+    # several files at a time, analyzing each one as soon as it is done
+    stats = ExtractionStats()
+    cache = TextCache()  # shared with the other analyze script
+    for pdf_path, raw_text in extract_many(pdf_jobs, first_page=1, last_page=2, stats=stats, cache=cache):
+        # The file that was actually resolved - the canonical copy, never a deleted alias
+        pdf_filename = os.path.basename(pdf_path)
+        for study in pdf_jobs[pdf_path]:
+            print(f"Analyzing {pdf_filename}...")
+            sections = pdf_sections.segment_sections(raw_text)
+            
+            # Improve Title - embedded metadata first, text heuristic as fallback
+            metadata = read_pdf_metadata(pdf_path)
+            if plausible_title(metadata.get('title'), pdf_filename):
+                real_title = metadata['title']
+            else:
+                real_title = guess_title(pdf_sections.front_matter(sections), pdf_filename)
+            # If the guessed title is too short or looks like garbage, keep the filename-based one but cleaned up
+            if len(real_title) < 5: 
+                real_title = study['title']
+            
+            # Improve Summary
+            summary = extract_abstract(sections)
+            if not summary or len(summary) < 20:
+                summary = "Detaillierte wissenschaftliche Analyse zu diesem Thema. Bitte laden Sie das vollständige PDF für weitere Informationen herunter."
             
-            if os.path.exists(pdf_path):
-                print(f"Analyzing {pdf_filename}...")
-                raw_text = extract_text_from_pdf(pdf_path)
-                
-                # Improve Title
-                real_title = guess_title(raw_text, pdf_filename)
-                # If the guessed title is too short or looks like garbage, keep the filename-based one but cleaned up
-                if len(real_title) < 5: 
-                    real_title = study['title']
-                
-                # Improve Summary
-                summary = extract_abstract(raw_text)
-                if not summary or len(summary) < 20:
-                    summary = "Detaillierte wissenschaftliche Analyse zu diesem Thema. Bitte laden Sie das vollständige PDF für weitere Informationen herunter."
-                
-                study['title'] = real_title
-                study['summary'] = summary
-                study['url'] = f"/documents/studies/{pdf_filename}" # Direct link to local PDF
-                study['publication'] = "PDF Download" # Indicate it's a file
-                
-        updated_studies.append(study)
+            study['title'] = real_title
+            study['summary'] = summary
+            study['url'] = f"/documents/studies/{pdf_filename}" # Direct link to local PDF
+            study['publication'] = "PDF Download" # Indicate it's a file
+    stats.report()
+    cache.close()
         
     with open(json_path, 'w') as f:
-        json.dump(updated_studies, f, indent=2, ensure_ascii=False)
+        json.dump(studies, f, indent=2, ensure_ascii=False)
         
     print("Updated studies.json with PDF analysis.")
 
@@ -1,11 +1,17 @@
 import json
 import os
-import subprocess
-import re
+
+from pdf_text import extract_many, ExtractionStats, TextCache
+from pdf_metadata import read_pdf_metadata, plausible_title, metadata_year
+from pdf_sections import segment_sections, front_matter, extract_abstract, extract_keywords, paragraphs
+from pdf_lines import scan_front_matter
+from study_index import KeyIndex
+from pdf_store import load_store, study_pdf_path
 
 # Load manual data from batches
 def load_batch_data():
-    manual_data = {}
+    # Indexed by canonical DOI/URL/filename, so any form of a study's url matches
+    manual_data = KeyIndex()
     
     files = [
         "/home/ubuntu/fetch_study_metadata_batch_1.json",
@@ -18,85 +24,44 @@ def load_batch_data():
                 data = json.load(f)
                 for item in data.get('results', []):
                     if not item.get('error'):
-                        # Normalize URL/DOI to match ID or existing URL
-                        url = item['input']
-                        manual_data[url] = item['output']
-                        
-                        # Also map by DOI if present in URL
-                        doi_match = re.search(r'10\.\d{4,}/[-._;()/:a-zA-Z0-9]+', url)
-                        if doi_match:
-                            manual_data[doi_match.group(0)] = item['output']
+                        manual_data.add(item['input'], item['output'])
                             
     return manual_data
 
-def extract_text_from_pdf(pdf_path):
-    try:
-        # Extract first 3 pages to be safe
-        result = subprocess.run(['pdftotext', '-f', '1', '-l', '3', '-layout', pdf_path, '-'], capture_output=True, text=True)
-        return result.stdout
-    except Exception as e:
-        print(f"Error reading {pdf_path}: {e}")
-        return ""
-
-def clean_text(text):
-    return re.sub(r'\s+', ' ', text).strip()
-
-def is_junk_line(line):
-    line = line.strip().lower()
-    junk_starts = ['downloaded from', 'http', 'www', 'vol.', 'no.', 'pp.', 'page', 'copyright', 'journal of', 'clinical medicine', 'review article', 'original article', 'research article']
-    if len(line) < 5: return True
-    if any(line.startswith(s) for s in junk_starts): return True
-    if re.match(r'^\d+$', line): return True # Page numbers
-    return False
+def front_matter_fields(text, filename):
+    """Return (title, authors) from the front matter, labelling each line once"""
+    title, authors = scan_front_matter(text)
+    if len(title) <= 10:
+        # Fallback to filename cleanup
+        title = filename.replace('.pdf', '').replace('-', ' ').replace('_', ' ')
+    return title, authors
 
 def smart_title_extraction(text, filename):
-    lines = text.split('\n')
-    candidates = []
-    
-    # Skip first few lines if they look like headers
-    start_idx = 0
-    for i, line in enumerate(lines[:10]):
-        if is_junk_line(line):
-            continue
-        else:
-            start_idx = i
-            break
-            
-    # Collect potential title lines
-    title_buffer = []
-    for line in lines[start_idx:start_idx+5]:
-        if not is_junk_line(line):
-            title_buffer.append(line.strip())
-        else:
-            if title_buffer: break # Stop at first junk line after title start
-            
-    if title_buffer:
-        title = " ".join(title_buffer)
-        # Cleanup
-        title = re.sub(r'\s+', ' ', title).strip()
-        if len(title) > 10:
-            return title
-            
-    # Fallback to filename cleanup
-    return filename.replace('.pdf', '').replace('-', ' ').replace('_', ' ')
+    return front_matter_fields(text, filename)[0]
 
-def smart_summary_extraction(text):
-    # Try to find Abstract section
-    match = re.search(r'(?:Abstract|Summary|Zusammenfassung)\s*\n(.*?)(?:Introduction|Einleitung|Keywords|1\.|Key words)', text, re.DOTALL | re.IGNORECASE)
-    if match:
-        summary = clean_text(match.group(1))
-        if len(summary) > 50:
-            return summary[:800] + ("..." if len(summary) > 800 else "")
+def smart_summary_extraction(sections):
+    # Try the Abstract section
+    summary = extract_abstract(sections)
+    if len(summary) > 50:
+        return summary
             
     # Fallback: First substantial paragraph
-    paragraphs = text.split('\n\n')
-    for p in paragraphs:
-        cleaned = clean_text(p)
+    for cleaned in paragraphs(sections):
         if len(cleaned) > 200 and "References" not in cleaned and "Copyright" not in cleaned:
             return cleaned[:800] + "..."
             
     return "Zusammenfassung wird generiert..."
 
+def needs_title(study):
+    # Only update if we don't have a good title yet (heuristic)
+    # Or if the current title looks like a filename
+    title = study['title']
+    return title == study['id'] or '_' in title or '.pdf' in title
+
+def needs_summary(study):
+    # Always try to improve summary if it's generic
+    return "Zusammenfassung wird generiert" in study['summary'] or len(study['summary']) < 50
+
 def main():
     json_path = "/home/ubuntu/kava-wiki/client/src/data/studies.json"
     pdf_dir = "/home/ubuntu/kava-wiki/client/public/documents/studies"
@@ -105,20 +70,15 @@ def main():
         studies = json.load(f)
         
     manual_data = load_batch_data()
+    # Byte-identical copies resolve to one canonical file, extracted once
+    store = load_store(pdf_dir)
     
-    updated_studies = []
+    pdf_jobs = {}
     
     for study in studies:
         # 1. Apply Manual Data Updates (from Batches)
         # Check if URL or DOI matches
-        matched_data = None
-        if study.get('url') in manual_data:
-            matched_data = manual_data[study['url']]
-        else:
-            # Try to find DOI in study URL
-            doi_match = re.search(r'10\.\d{4,}/[-._;()/:a-zA-Z0-9]+', study.get('url', ''))
-            if doi_match and doi_match.group(0) in manual_data:
-                matched_data = manual_data[doi_match.group(0)]
+        matched_data = manual_data.lookup(study.get('url', ''))
                 
         if matched_data:
             print(f"Updating {study['title']} with manual data...")
@@ -130,30 +90,56 @@ def main():
             
         # 2. Apply Advanced PDF Analysis
         elif study.get('type') == 'pdf_document' or study['id'].endswith('.pdf'):
-            pdf_filename = study['id']
-            pdf_path = os.path.join(pdf_dir, pdf_filename)
+            pdf_path = study_pdf_path(study, pdf_dir, store)
             
-            if os.path.exists(pdf_path):
-                print(f"Re-analyzing PDF: {pdf_filename}")
-                raw_text = extract_text_from_pdf(pdf_path)
+            if pdf_path:
+                pdf_filename = os.path.basename(pdf_path)
+                # Embedded metadata first - no page decoding needed
+                if needs_title(study):
+                    metadata = read_pdf_metadata(pdf_path)
+                    if plausible_title(metadata.get('title'), pdf_filename):
+                        print(f"Using embedded metadata: {pdf_filename}")
+                        study['title'] = metadata['title']
+                        if not study.get('authors') and metadata.get('author'):
+                            study['authors'] = metadata['author']
+                        # process_studies.py fills PDF entries with a placeholder year of 2025
+                        if metadata_year(metadata) and study.get('year') in ('', '2025', 'Unknown'):
+                            study['year'] = metadata_year(metadata)
                 
-                # Only update if we don't have a good title yet (heuristic)
-                # Or if the current title looks like a filename
-                if study['title'] == pdf_filename or '_' in study['title'] or '.pdf' in study['title']:
-                    new_title = smart_title_extraction(raw_text, pdf_filename)
-                    study['title'] = new_title
-                    
-                # Always try to improve summary if it's generic
-                if "Zusammenfassung wird generiert" in study['summary'] or len(study['summary']) < 50:
-                    study['summary'] = smart_summary_extraction(raw_text)
-                    
                 study['url'] = f"/documents/studies/{pdf_filename}"
                 study['publication'] = "PDF Download"
-
-        updated_studies.append(study)
+                
+                # Fall back to text extraction only for what is still missing
+                if needs_title(study) or needs_summary(study):
+                    pdf_jobs.setdefault(pdf_path, []).append(study)
+    
+    # Extract in parallel (first 3 pages, layout mode) and analyze results as they arrive
+    stats = ExtractionStats()
+    cache = TextCache()  # shared with the other analyze script
+    for pdf_path, raw_text in extract_many(pdf_jobs, first_page=1, last_page=3, layout=True, stats=stats, cache=cache):
+        # Title, summary and keywords all read from one segmentation of the text
+        pdf_filename = os.path.basename(pdf_path)
+        for study in pdf_jobs[pdf_path]:
+            print(f"Re-analyzing PDF: {pdf_filename}")
+            sections = segment_sections(raw_text)
+            
+            title, authors = front_matter_fields(front_matter(sections), pdf_filename)
+            if needs_title(study):
+                study['title'] = title
+            if authors and not study.get('authors'):
+                study['authors'] = authors
+            
+            if needs_summary(study):
+                study['summary'] = smart_summary_extraction(sections)
+            
+            keywords = extract_keywords(sections)
+            if keywords and not study.get('keywords'):
+                study['keywords'] = keywords
+    stats.report()
+    cache.close()
         
     with open(json_path, 'w') as f:
-        json.dump(updated_studies, f, indent=2, ensure_ascii=False)
+        json.dump(studies, f, indent=2, ensure_ascii=False)
         
     print("Finished updating studies.json")
 
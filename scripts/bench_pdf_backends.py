@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PDF text backends on the studies corpus.
+
+For every installed backend this extracts the first 3 pages of each PDF
+(the same range analyze_pdfs_v2.py uses) and reports per-file latency, peak
+memory and extraction quality, measured as how often the title heuristic
+recovers the curated title stored in studies.json.
+
+Usage: python bench_pdf_backends.py [pdf_dir] [studies.json]
+"""
+
+import difflib
+import glob
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+from pdf_text import BACKENDS
+from analyze_pdfs_v2 import smart_title_extraction
+from pdf_sections import segment_sections, front_matter
+
+PDF_DIR = "/home/ubuntu/kava-wiki/client/public/documents/studies"
+STUDIES_PATH = "/home/ubuntu/kava-wiki/client/src/data/studies.json"
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def title_matches(extracted, curated, threshold=0.8):
+    ratio = difflib.SequenceMatcher(None, normalize(extracted), normalize(curated)).ratio()
+    return ratio >= threshold
+
+
+def bench_backend(backend, pdf_paths, curated_titles):
+    latencies = []
+    matched = compared = failures = 0
+    children_rss_before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    tracemalloc.start()
+
+    for pdf_path in pdf_paths:
+        started = time.perf_counter()
+        try:
+            text = backend.extract(pdf_path, 1, 3, layout=True)
+        except Exception:
+            failures += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+        filename = os.path.basename(pdf_path)
+        if filename in curated_titles:
+            compared += 1
+            if title_matches(smart_title_extraction(front_matter(segment_sections(text)), filename), curated_titles[filename]):
+                matched += 1
+
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # ru_maxrss is in KiB on Linux; it only grows, so this is the largest child seen
+    children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    peak_mb = python_peak / 1e6 if backend.in_process else max(children_rss, children_rss_before) / 1e3
+
+    return {
+        'files': len(latencies),
+        'failures': failures,
+        'total_s': sum(latencies),
+        'median_ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95_ms': sorted(latencies)[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+        'peak_mb': peak_mb,
+        'titles': f"{matched}/{compared}",
+    }
+
+
+def main():
+    pdf_dir = sys.argv[1] if len(sys.argv) > 1 else PDF_DIR
+    studies_path = sys.argv[2] if len(sys.argv) > 2 else STUDIES_PATH
+
+    pdf_paths = sorted(glob.glob(os.path.join(pdf_dir, "*.pdf")))
+    with open(studies_path, 'r', encoding='utf-8') as f:
+        curated_titles = {s['id']: s['title'] for s in json.load(f) if s.get('id', '').endswith('.pdf')}
+
+    print(f"Benchmarking {len(pdf_paths)} PDFs from {pdf_dir}\n")
+    print(f"{'backend':<10} {'files':>6} {'fail':>5} {'total s':>8} {'median ms':>10} "
+          f"{'p95 ms':>8} {'peak MB':>8} {'titles':>8}")
+    for name, backend_class in BACKENDS.items():
+        if not backend_class.available():
+            print(f"{name:<10} (not installed)")
+            continue
+        r = bench_backend(backend_class(), pdf_paths, curated_titles)
+        print(f"{name:<10} {r['files']:>6} {r['failures']:>5} {r['total_s']:>8.2f} {r['median_ms']:>10.1f} "
+              f"{r['p95_ms']:>8.1f} {r['peak_mb']:>8.1f} {r['titles']:>8}")
+    print("\npeak MB: Python heap for in-process backends, max child RSS for subprocess backends")
+
+
+if __name__ == "__main__":
+    main()
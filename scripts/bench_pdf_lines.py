@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: title/author detection with the line classifier vs the old
+is_junk_line windows, over real first pages.
+
+The corpus is either a directory of .txt files (one first page each) or the
+studies PDF folder, whose first pages are read through the shared text cache.
+
+Usage: python bench_pdf_lines.py [pdf_or_txt_dir] [rounds]
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+
+from analyze_pdfs_v2 import front_matter_fields
+from pdf_text import extract_many, TextCache
+
+PDF_DIR = "/home/ubuntu/kava-wiki/client/public/documents/studies"
+
+
+def old_is_junk_line(line):
+    line = line.strip().lower()
+    junk_starts = ['downloaded from', 'http', 'www', 'vol.', 'no.', 'pp.', 'page', 'copyright', 'journal of', 'clinical medicine', 'review article', 'original article', 'research article']
+    if len(line) < 5: return True
+    if any(line.startswith(s) for s in junk_starts): return True
+    if re.match(r'^\d+$', line): return True # Page numbers
+    return False
+
+
+def old_smart_title_extraction(text, filename):
+    lines = text.split('\n')
+    start_idx = 0
+    for i, line in enumerate(lines[:10]):
+        if old_is_junk_line(line):
+            continue
+        else:
+            start_idx = i
+            break
+    title_buffer = []
+    for line in lines[start_idx:start_idx+5]:
+        if not old_is_junk_line(line):
+            title_buffer.append(line.strip())
+        else:
+            if title_buffer: break
+    if title_buffer:
+        title = re.sub(r'\s+', ' ', " ".join(title_buffer)).strip()
+        if len(title) > 10:
+            return title
+    return filename.replace('.pdf', '').replace('-', ' ').replace('_', ' ')
+
+
+def load_corpus(path):
+    txt_files = sorted(glob.glob(os.path.join(path, "*.txt")))
+    if txt_files:
+        corpus = []
+        for txt_path in txt_files:
+            with open(txt_path, 'r', encoding='utf-8') as f:
+                corpus.append((os.path.basename(txt_path), f.read()))
+        return corpus
+    cache = TextCache()
+    pdf_paths = sorted(glob.glob(os.path.join(path, "*.pdf")))
+    corpus = [(os.path.basename(p), text)
+              for p, text in extract_many(pdf_paths, first_page=1, last_page=1, layout=True, cache=cache)]
+    cache.close()
+    return corpus
+
+
+def time_per_document(fn, corpus, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for filename, text in corpus:
+            fn(text, filename)
+    return (time.perf_counter() - started) / (rounds * len(corpus))
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else PDF_DIR
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    corpus = load_corpus(path)
+    if not corpus:
+        print(f"No first pages found in {path}")
+        return
+
+    old = time_per_document(old_smart_title_extraction, corpus, rounds)
+    new = time_per_document(front_matter_fields, corpus, rounds)
+    changed = sum(old_smart_title_extraction(t, f) != front_matter_fields(t, f)[0] for f, t in corpus)
+
+    print(f"{len(corpus)} first pages, {rounds} rounds")
+    print(f"old is_junk_line windows: {old * 1e6:8.1f} µs/document")
+    print(f"line classifier:          {new * 1e6:8.1f} µs/document (title + authors)")
+    print(f"speedup:                  {old / new:8.2f}x")
+    print(f"titles that differ:       {changed}")
+
+
+if __name__ == "__main__":
+    main()
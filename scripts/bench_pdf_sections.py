@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Worst-case runtime of abstract extraction: old DOTALL regex vs section segmenter.
+
+The inputs repeat an abstract heading and never reach a terminating
+heading, which makes the lazy `(.*?)` scan restart at every heading and run
+to the end of the text each time. The segmenter visits every line once, so
+its time should only double when the input doubles.
+
+Usage: python bench_pdf_sections.py [max_lines]
+"""
+
+import re
+import sys
+import time
+
+from pdf_sections import segment_sections, extract_abstract
+
+OLD_ABSTRACT = re.compile(
+    r'(?:Abstract|Summary|Zusammenfassung)\s*\n(.*?)(?:Introduction|Einleitung|Keywords|1\.|Key words)',
+    re.DOTALL | re.IGNORECASE
+)
+
+
+def worst_case_text(lines):
+    # Every 10th line is a "Summary" heading and no terminating heading ever follows
+    filler = "kava lactone extract was administered to the cohort during treatment"
+    return '\n'.join(
+        "Summary" if i % 10 == 0 else filler
+        for i in range(lines)
+    )
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    max_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    sizes = []
+    n = 1000
+    while n <= max_lines:
+        sizes.append(n)
+        n *= 2
+
+    print(f"{'lines':>8} {'old regex ms':>14} {'segmenter ms':>14}")
+    for lines in sizes:
+        text = worst_case_text(lines)
+        old = best_of(lambda: OLD_ABSTRACT.search(text))
+        new = best_of(lambda: extract_abstract(segment_sections(text)))
+        print(f"{lines:>8} {old * 1000:>14.1f} {new * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark Excel ingestion at 1k/10k/100k rows.
+
+Compares the old row-by-row `iterrows` loop with the column-wise
+`process_excel` and the read-only `stream_excel` on synthetic exports with
+the same columns as the bibliography export. Reports wall time and peak
+Python heap (tracemalloc, which also sees pandas/numpy buffers).
+
+Usage: python bench_process_excel.py [rows ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from openpyxl import Workbook
+
+from process_studies import process_excel, stream_excel
+
+HEADER = ['DOI', 'Title', 'Authors', 'Journal', 'Publication date', 'Abstract']
+
+
+def make_workbook(path, rows):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Export")
+    sheet.append(HEADER)
+    for i in range(rows):
+        sheet.append([
+            f"10.1000/kava.{i}" if i % 20 else None,
+            f"Effects of kava extract on anxiety, study {i}",
+            "Doe J, Smith A, Müller K",
+            "Journal of Ethnopharmacology",
+            f"{1990 + i % 35}-0{1 + i % 9}-15",
+            "Kavalactones were administered to participants. " * 8,
+        ])
+    workbook.save(path)
+
+
+def iterrows_baseline(file_path):
+    # The previous implementation, kept here for comparison
+    def clean_text(text):
+        return "" if pd.isna(text) else str(text).strip()
+
+    df = pd.read_excel(file_path)
+    studies = []
+    for _, row in df.iterrows():
+        pub_date = str(row.get('Publication date', ''))
+        year = pub_date.split('-')[0] if '-' in pub_date else pub_date
+        studies.append({
+            "id": clean_text(row.get('DOI', '')),
+            "title": clean_text(row.get('Title', '')),
+            "authors": clean_text(row.get('Authors', '')),
+            "publication": clean_text(row.get('Journal', '')),
+            "year": year,
+            "summary": clean_text(row.get('Abstract', '')),
+            "significance": "",
+            "url": f"https://doi.org/{clean_text(row.get('DOI', ''))}" if row.get('DOI') else "",
+            "type": "scientific_paper",
+            "category": "Pharmacology & Safety",
+        })
+    return studies
+
+
+def measure(fn, path):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = 0
+    for _ in fn(path):
+        count += 1
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / 1e6
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 100000]
+    modes = [
+        ('iterrows', iterrows_baseline),
+        ('vectorized', process_excel),
+        ('streaming', stream_excel),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>8} {'mode':<11} {'seconds':>8} {'rows/s':>10} {'peak MB':>8}")
+        for rows in sizes:
+            path = os.path.join(tmp, f"export_{rows}.xlsx")
+            make_workbook(path, rows)
+            for name, fn in modes:
+                count, elapsed, peak_mb = measure(fn, path)
+                print(f"{rows:>8} {name:<11} {elapsed:>8.2f} {count / elapsed:>10.0f} {peak_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env node
+/**
+ * Locale bundle compiler for Kava Wiki
+ *
+ * Compiles client/src/locales/<lang>/<namespace>.json into minified bundles
+ * per language and route:
+ *
+ *   client/src/locales-compiled/<lang>/shared.json   namespaces of the layout and of 2+ routes
+ *   client/src/locales-compiled/<lang>/<route>.json  the other namespaces of one route
+ *   client/src/locales-compiled/manifest.json        namespace -> bundle, route -> namespaces
+ *
+ * Routes come from the German routes in client/src/App.tsx; the namespaces of
+ * a route are the ones its page and the components it imports pass to
+ * useTranslations/useRawTranslation. Every namespace is emitted once per
+ * language; namespaces no page uses (e.g. the hyphenated copies like
+ * wirkung-angst.json next to wirkungAngst.json) are left out.
+ *
+ * The production build of useTranslations loads a route's bundle (and the
+ * shared one, which stays cached across pages) instead of one file per
+ * namespace; in development it keeps loading the source files.
+ *
+ * Usage: node scripts/build-locale-bundles.mjs [--lang <code>] [--report <file.json>]
+ * Example: node scripts/build-locale-bundles.mjs --lang es
+ */
+
+import fs from 'fs';
+import path from 'path';
+import zlib from 'zlib';
+import { fileURLToPath } from 'url';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const srcDir = path.join(__dirname, '../client/src');
+const localesDir = path.join(srcDir, 'locales');
+const outDir = path.join(srcDir, 'locales-compiled');
+const SOURCE_LANG = 'de';
+// The layout renders on every route; its namespaces always go to the shared bundle
+const LAYOUT_COMPONENTS = ['Layout'];
+// A namespace used by at least this many routes goes to the shared bundle
+const SHARED_MIN_ROUTES = 2;
+
+function parseArgs() {
+  const args = process.argv.slice(2);
+  let reportLang = SOURCE_LANG;
+  let reportPath = null;
+
+  for (let i = 0; i < args.length; i++) {
+    if (args[i] === '--lang' && args[i + 1]) {
+      reportLang = args[i + 1];
+      i++;
+    } else if (args[i] === '--report' && args[i + 1]) {
+      reportPath = args[i + 1];
+      i++;
+    }
+  }
+
+  return { reportLang, reportPath };
+}
+
+/**
+ * Namespaces a source file passes to useTranslations / useRawTranslation
+ */
+function namespacesOf(file) {
+  const source = fs.readFileSync(file, 'utf-8');
+  const found = new Set();
+  const list = (text) => [...text.matchAll(/['"]([\w-]+)['"]/g)].map(m => m[1]);
+
+  for (const match of source.matchAll(/useTranslations\(\{[^}]*?namespaces:\s*(\[[^\]]*\]|[A-Za-z_]\w*)/g)) {
+    let value = match[1];
+    if (!value.startsWith('[')) {
+      // namespaces: NAMESPACES, declared as a constant array in the same file
+      const constant = source.match(new RegExp(`const\\s+${value}\\s*=\\s*(\\[[^\\]]*\\])`));
+      value = constant ? constant[1] : '[]';
+    }
+    list(value).forEach(ns => found.add(ns));
+  }
+  for (const match of source.matchAll(/useRawTranslation\(\s*[\w.]+\s*,\s*['"]([\w-]+)['"]/g)) {
+    found.add(match[1]);
+  }
+  return found;
+}
+
+/**
+ * Components a page imports from @/components (one level deep)
+ */
+function componentsOf(file) {
+  const source = fs.readFileSync(file, 'utf-8');
+  return [...source.matchAll(/from\s+['"]@\/components\/([\w/]+)['"]/g)].map(m => m[1]);
+}
+
+function componentNamespaces(name) {
+  const file = path.join(srcDir, 'components', `${name}.tsx`);
+  return fs.existsSync(file) ? namespacesOf(file) : new Set();
+}
+
+/**
+ * { route: Set(namespaces) } for the German routes of App.tsx
+ */
+function discoverRoutes() {
+  const app = fs.readFileSync(path.join(srcDir, 'App.tsx'), 'utf-8');
+  const routes = {};
+
+  for (const match of app.matchAll(/<Route\s+path="\/de(\/[^"]*)?"\s+component=\{(\w+)\}/g)) {
+    const route = match[1] ? match[1].slice(1).replace(/\//g, '-') : 'home';
+    const page = path.join(srcDir, 'pages', `${match[2]}.tsx`);
+    if (!fs.existsSync(page)) continue;
+
+    const namespaces = namespacesOf(page);
+    for (const component of componentsOf(page)) {
+      componentNamespaces(component).forEach(ns => namespaces.add(ns));
+    }
+    routes[route] = namespaces;
+  }
+  return routes;
+}
+
+function gzipSize(text) {
+  return zlib.gzipSync(text, { level: 9 }).length;
+}
+
+function formatBytes(bytes) {
+  return bytes >= 1024 * 1024 ? `${(bytes / 1024 / 1024).toFixed(1)} MB` : `${(bytes / 1024).toFixed(1)} kB`;
+}
+
+function main() {
+  const { reportLang, reportPath } = parseArgs();
+  const languages = fs.readdirSync(localesDir)
+    .filter(lang => fs.statSync(path.join(localesDir, lang)).isDirectory())
+    .sort();
+  const available = fs.readdirSync(path.join(localesDir, SOURCE_LANG))
+    .filter(name => name.endsWith('.json'))
+    .map(name => name.slice(0, -5));
+
+  const routes = discoverRoutes();
+  const shared = new Set();
+  LAYOUT_COMPONENTS.forEach(name => componentNamespaces(name).forEach(ns => shared.add(ns)));
+  const uses = {};
+  for (const namespaces of Object.values(routes)) {
+    namespaces.forEach(ns => { uses[ns] = (uses[ns] || 0) + 1; });
+  }
+  Object.entries(uses).filter(([, count]) => count >= SHARED_MIN_ROUTES).forEach(([ns]) => shared.add(ns));
+
+  // Every namespace lives in exactly one bundle
+  const bundleOf = {};
+  shared.forEach(ns => { bundleOf[ns] = 'shared'; });
+  for (const [route, namespaces] of Object.entries(routes)) {
+    namespaces.forEach(ns => { bundleOf[ns] ??= route; });
+  }
+  const missing = Object.keys(bundleOf).filter(ns => !available.includes(ns));
+  missing.forEach(ns => delete bundleOf[ns]);
+  const unused = available.filter(ns => !(ns in bundleOf));
+
+  fs.rmSync(outDir, { recursive: true, force: true });
+  const totals = { sourceBytes: 0, minifiedBytes: 0, bundleBytes: 0, bundleGzip: 0, files: 0 };
+  const visits = {};
+
+  for (const lang of languages) {
+    const content = {};
+    for (const ns of available) {
+      const file = path.join(localesDir, lang, `${ns}.json`);
+      if (!fs.existsSync(file)) continue;
+      const text = fs.readFileSync(file, 'utf-8');
+      content[ns] = JSON.parse(text);
+      totals.sourceBytes += Buffer.byteLength(text);
+      totals.minifiedBytes += Buffer.byteLength(JSON.stringify(content[ns]));
+    }
+
+    const bundles = {};
+    for (const [ns, bundle] of Object.entries(bundleOf)) {
+      if (content[ns] === undefined) continue;
+      (bundles[bundle] ??= {})[ns] = content[ns];
+    }
+
+    fs.mkdirSync(path.join(outDir, lang), { recursive: true });
+    const sizes = {};
+    for (const [bundle, data] of Object.entries(bundles)) {
+      const text = JSON.stringify(data);
+      fs.writeFileSync(path.join(outDir, lang, `${bundle}.json`), text);
+      sizes[bundle] = gzipSize(text);
+      totals.bundleBytes += Buffer.byteLength(text);
+      totals.bundleGzip += sizes[bundle];
+      totals.files++;
+    }
+
+    if (lang !== reportLang) continue;
+    // What one page view downloads, first page of a visit and any later page:
+    // before, one request per namespace file (the shared ones cached after the
+    // first page); after, the route bundle plus the shared bundle
+    const gzipOf = (namespaces) => namespaces.reduce((sum, ns) => sum + gzipSize(JSON.stringify(content[ns])), 0);
+    for (const [route, namespaces] of Object.entries(routes)) {
+      const own = [...namespaces].filter(ns => !shared.has(ns) && content[ns] !== undefined);
+      const common = [...shared].filter(ns => content[ns] !== undefined);
+      visits[route] = {
+        beforeFirst: gzipOf(own) + gzipOf(common),
+        beforeNext: gzipOf(own),
+        beforeRequests: own.length + common.length,
+        first: (sizes[route] || 0) + (sizes.shared || 0),
+        next: sizes[route] || 0,
+        requests: (sizes[route] ? 1 : 0) + (sizes.shared ? 1 : 0),
+      };
+    }
+  }
+
+  const manifest = {
+    namespaces: bundleOf,
+    routes: Object.fromEntries(Object.entries(routes).map(([route, ns]) => [route, [...ns].sort()])),
+  };
+  fs.writeFileSync(path.join(outDir, 'manifest.json'), JSON.stringify(manifest, null, 2) + '\n');
+
+  console.log(`\n📦 Locale bundles for ${languages.length} languages, ${Object.keys(routes).length} routes`);
+  console.log(`🔗 Shared: ${[...shared].filter(ns => ns in bundleOf).sort().join(', ')}`);
+  if (unused.length > 0) {
+    console.log(`🗑️  Not used by any page, left out: ${unused.join(', ')}`);
+  }
+  if (missing.length > 0) {
+    console.log(`⚠️  Used but missing in locales/${SOURCE_LANG}: ${missing.join(', ')}`);
+  }
+  console.log(`\nSource ${formatBytes(totals.sourceBytes)} (minified ${formatBytes(totals.minifiedBytes)}) -> `
+    + `${totals.files} bundles, ${formatBytes(totals.bundleBytes)} (${formatBytes(totals.bundleGzip)} gzip)`);
+
+  console.log(`\nOne page view in ${reportLang}, gzip bytes (first page of a visit / a later page) and requests:`);
+  const columns = ['before', 'later', 'req', 'after', 'later', 'req'];
+  console.log(`${'route'.padEnd(30)} ${columns.map((c, i) => c.padStart(i % 3 === 2 ? 4 : 9)).join(' ')}`);
+  const row = (name, v, count = 1) => console.log(`${name.padEnd(30)} `
+    + `${formatBytes(v.beforeFirst / count).padStart(9)} ${formatBytes(v.beforeNext / count).padStart(9)} `
+    + `${(v.beforeRequests / count).toFixed(count > 1 ? 1 : 0).padStart(4)} `
+    + `${formatBytes(v.first / count).padStart(9)} ${formatBytes(v.next / count).padStart(9)} `
+    + `${(v.requests / count).toFixed(count > 1 ? 1 : 0).padStart(4)}`);
+  const all = Object.entries(visits).sort(([a], [b]) => a.localeCompare(b));
+  all.forEach(([route, v]) => row(route, v));
+  if (all.length > 0) {
+    const sum = {};
+    all.forEach(([, v]) => Object.entries(v).forEach(([key, value]) => { sum[key] = (sum[key] || 0) + value; }));
+    row('average', sum, all.length);
+  }
+
+  if (reportPath) {
+    fs.writeFileSync(reportPath, JSON.stringify({ totals, unused, shared: [...shared], visits }, null, 2) + '\n');
+    console.log(`\n📝 Report written to ${reportPath}`);
+  }
+  console.log(`\n✅ Written to ${path.relative(process.cwd(), outDir) || outDir}\n`);
+}
+
+main();
@@ -0,0 +1,113 @@
+"""
+Content-hash manifest shared by the study ingestion scripts.
+
+The manifest remembers the size, mtime and SHA-256 of every source file that
+was ingested, plus a fingerprint of every row that was produced from it, so a
+re-run only has to look at inputs that actually changed.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_VERSION = 2  # 2: rows keyed by study_index.primary_key
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    """
+    Return the hex SHA-256 digest of a file.
+
+    The file is memory-mapped and fed to the hash in chunks, so no copies are
+    made; hashlib releases the GIL for each chunk, so several files can be
+    hashed in parallel from threads.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return digest.hexdigest()
+        with data, memoryview(data) as view:
+            for start in range(0, len(view), chunk_size):
+                digest.update(view[start:start + chunk_size])
+    return digest.hexdigest()
+
+
+def fingerprint(record):
+    """Return a stable hash of a JSON-serializable record"""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_manifest(path):
+    """Load a manifest, or return an empty one if it is missing or outdated"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    return {'version': MANIFEST_VERSION, 'files': {}, 'rows': {}}
+
+
+def save_manifest(manifest, path):
+    """Write the manifest atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def file_hash(manifest, path):
+    """
+    Return (sha256, changed) for a source file.
+
+    The stored digest is reused without reading the file when size and mtime
+    are unchanged; `changed` is True when the content differs from the last
+    recorded run (or the file is new).
+    """
+    stat = os.stat(path)
+    entry = manifest['files'].get(path)
+    if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+        return entry['sha256'], False
+
+    digest = sha256_file(path)
+    return digest, record_hash(manifest, path, stat, digest)
+
+
+def record_hash(manifest, path, stat, digest):
+    """Store a file's digest in the manifest, returning True if its content changed"""
+    entry = manifest['files'].get(path)
+    manifest['files'][path] = {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'sha256': digest,
+    }
+    return entry is None or entry['sha256'] != digest
+
+
+def hash_many(manifest, paths, max_workers=None):
+    """
+    Return {path: (sha256, changed)} for many files, hashing in parallel.
+
+    Files whose size and mtime match the manifest are not read at all; the
+    rest are hashed by a thread pool. The manifest is only updated from the
+    calling thread.
+    """
+    results = {}
+    stale = []
+    for path in paths:
+        stat = os.stat(path)
+        entry = manifest['files'].get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            results[path] = (entry['sha256'], False)
+        else:
+            stale.append((path, stat))
+    if stale:
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 4)) as pool:
+            digests = pool.map(sha256_file, [path for path, _ in stale])
+            for (path, stat), digest in zip(stale, digests):
+                results[path] = (digest, record_hash(manifest, path, stat, digest))
+    return results
@@ -1,5 +1,4 @@
-import json
-import os
+from study_patches import run
 
 # Explicit mapping of filenames/IDs to correct metadata
 # Based on user feedback and manual verification
@@ -190,51 +189,5 @@ FIXES = {
     }
 }
 
-def main():
-    json_path = "/home/ubuntu/kava-wiki/client/src/data/studies.json"
-    
-    with open(json_path, 'r') as f:
-        studies = json.load(f)
-        
-    updated_count = 0
-    
-    for study in studies:
-        # Check by ID (filename)
-        study_id = study.get('id', '')
-        
-        # Check by URL (DOI)
-        study_url = study.get('url', '')
-        
-        # Find match in FIXES
-        match = None
-        if study_id in FIXES:
-            match = FIXES[study_id]
-        elif study_url in FIXES:
-            match = FIXES[study_url]
-        # Try matching by partial ID for DOI-based IDs
-        else:
-            for key in FIXES:
-                if key in study_id or key in study_url:
-                    match = FIXES[key]
-                    break
-        
-        if match:
-            print(f"Fixing entry: {study.get('title', 'Unknown')}")
-            study['title'] = match['title']
-            study['authors'] = match['authors']
-            study['publication'] = match['publication']
-            study['year'] = match['year']
-            study['summary'] = match['summary']
-            # Only update URL if it's a PDF path correction, keep DOI links if they are valid
-            if '/documents/studies/' in match['url']:
-                 study['url'] = match['url']
-            
-            updated_count += 1
-            
-    with open(json_path, 'w') as f:
-        json.dump(studies, f, indent=2, ensure_ascii=False)
-        
-    print(f"Successfully updated {updated_count} entries in studies.json")
-
 if __name__ == "__main__":
-    main()
+    run([__file__])
@@ -1,5 +1,4 @@
-import json
-import os
+from study_patches import run
 
 # Explicit mapping of filenames/IDs to correct metadata based on 'AnweisungenzurKorrektur..rtf'
 FIXES = {
@@ -123,6 +122,11 @@ FIXES = {
         "summary": "Untersuchung der Toxizität von Kava Kava.",
         "url": "/documents/studies/ToxicityofKavaKava.pdf"
     },
+    # Decomposed, URL-encoded "O\u0308" left behind by the upload; the filename key matches either
+    # form, and the file on disk is named with the decomposed one, so the URL keeps it
+    "O\u0308ffentlichesGutachtenRechtliche_Einordnung_von_Kava_(Piper_methysticum)_als_Lebensmittel_in_der_EU.pdf": {
+        "url": "/documents/studies/O\u0308ffentlichesGutachtenRechtliche_Einordnung_von_Kava_(Piper_methysticum)_als_Lebensmittel_in_der_EU.pdf"
+    },
     "PublicLegalOpinionLegal_Classification_of_Kava_(Piper_methysticum)_as_a_Food_in_the_EU.pdf": {
         "title": "Legal Classification of Kava (Piper methysticum) as a Food in the EU",
         "authors": "Unknown",
@@ -144,53 +148,8 @@ REMOVE_LIST = [
     "public-statement-piper-methysticum-g-forst-rhizoma_en.pdf" # Duplicate check
 ]
 
-def main():
-    json_path = "/home/ubuntu/kava-wiki/client/src/data/studies.json"
-    
-    with open(json_path, 'r') as f:
-        studies = json.load(f)
-        
-    updated_studies = []
-    seen_titles = set()
-    
-    for study in studies:
-        # Remove unwanted entries
-        if study.get('id') in REMOVE_LIST or study.get('title') in REMOVE_LIST:
-            print(f"Removing entry: {study.get('title')}")
-            continue
-            
-        # Check for duplicates based on title (normalized)
-        title_norm = study.get('title', '').strip().lower()
-        if title_norm in seen_titles:
-             # Check if it's one of the specific duplicates mentioned
-             if "21 november 2017" in title_norm or "22 november 2016" in title_norm:
-                 print(f"Removing duplicate: {study.get('title')}")
-                 continue
-        
-        # Apply Fixes
-        study_id = study.get('id', '')
-        if study_id in FIXES:
-            match = FIXES[study_id]
-            print(f"Fixing entry: {study.get('title')} -> {match['title']}")
-            study['title'] = match['title']
-            study['authors'] = match['authors']
-            study['publication'] = match['publication']
-            study['year'] = match['year']
-            study['summary'] = match['summary']
-            study['url'] = match['url']
-            
-        # Fix specific URL issue
-        if "O%CC%88ffentlichesGutachten" in study.get('url', ''):
-             study['url'] = "/documents/studies/ÖffentlichesGutachtenRechtliche_Einordnung_von_Kava_(Piper_methysticum)_als_Lebensmittel_in_der_EU.pdf"
-
-        # Add to updated list if not skipped
-        updated_studies.append(study)
-        seen_titles.add(study.get('title', '').strip().lower())
-
-    with open(json_path, 'w') as f:
-        json.dump(updated_studies, f, indent=2, ensure_ascii=False)
-        
-    print(f"Successfully processed studies.json. Total entries: {len(updated_studies)}")
+# Titles that may appear twice; the later copy is removed
+DUPLICATE_TITLE_MARKERS = ["21 november 2017", "22 november 2016"]
 
 if __name__ == "__main__":
-    main()
+    run([__file__])
@@ -0,0 +1,157 @@
+"""
+Fuzzy title matching through a trigram inverted index.
+
+`TrigramIndex` stores each key's set of character trigrams and a posting
+list from trigram to keys. Scores are Dice coefficients of the trigram sets,
+so a short key cannot match a long title that merely mentions it, which was
+the false positive of plain substring matching.
+
+Candidate generation uses prefix filtering: to reach a Dice score of t, a key
+must share at least t/(2-t) of the query's trigrams, so it must share a
+minimum number of the query's rarest trigrams. Only the posting lists of
+those rare trigrams are walked, and only keys that reach that count and have
+a compatible size are verified (a set intersection each), which keeps
+matching thousands of titles against thousands of keys close to linear.
+
+When the two best candidates are within `ambiguity_margin` of each other,
+the match is reported as ambiguous instead of silently taking the first one.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+DEFAULT_THRESHOLD = 0.8
+AMBIGUITY_MARGIN = 0.05
+# Share of a query's (rarest) trigrams whose posting lists are walked
+PREFIX_SHARE = 0.5
+
+
+def normalize(text):
+    """Casefold, strip accents and punctuation, collapse whitespace"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    return ' '.join(re.sub(r'[\W_]+', ' ', text).split())
+
+
+def trigrams(text):
+    """Return the set of word trigrams of a normalized string (words padded like pg_trgm)"""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class Match:
+    """Result of a lookup: status is 'exact', 'fuzzy', 'ambiguous' or 'none'"""
+
+    def __init__(self, status, key=None, value=None, score=0.0, candidates=()):
+        self.status = status
+        self.key = key
+        self.value = value
+        self.score = score
+        # [(key, score)] of the best candidates, best first
+        self.candidates = list(candidates)
+
+    def __bool__(self):
+        return self.status in ('exact', 'fuzzy')
+
+    def __repr__(self):
+        return f"Match({self.status!r}, {self.key!r}, score={self.score:.2f})"
+
+
+class TrigramIndex:
+    """Inverted trigram index from keys (titles) to values"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, ambiguity_margin=AMBIGUITY_MARGIN):
+        self.threshold = threshold
+        self.ambiguity_margin = ambiguity_margin
+        self.keys = []        # key id -> original key
+        self.values = []      # key id -> value
+        self.grams = []       # key id -> set of trigrams
+        self.exact = {}       # normalized key -> key id
+        self.postings = {}    # trigram -> [key id]
+
+    def add(self, key, value):
+        """Index a value under a key; a duplicate normalized key replaces the earlier value"""
+        normalized = normalize(key)
+        if normalized in self.exact:
+            self.values[self.exact[normalized]] = value
+            return
+        key_id = len(self.keys)
+        grams = trigrams(normalized)
+        self.keys.append(key)
+        self.values.append(value)
+        self.grams.append(grams)
+        self.exact[normalized] = key_id
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(key_id)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def candidates(self, text, limit=3):
+        """Return the best [(key id, Dice score)] reaching the threshold, best first"""
+        grams = trigrams(normalize(text))
+        if not grams:
+            return []
+        size = len(grams)
+        ratio = self.threshold / (2 - self.threshold)
+        min_shared = max(1, math.ceil(ratio * size))
+        min_size, max_size = ratio * size, size / ratio
+        # Rarest trigrams first. The trigrams left out of the prefix can add at
+        # most size - prefix shared trigrams, so a key has to share the rest
+        # within the prefix; a longer prefix makes that count more selective
+        prefix = max(size - min_shared + 1, math.ceil(size * PREFIX_SHARE))
+        required = min_shared - (size - prefix)
+        ordered = sorted(grams, key=lambda g: len(self.postings.get(g, ())))
+        counts = Counter()
+        for gram in ordered[:prefix]:
+            counts.update(self.postings.get(gram, ()))
+        scored = []
+        for key_id, count in counts.items():
+            if count < required:
+                continue
+            key_grams = self.grams[key_id]
+            if not min_size <= len(key_grams) <= max_size:
+                continue
+            score = 2 * len(grams & key_grams) / (size + len(key_grams))
+            if score >= self.threshold:
+                scored.append((key_id, score))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def match(self, text):
+        """Return the Match for a text: exact, best fuzzy, ambiguous or none"""
+        key_id = self.exact.get(normalize(text))
+        if key_id is not None:
+            return Match('exact', self.keys[key_id], self.values[key_id], 1.0)
+        scored = self.candidates(text)
+        named = [(self.keys[k], s) for k, s in scored]
+        if not scored:
+            return Match('none')
+        best_id, best = scored[0]
+        if len(scored) > 1 and best - scored[1][1] < self.ambiguity_margin:
+            return Match('ambiguous', score=best, candidates=named)
+        return Match('fuzzy', self.keys[best_id], self.values[best_id], best, named)
+
+
+def match_all(index, texts):
+    """
+    Match many texts and return ({text: Match}, report).
+
+    The report lists ambiguous matches and keys claimed by more than one text,
+    which usually means a short key matched unrelated titles.
+    """
+    matches = {text: index.match(text) for text in texts}
+    claimed = {}
+    for text, result in matches.items():
+        if result:
+            claimed.setdefault(result.key, []).append(text)
+    report = {
+        'ambiguous': {t: m.candidates for t, m in matches.items() if m.status == 'ambiguous'},
+        'shared_keys': {k: ts for k, ts in claimed.items() if len(ts) > 1},
+    }
+    return matches, report
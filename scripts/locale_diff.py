@@ -0,0 +1,460 @@
+"""
+Translation engine for client/src/locales.
+
+Any set of namespaces x target languages is translated in one run: every
+German source file is loaded once, all requests share one pooled client under
+one rate limiter, and the translation memory, batching, validation and
+journal layers apply to all of them. This replaces the per-file
+translate_*.py and translate-*.mjs scripts:
+
+    python locale_diff.py                               # everything that changed
+    python locale_diff.py kultur botanik --all --lang es --lang fr
+    python locale_diff.py --all --model gpt-4o          # a full-site retranslation
+
+Every namespace of locales/de is flattened into key paths and compared with a
+snapshot of the German text each target locale was last translated from.
+Only added and changed paths (plus paths the target file is missing) are
+translated; paths removed from the German source are dropped from every
+target; all other keys of the target file are kept as they are. The merged
+file follows the key order of the source. `--all` translates every path
+again; strings the translation memory already holds for the same prompt
+version and model are still not sent.
+
+Translations go through translation_memory, translation_batches and
+translation_scheduler: strings translated before are not sent again, a
+string that occurs in several namespaces is sent once per language and its
+translation filled in everywhere (so it is also worded the same everywhere),
+the rest is packed across namespaces into requests near a token budget, and
+all requests run concurrently. The snapshot records a digest per path for every target
+file that was written; paths that failed are left out, so the next run
+requests them again. It is saved at the end of the run. Every unit that comes
+back is first appended to a fsync'd journal (translation_journal), so a run
+that is interrupted continues where it stopped without asking again for
+anything that was already answered; target files are written atomically.
+
+Without a snapshot for a target file its current content is the baseline:
+only missing paths are translated. `--worklist` adds paths whose translation
+is known to be wrong (the output of locale_langid.py); they are sent again
+whether they changed or not, bypassing the translation memory. `--init` records the current German text
+as translated for every target without sending anything.
+
+Usage:
+    python locale_diff.py [namespace ...] [--lang xx] [--all] [--model M] [--dry-run] [--init]
+        [--worklist FILE] [--budget N] [--languages-per-request N] [--base-url URL]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+
+from study_patches import write_json_atomic
+from translation_journal import Journal
+from translation_memory import TranslationMemory, flatten, path_key, split_json, merge_json
+from translation_batches import (
+    DEFAULT_BUDGET, PAIR_OVERHEAD, count_tokens, describe_targets, language_groups, plan_groups, print_plan,
+    reply_format, reply_tokens, run_batches,
+)
+from translation_scheduler import (
+    RateLimiter, Scheduler,
+    DEFAULT_CONCURRENCY, DEFAULT_MODEL, DEFAULT_REQUESTS_PER_MIN, DEFAULT_TOKENS_PER_MIN,
+)
+
+LOCALES_DIR = "/home/ubuntu/kava-wiki/client/src/locales"
+SOURCE_LANG = 'de'
+SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'locale_snapshot.json')
+# Bump when the prompt changes so cached translations are not reused
+PROMPT_VERSION = "locale-diff-2"
+# OPENAI_API_KEY as in .env.example; the old translate_*.py scripts read OpenAIAPIKEy
+API_KEY_VARIABLES = ('OPENAI_API_KEY', 'OpenAIAPIKEy')
+
+LANGUAGES = {
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'nl': 'Dutch',
+    'pl': 'Polish',
+    'cs': 'Czech',
+    'pt': 'Portuguese',
+    'it': 'Italian',
+    'ro': 'Romanian',
+    'hu': 'Hungarian',
+    'bg': 'Bulgarian',
+    'el': 'Greek',
+    'tr': 'Turkish',
+    'no': 'Norwegian',
+    'da': 'Danish',
+    'fi': 'Finnish',
+    'sv': 'Swedish',
+    'ja': 'Japanese',
+    'zh': 'Chinese (Simplified)',
+    'ru': 'Russian',
+    'ka': 'Georgian'
+}
+
+# Kept untranslated in every namespace: names, scientific terms, places, cultivars
+PROPER_NOUNS = [
+    "Kava", "Piper methysticum", "Piper wichmannii", "Noble Kava", "Kavalactone", "Nakamal", "Tanoa", "Bilo",
+    "Yaqona", "Sevusevu", "'Awa", "Sakau", "Lapita", "Georg Forster", "James Cook",
+    "Vanuatu", "Fiji", "Tonga", "Samoa", "Hawaii", "Borogu", "Melo Melo", "Pouni Ono",
+]
+
+
+def text_digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def api_key_from_env(base_url=None):
+    """The OpenAI key from the environment; a local --base-url server gets a dummy one"""
+    for name in API_KEY_VARIABLES:
+        if os.environ.get(name):
+            return os.environ[name]
+    return 'mock' if base_url else None
+
+
+def load_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def diff_source(source_json, snapshot, target_json):
+    """
+    Compare the flattened source with a snapshot {path key: digest}.
+
+    Returns {'added', 'changed', 'removed', 'missing'} as lists of path keys;
+    'missing' are unchanged paths the target has no string for. Without a
+    snapshot (None) every path is unchanged and only 'missing' is filled.
+    """
+    target = {path_key(path): text for path, text in flatten(target_json or {})}
+    source = {path_key(path): text for path, text in flatten(source_json)}
+    result = {'added': [], 'changed': [], 'removed': [], 'missing': []}
+    for key, text in source.items():
+        if snapshot is not None and key not in snapshot:
+            result['added'].append(key)
+        elif snapshot is not None and snapshot[key] != text_digest(text):
+            result['changed'].append(key)
+        elif key not in target:
+            result['missing'].append(key)
+    if snapshot is not None:
+        result['removed'] = [key for key in snapshot if key not in source]
+    return result
+
+
+def merge_target(source_json, target_json, updates, path=()):
+    """
+    Rebuild a target locale along the source structure.
+
+    Strings come from `updates` {path key: text}, then from the target at the
+    same path, then from the source. Paths the source no longer has are gone.
+    """
+    if isinstance(source_json, dict):
+        target = target_json if isinstance(target_json, dict) else {}
+        return {key: merge_target(value, target.get(key), updates, path + (key,))
+                for key, value in source_json.items()}
+    if isinstance(source_json, list):
+        target = target_json if isinstance(target_json, list) else []
+        return [merge_target(value, target[index] if index < len(target) else None, updates, path + (index,))
+                for index, value in enumerate(source_json)]
+    if isinstance(source_json, str):
+        key = path_key(path)
+        if key in updates:
+            return updates[key]
+        return target_json if isinstance(target_json, str) else source_json
+    return source_json
+
+
+def messages(flat_json, langs):
+    """Chat messages asking to translate a flat {path: text} object into one or more languages"""
+    prompt = f"""Translate the values of this JSON object from German to {describe_targets(langs, LANGUAGES)}.
+
+Rules:
+- The keys are paths into a website's locale file; keep every key unchanged
+- Only translate string VALUES
+- Keep HTML tags (<strong>, <em>, <a ...>) and placeholders like {{{{count}}}} intact
+- Keep proper nouns, scientific names, place and cultivar names: {', '.join(PROPER_NOUNS)}
+- {reply_format(langs)}
+
+JSON to translate:
+{json.dumps(flat_json, ensure_ascii=False, indent=2)}"""
+
+    return [
+        {"role": "system", "content": "You are a translator. Return only valid JSON."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+class Unit:
+    """One target file: its diff, the translation memory split and the paths to translate"""
+
+    def __init__(self, namespace, lang, source_json, target_json, snapshot, memory, model, flagged=()):
+        self.namespace = namespace
+        self.lang = lang
+        self.source_json = source_json
+        self.target_json = target_json
+        self.diff = diff_source(source_json, snapshot, target_json)
+        source = {path_key(path): text for path, text in flatten(source_json)}
+        listed = {key for name in ('added', 'changed', 'missing') for key in self.diff[name]}
+        self.diff['flagged'] = [key for key in flagged if key in source and key not in listed]
+        self.request = {key: source[key] for name in ('added', 'changed', 'missing', 'flagged')
+                        for key in self.diff[name]}
+        self.split = split_json(memory, self.request, SOURCE_LANG, lang, PROMPT_VERSION, model,
+                                refresh={source[key] for key in self.diff['flagged']})
+        self.results = {}
+        self.updates = {}
+
+    @property
+    def missing(self):
+        return self.split[2]
+
+    def finish(self, memory, result):
+        """Merge an API result (or {} after a failure) and return the keys still untranslated"""
+        context, translations, missing = self.split
+        translated = merge_json(memory, context, self.request, translations, missing, result)
+        returned = result if isinstance(result, dict) else {}
+        # Duplicate strings share one request key; a failure applies to all of them
+        failed_texts = {text for key, text in missing.items()
+                        if not (isinstance(returned.get(key), str) and returned[key].strip())}
+        failed = [key for key, text in self.request.items() if text in failed_texts]
+        self.updates = {key: text for key, text in translated.items() if key not in failed}
+        return failed
+
+
+def snapshot_for(source_json, skip=()):
+    return {path_key(path): text_digest(text) for path, text in flatten(source_json)
+            if path_key(path) not in skip}
+
+
+def namespaces(locales_dir, names=None):
+    source_dir = os.path.join(locales_dir, SOURCE_LANG)
+    found = sorted(name[:-5] for name in os.listdir(source_dir) if name.endswith('.json'))
+    return [name for name in found if not names or name in names]
+
+
+def build_units(locales_dir, names, languages, snapshots, memory, model, worklist=None):
+    """One Unit per namespace x language; `worklist` is {namespace: {lang: [path key]}} to send again"""
+    units = []
+    worklist = worklist or {}
+    for namespace in names:
+        source_json = load_json(os.path.join(locales_dir, SOURCE_LANG, f'{namespace}.json'))
+        for lang in languages:
+            target_json = load_json(os.path.join(locales_dir, lang, f'{namespace}.json'))
+            snapshot = snapshots.get(namespace, {}).get(lang)
+            flagged = worklist.get(namespace, {}).get(lang, ())
+            units.append(Unit(namespace, lang, source_json, target_json, snapshot, memory, model, flagged))
+    return units
+
+
+def print_diff(units):
+    for unit in units:
+        counts = {name: len(keys) for name, keys in unit.diff.items() if keys}
+        if counts:
+            summary = ', '.join(f"{count} {name}" for name, count in counts.items())
+            print(f"  {unit.lang}/{unit.namespace}: {summary} ({len(unit.missing)} to send)")
+
+
+def plan_units(units, budget=DEFAULT_BUDGET, per_request=1, journal=None):
+    """
+    Pack the strings to send of all units into batches; keys are namespace/path.
+
+    Strings already in the journal of an interrupted run go straight into the
+    unit's results. A German string that occurs in several namespaces is sent
+    once per language; the other occurrences are recorded in `unit.shared`
+    {key: key that is sent} and filled from its translation. With
+    per_request > 1 a batch asks for a group of languages at once.
+    """
+    needs = {}
+    sent = {}  # (lang, text): key that is sent
+    for unit in units:
+        items = {f"{unit.namespace}/{key}": text for key, text in unit.missing.items()}
+        done = journal.lookup(unit.lang, items) if journal else {}
+        unit.results.update({key.split('/', 1)[1]: text for key, text in done.items()})
+        unit.shared = {}
+        wanted = needs.setdefault(unit.lang, {})
+        for key, text in items.items():
+            if key in done:
+                continue
+            first = sent.setdefault((unit.lang, text), key)
+            if first == key:
+                wanted[key] = text
+            else:
+                unit.shared[key] = first
+    return plan_groups(needs, language_groups(needs, per_request), budget)
+
+
+def print_shared(units, batches):
+    """How many strings repeat across namespaces and what sending them once saves"""
+    repeated = [(unit.lang, key, unit.missing[key.split('/', 1)[1]]) for unit in units for key in unit.shared]
+    if not repeated:
+        return
+    prompt = sum(count_tokens(key) + count_tokens(text) + PAIR_OVERHEAD for _, key, text in repeated)
+    reply = sum(reply_tokens(key, text, lang) for lang, key, text in repeated)
+    share = reply / (reply + sum(batch.tokens for batch in batches))
+    print(f"{len(repeated)} strings repeat across namespaces and are filled from the one that is sent: "
+          f"~{prompt} prompt and ~{reply} reply tokens saved ({share:.0%} of the reply)")
+
+
+async def translate_units(units, batches, scheduler, memory, save, journal=None):
+    """Send the batches and call save(unit, failed) for every unit once all of its strings are back"""
+    by_name = {(unit.lang, unit.namespace): unit for unit in units}
+    # Counted in strings: batches that are cut off or re-asked come back in parts
+    remaining = {id(unit): 0 for unit in units}
+    for batch in batches:
+        for key in batch.items:
+            for lang in batch.langs:
+                remaining[id(by_name[(lang, key.split('/', 1)[0])])] += 1
+    # Repeated strings come back with the key that was sent for them
+    fanout = {}
+    for unit in units:
+        remaining[id(unit)] += len(unit.shared)
+        for key, first in unit.shared.items():
+            fanout.setdefault((unit.lang, first), []).append(key)
+    for unit in units:
+        if not remaining[id(unit)]:
+            save(unit, unit.finish(memory, unit.results))
+
+    def on_done(lang, items, reply, error):
+        items, reply = dict(items), dict(reply)
+        for key in list(items):
+            for alias in fanout.get((lang, key), ()):
+                items[alias] = items[key]
+                if key in reply:
+                    reply[alias] = reply[key]
+        if journal:
+            journal.record(lang, items, reply)
+        if error:
+            print(f"  ✗ {lang}: {len(items) - len(reply)} strings: {error}")
+        touched = set()
+        for key in items:
+            namespace, path = key.split('/', 1)
+            unit = by_name[(lang, namespace)]
+            touched.add(unit)
+            remaining[id(unit)] -= 1
+            if key in reply:
+                unit.results[path] = reply[key]
+        for unit in touched:
+            if not remaining[id(unit)]:
+                save(unit, unit.finish(memory, unit.results))
+
+    await run_batches(scheduler, batches, lambda batch: messages(batch.items, batch.langs), on_done)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Translate only the keys of locales/de that changed since the last run")
+    parser.add_argument('namespaces', nargs='*', help="only these namespaces (file names without .json)")
+    parser.add_argument('--lang', action='append', help="only this target language (repeatable)")
+    parser.add_argument('--locales', default=LOCALES_DIR, help="path to client/src/locales")
+    parser.add_argument('--all', action='store_true',
+                        help="translate every key, not only changed ones (the translation memory is still used)")
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--worklist', help="JSON {namespace: {lang: [key path]}} of strings to translate again "
+                                           "(from locale_langid.py); limits the run to its files")
+    parser.add_argument('--dry-run', action='store_true', help="show the diff without translating or writing")
+    parser.add_argument('--init', action='store_true',
+                        help="record the current German text as translated for every target, send nothing")
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help="planned reply tokens per request")
+    parser.add_argument('--languages-per-request', type=int, default=1,
+                        help="ask for this many languages in one request, sending the German text once")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rpm', type=int, default=DEFAULT_REQUESTS_PER_MIN, help="requests per minute")
+    parser.add_argument('--tpm', type=int, default=DEFAULT_TOKENS_PER_MIN, help="tokens per minute")
+    parser.add_argument('--base-url', help="OpenAI-compatible endpoint, e.g. a local mock server")
+    return parser.parse_args(argv)
+
+
+async def run(args, units, batches, snapshots, memory, journal, api_key):
+    scheduler = Scheduler(
+        limiter=RateLimiter(args.rpm, args.tpm),
+        concurrency=args.concurrency,
+        model=args.model,
+        base_url=args.base_url,
+        api_key=api_key,
+    )
+
+    incomplete = []
+
+    def save(unit, failed):
+        if not unit.request and not unit.diff['removed'] and unit.target_json is not None:
+            snapshots.setdefault(unit.namespace, {})[unit.lang] = snapshot_for(unit.source_json)
+            return
+        merged = merge_target(unit.source_json, unit.target_json, unit.updates)
+        path = os.path.join(args.locales, unit.lang, f'{unit.namespace}.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_json_atomic(path, merged)
+        snapshots.setdefault(unit.namespace, {})[unit.lang] = snapshot_for(unit.source_json, skip=failed)
+        incomplete.extend(failed)
+        note = f", {len(failed)} keys left in German" if failed else ""
+        print(f"  Saved {path} ({len(unit.updates)} keys translated, {len(unit.diff['removed'])} removed{note})")
+
+    try:
+        await translate_units(units, batches, scheduler, memory, save, journal)
+        if not incomplete:
+            journal.remove()
+    finally:
+        write_json_atomic(SNAPSHOT_PATH, snapshots)
+        scheduler.stats.report(scheduler.limiter)
+        await scheduler.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    languages = args.lang or [lang for lang in LANGUAGES
+                              if os.path.isdir(os.path.join(args.locales, lang))]
+    unknown = [lang for lang in languages if lang not in LANGUAGES]
+    if unknown:
+        print(f"Error: Unknown language code(s) {', '.join(unknown)}")
+        print(f"Available: {', '.join(LANGUAGES.keys())}")
+        sys.exit(1)
+
+    worklist = load_json(args.worklist) if args.worklist else None
+    if worklist:
+        # A repair run: only the files with flagged strings
+        languages = [lang for lang in languages if any(lang in langs for langs in worklist.values())]
+    names = namespaces(args.locales, args.namespaces or (list(worklist) if worklist else None))
+    snapshots = load_json(SNAPSHOT_PATH, {})
+    os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+
+    if args.init:
+        for namespace in names:
+            source_json = load_json(os.path.join(args.locales, SOURCE_LANG, f'{namespace}.json'))
+            for lang in languages:
+                snapshots.setdefault(namespace, {})[lang] = snapshot_for(source_json)
+        write_json_atomic(SNAPSHOT_PATH, snapshots)
+        print(f"Snapshot recorded for {len(names)} namespaces x {len(languages)} languages")
+        return
+
+    memory = TranslationMemory()
+    journal = Journal.open('locale-diff', PROMPT_VERSION, args.model)
+    # An empty snapshot makes every path of the source count as added
+    baseline = {name: {lang: {} for lang in languages} for name in names} if args.all else snapshots
+    units = build_units(args.locales, names, languages, baseline, memory, args.model, worklist)
+    print_diff(units)
+    batches = plan_units(units, args.budget, args.languages_per_request, journal)
+    print_shared(units, batches)
+    if len(journal):
+        print(f"Resuming: {len(journal)} strings from the journal of an interrupted run")
+    print(f"{len(units)} target files, {sum(len(u.request) for u in units)} keys to translate, "
+          f"{sum(len(u.diff['removed']) for u in units)} keys to remove")
+    print_plan(batches)
+    if args.dry_run:
+        journal.close()
+        memory.close()
+        return
+
+    api_key = api_key_from_env(args.base_url)
+    if batches and not api_key:
+        print("Error: OPENAI_API_KEY environment variable not set")
+        sys.exit(1)
+    try:
+        asyncio.run(run(args, units, batches, snapshots, memory, journal, api_key))
+    finally:
+        journal.close()
+        memory.stats.report()
+        memory.close()
+
+
+if __name__ == "__main__":
+    main()
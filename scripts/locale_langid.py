@@ -0,0 +1,214 @@
+"""
+Language-identification sweep over client/src/locales.
+
+A failed translation used to leave the German original in place, so target
+files like es/kultur.json can contain German paragraphs nobody noticed. This
+scans every string of every language folder and flags the ones whose
+detected language is not the folder's.
+
+Detection is a character trigram naive Bayes model trained on the locales
+themselves: every folder is mostly in its own language, which is enough for
+a profile per language (strings identical to the German source at the same
+path are left out of the training). Trigrams are hashed into a fixed number
+of buckets, so the model is one (buckets x languages) matrix of log
+probabilities and all strings are scored in a few vectorized passes. HTML
+tags, placeholders, URLs and digits are stripped first, and so are the
+words a string shares with both the German and the English text at the same
+path - names of places, drugs and cultivars. Strings with fewer
+than --min-letters letters (names, numbers, "Kava") and single tokens (hrefs,
+ids, slugs) are not judged, and neither are strings that are the same at
+the same path in at least half of the folders (lists of names and places)
+or that are citations, which keep the title of the paper.
+
+A string is flagged when another language beats the folder's by at least
+--margin nats per trigram. The result is a worklist {namespace: {lang:
+[key path, ...]}} for the translation engine, which sends only those strings
+again (the translation memory is bypassed for them):
+
+    python locale_langid.py --out worklist.json
+    python locale_diff.py --worklist worklist.json
+
+Usage:
+    python locale_langid.py [namespace ...] [--lang xx] [--locales DIR] [--out worklist.json]
+        [--margin 1.0] [--min-letters 20]
+"""
+
+import argparse
+import os
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from locale_diff import LANGUAGES, LOCALES_DIR, SOURCE_LANG, load_json, namespaces
+from study_patches import write_json_atomic
+from translation_memory import flatten, path_key
+
+WORKLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'langid_worklist.json')
+GRAM = 3
+BUCKETS = 1 << 18
+SMOOTHING = 0.5
+# Below this, name and drug lists ("Diazepam, Lorazepam") tip towards any language
+MARGIN = 1.0
+MIN_LETTERS = 20
+# Gathered rows of the model per scoring pass (x languages x 4 bytes)
+CHUNK_GRAMS = 1_000_000
+# Share of folders with the same text at a path above which it is language neutral
+NEUTRAL_SHARE = 0.5
+STRIP = re.compile(r'<[^>]*>|\{\{[^}]*\}\}|\$t\([^)]*\)|\{[A-Za-z_]\w*\}|%(?:\d+\$)?[sdif]|https?://\S+')
+NON_LETTERS = re.compile(r'[\W\d_]+')
+CITATION_KEY = re.compile(r'(^|\.)(quellen|sources|references|literatur)\.')
+
+
+def normalize(text):
+    """Lowercase letters and single spaces, padded so trigrams see word boundaries"""
+    return ' ' + ' '.join(NON_LETTERS.sub(' ', STRIP.sub(' ', text.lower())).split()) + ' '
+
+
+def strip_words(normalized, names):
+    """Drop the words in `names` from a normalized text"""
+    if not names:
+        return normalized
+    return ' ' + ' '.join(word for word in normalized.split() if word not in names) + ' '
+
+
+def gram_ids(text):
+    return [zlib.crc32(text[i:i + GRAM].encode('utf-8')) & (BUCKETS - 1) for i in range(len(text) - GRAM + 1)]
+
+
+class Corpus:
+    """Every string of the scanned locales with its trigram bucket ids, in flat arrays"""
+
+    def __init__(self, locales_dir, names, langs):
+        self.langs = list(langs)
+        self.rows = []  # (lang, namespace, key path, text)
+        same_as_source, letters, grams = [], [], []
+        for namespace in names:
+            source, english = ({path_key(path): text
+                                for path, text in flatten(load_json(os.path.join(locales_dir, lang, f'{namespace}.json'), {}))}
+                               for lang in (SOURCE_LANG, 'en'))
+            for lang in self.langs:
+                target = load_json(os.path.join(locales_dir, lang, f'{namespace}.json'))
+                for path, text in flatten(target or {}):
+                    key = path_key(path)
+                    normalized = normalize(text)
+                    if lang not in (SOURCE_LANG, 'en') and key in source and key in english:
+                        names = set(normalize(source[key]).split()) & set(normalize(english[key]).split())
+                        normalized = strip_words(normalized, names)
+                    self.rows.append((lang, namespace, key, text))
+                    same_as_source.append(lang != SOURCE_LANG and source.get(key) == text)
+                    # Single tokens are paths, ids and slugs, not prose
+                    letters.append(len(normalized) - normalized.count(' ') if ' ' in text.strip() else 0)
+                    grams.append(gram_ids(normalized))
+        self.lang = np.array([self.langs.index(row[0]) for row in self.rows], dtype=np.int64)
+        self.same_as_source = np.array(same_as_source, dtype=bool)
+        shared = Counter((namespace, key, text) for _, namespace, key, text in self.rows)
+        neutral = [shared[row[1:]] >= NEUTRAL_SHARE * len(self.langs) or CITATION_KEY.search(row[2])
+                   for row in self.rows]
+        self.letters = np.where(neutral, 0, np.array(letters, dtype=np.int64))
+        self.lengths = np.array([len(g) for g in grams], dtype=np.int64)
+        self.ids = np.fromiter((i for g in grams for i in g), dtype=np.int64, count=int(self.lengths.sum()))
+        self.starts = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def train(corpus):
+    """(buckets x languages) log probabilities from the strings of each folder"""
+    gram_row = np.repeat(np.arange(len(corpus)), corpus.lengths)
+    usable = ~corpus.same_as_source[gram_row]
+    gram_lang = corpus.lang[gram_row]
+    model = np.empty((BUCKETS, len(corpus.langs)), dtype=np.float32)
+    for index in range(len(corpus.langs)):
+        counts = np.bincount(corpus.ids[usable & (gram_lang == index)], minlength=BUCKETS).astype(np.float64)
+        model[:, index] = np.log((counts + SMOOTHING) / (counts.sum() + SMOOTHING * BUCKETS))
+    return model
+
+
+def score(corpus, model, rows):
+    """Log likelihood per trigram of every language for the given rows (none of them without trigrams)"""
+    result = np.empty((len(rows), model.shape[1]), dtype=np.float32)
+    begin = 0
+    while begin < len(rows):
+        end, total = begin, 0
+        while end < len(rows) and (total < CHUNK_GRAMS or end == begin):
+            total += corpus.lengths[rows[end]]
+            end += 1
+        chunk = rows[begin:end]
+        ids = np.concatenate([corpus.ids[corpus.starts[r]:corpus.starts[r] + corpus.lengths[r]] for r in chunk])
+        offsets = np.concatenate(([0], np.cumsum(corpus.lengths[chunk])[:-1]))
+        result[begin:end] = np.add.reduceat(model[ids], offsets, axis=0) / corpus.lengths[chunk][:, None]
+        begin = end
+    return result
+
+
+def sweep(corpus, model, margin=MARGIN, min_letters=MIN_LETTERS):
+    """Return [(row index, detected lang, margin)] for the strings that are not in their folder's language"""
+    rows = np.flatnonzero(corpus.letters >= min_letters)
+    scores = score(corpus, model, rows)
+    own = scores[np.arange(len(rows)), corpus.lang[rows]]
+    best = scores.argmax(axis=1)
+    lead = scores[np.arange(len(rows)), best] - own
+    flagged = np.flatnonzero((best != corpus.lang[rows]) & (lead >= margin))
+    return [(int(rows[i]), corpus.langs[best[i]], float(lead[i])) for i in flagged]
+
+
+def worklist(corpus, findings):
+    result = {}
+    for row, _, _ in findings:
+        lang, namespace, key, _ = corpus.rows[row]
+        result.setdefault(namespace, {}).setdefault(lang, []).append(key)
+    return result
+
+
+def print_findings(corpus, findings, examples=3):
+    by_lang = {}
+    for finding in findings:
+        by_lang.setdefault(corpus.rows[finding[0]][0], []).append(finding)
+    for lang in corpus.langs:
+        found = by_lang.get(lang)
+        if not found:
+            continue
+        detected = Counter(d for _, d, _ in found)
+        summary = ', '.join(f"{count} {d}" for d, count in detected.most_common())
+        print(f"  {lang}: {len(found)} strings ({summary})")
+        for row, d, lead in sorted(found, key=lambda f: -f[2])[:examples]:
+            _, namespace, key, text = corpus.rows[row]
+            print(f"      {namespace}/{key} [{d} +{lead:.2f}] {text[:70]!r}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Find strings in locales that are not in their folder's language")
+    parser.add_argument('namespaces', nargs='*', help="only these namespaces (file names without .json)")
+    parser.add_argument('--lang', action='append', help="only report this target language (repeatable)")
+    parser.add_argument('--locales', default=LOCALES_DIR, help="path to client/src/locales")
+    parser.add_argument('--out', default=WORKLIST_PATH, help="where to write the retranslation worklist")
+    parser.add_argument('--margin', type=float, default=MARGIN,
+                        help="nats per trigram another language must lead by to flag a string")
+    parser.add_argument('--min-letters', type=int, default=MIN_LETTERS, help="shorter strings are not judged")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    langs = [SOURCE_LANG] + [lang for lang in LANGUAGES if os.path.isdir(os.path.join(args.locales, lang))]
+    names = namespaces(args.locales, args.namespaces)
+    # The model always sees every language; --lang only limits the report
+    corpus = Corpus(args.locales, names, langs)
+    model = train(corpus)
+    findings = [f for f in sweep(corpus, model, args.margin, args.min_letters)
+                if corpus.rows[f[0]][0] != SOURCE_LANG and (not args.lang or corpus.rows[f[0]][0] in args.lang)]
+    judged = int(np.count_nonzero(corpus.letters >= args.min_letters))
+    print(f"{len(corpus)} strings in {len(names)} namespaces x {len(langs)} languages, {judged} long enough to judge")
+    print_findings(corpus, findings)
+    result = worklist(corpus, findings)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    write_json_atomic(args.out, result)
+    print(f"{len(findings)} strings to retranslate in {sum(len(langs) for langs in result.values())} files, "
+          f"worklist written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Local OpenAI-compatible stand-in for the translation scripts.
+
+Serves POST /v1/chat/completions. The "translation" is the JSON found in the
+last user message with every string value marked "[<lang>] <text>", so a
+caller can check that each leaf came back for the right language; requests
+for several languages ("each of these languages: es (Spanish), ...") get one
+object per language code. Usage is reported from the message and reply
+lengths.
+
+Latency is drawn per request (fixed, uniform or lognormal around --latency)
+plus the reply length at --tokens-per-sec. Faults are injected at the given
+rates: 429 (with Retry-After) and 500 responses, replies cut off at
+max_tokens or at random (finish_reason "length"), replies wrapped in a
+```json fence and replies with a stray quote. --rpm enforces a real
+requests/min limit with 429s.
+
+Any script built on the openai SDK can be pointed at it:
+
+    python mock_llm_server.py --port 8000 &
+    OPENAI_BASE_URL=http://127.0.0.1:8000/v1 OPENAI_API_KEY=mock python locale_diff.py geschichte --lang es
+
+Usage:
+    python mock_llm_server.py [--port 8000] [--latency 0.5] [--latency-dist lognormal]
+        [--rate-429 0.05] [--rate-500 0.02] [--rate-truncate 0.02] [--rate-fence 0.1] [--rate-malformed 0.02]
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from locale_diff import LANGUAGES
+
+CHARS_PER_TOKEN = 4
+MULTI_TARGET = re.compile(r'each of these languages: (.*?)\.\s*$', re.MULTILINE)
+LANGUAGE_CODE = re.compile(r'\b([a-z]{2}) \(')
+SINGLE_TARGET = re.compile(r'\bto ([A-Z][a-z]+)')
+
+
+class Profile:
+    """Latency distribution and fault rates of the mock"""
+
+    def __init__(self, latency=0.5, latency_dist='lognormal', tokens_per_sec=100.0, rpm=0,
+                 rate_429=0.0, rate_500=0.0, rate_truncate=0.0, rate_fence=0.0, rate_malformed=0.0, seed=None):
+        self.latency = latency
+        self.latency_dist = latency_dist
+        self.tokens_per_sec = tokens_per_sec
+        self.rpm = rpm
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.rate_truncate = rate_truncate
+        self.rate_fence = rate_fence
+        self.rate_malformed = rate_malformed
+        self.random = random.Random(seed)
+
+    def first_token_delay(self):
+        if self.latency_dist == 'fixed':
+            return self.latency
+        if self.latency_dist == 'uniform':
+            return self.random.uniform(0, 2 * self.latency)
+        # Median at --latency with a long right tail, like a real endpoint
+        return self.random.lognormvariate(0, 0.5) * self.latency
+
+
+def mark(value, lang):
+    """The mock translation: every string prefixed with its language"""
+    if isinstance(value, dict):
+        return {key: mark(item, lang) for key, item in value.items()}
+    if isinstance(value, list):
+        return [mark(item, lang) for item in value]
+    if isinstance(value, str):
+        return f"[{lang}] {value}"
+    return value
+
+
+def request_json(text):
+    """The JSON document of a prompt: the last line that starts one and parses"""
+    decoder = json.JSONDecoder()
+    starts = [m.start() for m in re.finditer(r'^[{\[]', text, re.MULTILINE)]
+    for start in reversed(starts):
+        try:
+            return decoder.raw_decode(text[start:])[0]
+        except ValueError:
+            continue
+    return None
+
+
+def target_languages(text):
+    """Language codes asked for in a prompt"""
+    multi = MULTI_TARGET.search(text)
+    if multi:
+        return LANGUAGE_CODE.findall(multi.group(1))
+    names = {name.split()[0]: code for code, name in LANGUAGES.items()}
+    for match in SINGLE_TARGET.finditer(text):
+        if match.group(1) in names:
+            return [names[match.group(1)]]
+    return ['xx']
+
+
+def translate(messages):
+    """Reply content for a chat request: the marked JSON for one or several languages"""
+    system = ' '.join(m['content'] for m in messages if m['role'] == 'system')
+    prompt = messages[-1]['content']
+    source = request_json(prompt)
+    langs = target_languages(prompt + '\n' + system)
+    if source is None:
+        return json.dumps({'error': 'no JSON in request'})
+    if len(langs) > 1:
+        return json.dumps({lang: mark(source, lang) for lang in langs}, ensure_ascii=False, indent=2)
+    return json.dumps(mark(source, langs[0]), ensure_ascii=False, indent=2)
+
+
+class MockState:
+    def __init__(self, profile):
+        self.profile = profile
+        self.lock = threading.Lock()
+        self.window = []  # request times of the last minute, for --rpm
+        self.counts = {'requests': 0, '200': 0, '429': 0, '500': 0, 'truncated': 0, 'fenced': 0, 'malformed': 0}
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def over_limit(self):
+        if not self.profile.rpm:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            self.window = [t for t in self.window if now - t < 60]
+            if len(self.window) >= self.profile.rpm:
+                return True
+            self.window.append(now)
+            return False
+
+    def roll(self, rate):
+        with self.lock:
+            return self.profile.random.random() < rate
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeout); nothing to answer
+
+    def error(self, status, message, kind, headers=None):
+        self.state.count(str(status))
+        self.send_json(status, {'error': {'message': message, 'type': kind}}, headers)
+
+    def do_POST(self):
+        state, profile = self.state, self.state.profile
+        state.count('requests')
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_json(404, {'error': {'message': f'unknown path {self.path}', 'type': 'invalid_request_error'}})
+            return
+        if state.over_limit() or state.roll(profile.rate_429):
+            time.sleep(0.05)
+            self.error(429, 'Rate limit reached', 'rate_limit_exceeded', {'Retry-After': '1'})
+            return
+        if state.roll(profile.rate_500):
+            time.sleep(profile.first_token_delay())
+            self.error(500, 'The server had an error while processing your request', 'server_error')
+            return
+
+        messages = body.get('messages', [])
+        content = translate(messages)
+        prompt_tokens = sum(len(m.get('content', '')) for m in messages) // CHARS_PER_TOKEN
+        finish_reason = 'stop'
+        max_tokens = body.get('max_tokens') or body.get('max_completion_tokens')
+        if max_tokens and len(content) // CHARS_PER_TOKEN > max_tokens:
+            content = content[:max_tokens * CHARS_PER_TOKEN]
+            finish_reason = 'length'
+        elif state.roll(profile.rate_truncate):
+            content = content[:int(len(content) * profile.random.uniform(0.3, 0.9))]
+            finish_reason = 'length'
+        if finish_reason == 'length':
+            state.count('truncated')
+        elif state.roll(profile.rate_malformed):
+            # A stray quote inside one value
+            quotes = [m.end() for m in re.finditer(r'": "', content)]
+            if quotes:
+                at = profile.random.choice(quotes) + 1
+                content = content[:at] + '"' + content[at:]
+                state.count('malformed')
+        if finish_reason == 'stop' and state.roll(profile.rate_fence):
+            content = f"```json\n{content}\n```"
+            state.count('fenced')
+        completion_tokens = len(content) // CHARS_PER_TOKEN
+
+        time.sleep(profile.first_token_delay() + completion_tokens / profile.tokens_per_sec)
+        state.count('200')
+        self.send_json(200, {
+            'id': f'chatcmpl-mock{state.counts["requests"]}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': finish_reason,
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        })
+
+
+class MockServer:
+    """The mock on a background thread; `base_url` is what the clients need"""
+
+    def __init__(self, profile=None, host='127.0.0.1', port=0):
+        self.state = MockState(profile or Profile())
+        handler = type('BoundHandler', (Handler,), {'state': self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def add_profile_args(parser):
+    parser.add_argument('--latency', type=float, default=0.5, help="median seconds before the first token")
+    parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--tokens-per-sec', type=float, default=100.0, help="reply tokens generated per second")
+    parser.add_argument('--rpm', type=int, default=0, help="requests per minute before 429s (0: no limit)")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument('--rate-500', type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument('--rate-truncate', type=float, default=0.0, help="share of replies cut off")
+    parser.add_argument('--rate-fence', type=float, default=0.0, help="share of replies wrapped in ```json")
+    parser.add_argument('--rate-malformed', type=float, default=0.0, help="share of replies with a stray quote")
+    parser.add_argument('--seed', type=int, help="random seed for reproducible faults")
+
+
+def profile_from_args(args):
+    return Profile(args.latency, args.latency_dist, args.tokens_per_sec, args.rpm, args.rate_429, args.rate_500,
+                   args.rate_truncate, args.rate_fence, args.rate_malformed, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock server for the translation scripts")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    add_profile_args(parser)
+    args = parser.parse_args()
+
+    server = MockServer(profile_from_args(args), args.host, args.port)
+    print(f"Mock OpenAI API on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.state.counts))
+
+
+if __name__ == "__main__":
+    main()
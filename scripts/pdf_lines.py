@@ -0,0 +1,86 @@
+"""
+Single-pass line classifier for the front matter of study PDFs.
+
+`classify_line` labels a line with one compiled pattern for the cheap labels
+plus a linear-time author pattern. `scan_front_matter` labels each line of a
+first page at most once and derives title and authors from those labels
+instead of re-testing overlapping windows of the same lines.
+
+Labels:
+    blank        empty or shorter than 5 characters
+    page_number  only digits
+    header       journal/publisher boilerplate (URLs, volume, copyright, ...)
+    author       a list of personal names with initials, commas or markers
+    title        anything else - a candidate title line
+"""
+
+import re
+
+# Lines starting with these are journal headers, not titles (case-insensitive)
+HEADER_PREFIXES = [
+    'downloaded from', 'http', 'www', 'vol.', 'no.', 'pp.', 'page', 'copyright',
+    'journal of', 'clinical medicine', 'review article', 'original article', 'research article',
+]
+
+# One pattern for the cheap labels; the matching group names the label
+LINE_CLASSIFIER = re.compile(
+    r'^\s*(?:(?P<page_number>\d+\s*$)|(?P<header>'
+    + '|'.join(map(re.escape, HEADER_PREFIXES)) + '))',
+    re.IGNORECASE
+)
+
+# Name tokens ("J.", "Müller", "Dinis-Oliveira") or connectors, separated by
+# spaces, commas, affiliation digits or footnote marks. Tokens are letters
+# only and separators never contain letters, so matching stays linear.
+_NAME = r"(?:[A-ZÄÖÜ][^\W\d_]*(?:[-'][^\W\d_]+)*\.?|and|und|&|et al\.?)"
+_SEP = r"[\s,\d*†‡§¶]+"
+AUTHOR_LINE = re.compile(rf'^\s*{_NAME}(?:{_SEP}{_NAME})*(?:{_SEP})?$')
+# Initials, affiliation markers or at least two commas - rules out Title Case titles
+AUTHOR_EVIDENCE = re.compile(r'\b[A-Z]\.|[\d*†‡§¶]|,.*,')
+
+JUNK_LABELS = {'blank', 'page_number', 'header'}
+
+
+def classify_line(line):
+    """Return the label of a single line"""
+    stripped = line.strip()
+    if len(stripped) < 5:
+        return 'blank'
+    match = LINE_CLASSIFIER.match(stripped)
+    if match:
+        return match.lastgroup
+    if AUTHOR_LINE.match(stripped) and AUTHOR_EVIDENCE.search(stripped):
+        return 'author'
+    return 'title'
+
+
+def clean_author_line(line):
+    """Drop affiliation markers and normalize separators of an author line"""
+    names = re.sub(r'\s+', ' ', re.sub(r'[\d*†‡§¶]+', '', line))
+    return re.sub(r'\s*,\s*(?:,\s*)*', ', ', names).strip(' ,')
+
+
+def scan_front_matter(text, search_lines=10, max_title_lines=5, max_lines=30):
+    """
+    Return (title, authors) from the top of a first page in one pass.
+
+    Each line is classified at most once and the scan stops as soon as both
+    fields are found. The title is the first run of title lines starting
+    within `search_lines` lines; it ends at the first header, blank or author
+    line. The authors are the first author line within `max_lines` lines.
+    """
+    title_lines = []
+    title_done = False
+    authors = ""
+    for index, line in enumerate(text.split('\n', max_lines)[:max_lines]):
+        label = classify_line(line)
+        if label == 'author' and not authors:
+            authors = clean_author_line(line)
+        if not title_done:
+            if label == 'title' and len(title_lines) < max_title_lines:
+                title_lines.append(line.strip())
+            elif title_lines or index + 1 >= search_lines:
+                title_done = True
+        if title_done and authors:
+            break
+    return re.sub(r'\s+', ' ', ' '.join(title_lines)).strip(), authors
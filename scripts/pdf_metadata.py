@@ -0,0 +1,166 @@
+"""
+Embedded PDF metadata (Info dictionary and XMP packet) for the analyze scripts.
+
+Reading Title/Author/CreationDate needs no page decoding, so it is tried
+before text extraction; the text heuristics only run when the metadata is
+missing or fails `plausible_title`.
+"""
+
+import html
+import mmap
+import re
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+# Titles that authoring tools write instead of the real one
+JUNK_TITLE = re.compile(
+    r'^(?:microsoft (?:word|powerpoint)\s*-|doi:|https?:|www\.)'
+    r'|^(?:untitled|title|document\s*\d*)$'
+    r'|\.(?:docx?|pdf|indd|tex|dvi|qxd)\b'
+    r'|^\S+$',  # identifiers such as "pmm-kava-20200811-web"
+    re.IGNORECASE
+)
+
+XMP_PACKET = re.compile(rb'<x:xmpmeta.*?</x:xmpmeta>', re.DOTALL)
+XMP_FIELDS = {
+    'title': re.compile(r'<dc:title>.*?<rdf:li[^>]*>(.*?)</rdf:li>', re.DOTALL),
+    'author': re.compile(r'<dc:creator>.*?<rdf:Seq>(.*?)</rdf:Seq>', re.DOTALL),
+    'creation_date': re.compile(r'<xmp:CreateDate>(.*?)</xmp:CreateDate>'),
+}
+INFO_FIELDS = {
+    'title': re.compile(rb'/Title\s*(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)'),
+    'author': re.compile(rb'/Author\s*(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)'),
+    'creation_date': re.compile(rb'/CreationDate\s*(\((?:\\.|[^\\)])*\))'),
+}
+# Trailer (or xref stream) entry pointing at the Info dictionary; the last one wins
+INFO_REFERENCE = re.compile(rb'/Info\s+(\d+)\s+(\d+)\s+R')
+LITERAL_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+
+def decode_pdf_string(raw):
+    """Decode a PDF literal (...) or hex <...> string token"""
+    if raw.startswith(b'<'):
+        digits = re.sub(rb'\s', b'', raw[1:-1]).decode('ascii')
+        # An odd final digit is allowed and counts as if followed by 0
+        data = bytes.fromhex(digits + '0' * (len(digits) % 2))
+    else:
+        data = re.sub(
+            rb'\\([0-7]{1,3}|.)',
+            lambda m: (bytes([int(m.group(1), 8) & 0xFF]) if m.group(1)[:1].isdigit()
+                       else LITERAL_ESCAPES.get(m.group(1), m.group(1))),
+            raw[1:-1],
+            flags=re.DOTALL
+        )
+    if data.startswith(b'\xfe\xff'):
+        return data[2:].decode('utf-16-be', errors='replace')
+    return data.decode('latin-1')
+
+
+def clean_value(value):
+    if not value:
+        return ""
+    value = re.sub(r'<[^>]+>', ' ', value)
+    return re.sub(r'\s+', ' ', value).strip()
+
+
+def info_dictionary(data):
+    """
+    Bytes of the Info dictionary the trailer points at, or None.
+
+    /Title also appears in outline (bookmark) entries, so Info fields are
+    only read from the object named by the last /Info n g R.
+    """
+    reference = None
+    for reference in INFO_REFERENCE.finditer(data):
+        pass
+    if reference is None:
+        return None
+    header = re.compile(rb'(?<!\d)' + reference.group(1) + rb'\s+' + reference.group(2) + rb'\s+obj\b')
+    start = None
+    for start in header.finditer(data):
+        pass
+    if start is None:  # inside a compressed object stream
+        return None
+    end = data.find(b'endobj', start.end())
+    return data[start.end():end if end != -1 else len(data)]
+
+
+def scan_raw_metadata(pdf_path):
+    """
+    Find metadata by scanning the raw file bytes.
+
+    Used when pypdf is not installed. Only finds uncompressed Info
+    dictionaries and XMP packets, which covers most publisher PDFs. Without
+    a readable Info object a field is only taken when it occurs exactly once
+    in the file, since outline entries carry a /Title of their own.
+    """
+    metadata = {}
+    with open(pdf_path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return metadata
+        with data:
+            packet = XMP_PACKET.search(data)
+            if packet:
+                xmp = packet.group(0).decode('utf-8', errors='replace')
+                for field, pattern in XMP_FIELDS.items():
+                    match = pattern.search(xmp)
+                    if match:
+                        # Separate multiple creators before the tags are stripped
+                        value = match.group(1).replace('</rdf:li>', ', ')
+                        metadata[field] = html.unescape(clean_value(value)).strip(' ,')
+            info = info_dictionary(data)
+            for field, pattern in INFO_FIELDS.items():
+                if metadata.get(field):
+                    continue
+                if info is not None:
+                    values = pattern.findall(info)[:1]
+                else:
+                    values = pattern.findall(data)
+                if len(values) == 1:
+                    metadata[field] = clean_value(decode_pdf_string(values[0]))
+    return metadata
+
+
+def read_pdf_metadata(pdf_path):
+    """Return {'title', 'author', 'creation_date'} from the PDF's embedded metadata"""
+    metadata = {}
+    if pypdf is not None:
+        try:
+            info = pypdf.PdfReader(pdf_path).metadata or {}
+            metadata = {
+                'title': clean_value(info.get('/Title')),
+                'author': clean_value(info.get('/Author')),
+                'creation_date': clean_value(info.get('/CreationDate')),
+            }
+        except Exception as e:
+            print(f"Error reading metadata of {pdf_path}: {e}")
+    if not metadata.get('title'):
+        try:
+            metadata = {**scan_raw_metadata(pdf_path), **{k: v for k, v in metadata.items() if v}}
+        except (OSError, ValueError) as e:  # ValueError: malformed string tokens
+            print(f"Error reading metadata of {pdf_path}: {e}")
+    return metadata
+
+
+def metadata_year(metadata):
+    """Return the 4-digit year of the creation date ('D:2016...' or ISO), or ''"""
+    match = re.search(r'(19|20)\d{2}', metadata.get('creation_date', ''))
+    return match.group(0) if match else ""
+
+
+def plausible_title(title, filename=""):
+    """Check that an embedded title is a real title and not tool junk or the filename"""
+    if not title or len(title) < 10 or len(title) > 300:
+        return False
+    if JUNK_TITLE.search(title):
+        return False
+    letters = sum(c.isalpha() for c in title)
+    if letters < len(title) * 0.6:
+        return False
+    stem = re.sub(r'[\W_]+', '', filename.rsplit('.', 1)[0]).lower()
+    return re.sub(r'[\W_]+', '', title).lower() != stem
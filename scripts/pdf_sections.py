@@ -0,0 +1,118 @@
+"""
+Single-pass section segmenter for text extracted from study PDFs.
+
+`segment_sections` walks the lines once and starts a new section whenever a
+line is a known heading (Abstract, Keywords, Introduction, References and
+their German equivalents). Every heading pattern is anchored at the start of
+the line and contains no nested repetition, so the cost is linear in the
+length of the text, unlike a DOTALL `(.*?)` scan over the whole document.
+Title, abstract and keyword extraction all read from the same segmentation.
+"""
+
+import re
+
+# Canonical section name -> heading words (English and German)
+SECTION_HEADINGS = {
+    'abstract': ['abstract', 'summary', 'zusammenfassung', 'kurzfassung'],
+    'keywords': ['keywords', 'key words', 'schlüsselwörter', 'schlagwörter', 'stichwörter'],
+    'introduction': ['introduction', 'background', 'einleitung', 'einführung', 'hintergrund'],
+    'methods': ['methods', 'materials and methods', 'methoden', 'methodik'],
+    'results': ['results', 'ergebnisse'],
+    'discussion': ['discussion', 'diskussion'],
+    'conclusion': ['conclusion', 'conclusions', 'schlussfolgerung', 'fazit'],
+    'references': ['references', 'bibliography', 'literatur', 'literaturverzeichnis'],
+}
+
+HEADING_TO_SECTION = {
+    word: section for section, words in SECTION_HEADINGS.items() for word in words
+}
+
+# Optional section number, a heading word, then end of line, a separator or a
+# column gap; anything after the separator is inline section text
+HEADING_LINE = re.compile(
+    r'^[ \t]*(?:\d{1,2}(?:\.\d{1,2})?\.?[ \t]+)?'
+    r'(' + '|'.join(sorted(map(re.escape, HEADING_TO_SECTION), key=len, reverse=True)) + r')'
+    r'(?:[ \t]*$|[ \t]*[:.–—-][ \t]*|[ \t]{2,})(.*)$',
+    re.IGNORECASE
+)
+# "1. Background"-style numbered heading that starts the body of the paper
+NUMBERED_HEADING = re.compile(r'^[ \t]*1\.?[ \t]+[A-ZÄÖÜ][a-zäöüß]+[ \t]*$')
+KEYWORD_SPLIT = re.compile(r'\s*[;,·•|]\s*')
+
+ABSTRACT_MAX_LEN = 800
+
+
+def clean_text(text):
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def match_heading(line):
+    """Return (section name, inline text) if the line is a section heading, else None"""
+    match = HEADING_LINE.match(line)
+    if match:
+        return HEADING_TO_SECTION[match.group(1).lower()], match.group(2)
+    if NUMBERED_HEADING.match(line):
+        return 'body', ''
+    return None
+
+
+def segment_sections(text):
+    """
+    Split extracted text into [{'name', 'lines'}] sections in one pass.
+
+    Text before the first heading is the 'front' section (title, authors,
+    journal header). A heading starts a new section; its inline text, if any,
+    becomes the first line of that section.
+    """
+    sections = [{'name': 'front', 'lines': []}]
+    for line in text.split('\n'):
+        heading = match_heading(line)
+        # Numbered lines inside the reference list are entries, not headings
+        if heading and heading[0] == 'body' and sections[-1]['name'] == 'references':
+            heading = None
+        if heading:
+            name, inline = heading
+            sections.append({'name': name, 'lines': [inline] if inline.strip() else []})
+        else:
+            sections[-1]['lines'].append(line)
+    return sections
+
+
+def section_text(sections, name):
+    """Return the text of the first non-empty section with the given name"""
+    for section in sections:
+        if section['name'] == name:
+            text = '\n'.join(section['lines']).strip()
+            if text:
+                return text
+    return ""
+
+
+def front_matter(sections):
+    """Return the text before the first heading, where the title lives"""
+    return '\n'.join(sections[0]['lines'])
+
+
+def extract_abstract(sections, max_len=ABSTRACT_MAX_LEN):
+    """Return the cleaned abstract (truncated with '...'), or '' if there is none"""
+    abstract = clean_text(section_text(sections, 'abstract'))
+    if len(abstract) > max_len:
+        return abstract[:max_len] + "..."
+    return abstract
+
+
+def extract_keywords(sections):
+    """Return the keyword list of the first Keywords section"""
+    text = clean_text(section_text(sections, 'keywords').split('\n\n')[0])
+    return [k for k in KEYWORD_SPLIT.split(text.rstrip('.')) if k]
+
+
+def paragraphs(sections, skip=('references',)):
+    """Yield cleaned paragraphs in document order, leaving out the given sections"""
+    for section in sections:
+        if section['name'] in skip:
+            continue
+        for paragraph in '\n'.join(section['lines']).split('\n\n'):
+            cleaned = clean_text(paragraph)
+            if cleaned:
+                yield cleaned
@@ -0,0 +1,196 @@
+"""
+Content-addressed view of the study PDFs.
+
+Every PDF in documents/studies is hashed (memory-mapped, chunked, in
+parallel; unchanged size and mtime skip the hash) and grouped by SHA-256.
+Each hash is one blob with one canonical file, whose URL stays stable: the
+name without a copy marker like "(1)", then the shortest name. The other
+files with the same bytes are aliases.
+
+`url_patch` maps every alias to the canonical URL as a study_patches.py
+FIXES set, so studies point at the canonical blob, and `--apply` writes
+studies.json through the patch engine. Deleting the alias files from the
+deployed assets cannot be undone and is a separate step, `--delete-aliases`;
+it refuses while any alias URL is still referenced under client/src (pages,
+locale strings, other data). `canonical_path` lets the analyze scripts
+extract each blob once.
+
+Usage:
+    python pdf_store.py [--plan plan.json] [--apply [--delete-aliases]]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import unicodedata
+from urllib.parse import quote, unquote
+
+from file_manifest import load_manifest, save_manifest, hash_many
+from study_patches import STUDIES_JSON, run
+
+STUDIES_DIR = "/home/ubuntu/kava-wiki/client/public/documents/studies"
+STUDIES_URL = "/documents/studies/"
+CLIENT_SRC = "/home/ubuntu/kava-wiki/client/src"
+# Files under client/src that can hold a document URL
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.json', '.md', '.mdx', '.html', '.css')
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'pdf_store_manifest.json')
+
+# "report(1).pdf", "report (2).pdf", "report-copy.pdf"
+COPY_MARKER = re.compile(r'(?:\s*\(\d+\)|[-_ ]copy)(?=\.pdf$)', re.IGNORECASE)
+
+
+def canonical_rank(name):
+    """Sort key for picking the canonical name of a blob: no copy marker, shortest, alphabetical"""
+    return (bool(COPY_MARKER.search(name)), len(name), name)
+
+
+class PdfStore:
+    """PDFs of one directory grouped by content hash"""
+
+    def __init__(self, directory, hashes):
+        self.directory = directory
+        self.blobs = {}    # sha256 -> [file names], canonical first
+        self.by_name = {}  # file name -> sha256
+        for path, sha in hashes.items():
+            name = os.path.basename(path)
+            self.blobs.setdefault(sha, []).append(name)
+            self.by_name[name] = sha
+        for names in self.blobs.values():
+            names.sort(key=canonical_rank)
+
+    def canonical_name(self, name):
+        sha = self.by_name.get(name)
+        return self.blobs[sha][0] if sha else name
+
+    def canonical_path(self, path):
+        """Path of the canonical copy of a PDF (the path itself if it is unknown or unique)"""
+        return os.path.join(os.path.dirname(path), self.canonical_name(os.path.basename(path)))
+
+    def aliases(self):
+        """Yield (alias name, canonical name) for every duplicate file"""
+        for names in self.blobs.values():
+            for alias in names[1:]:
+                yield alias, names[0]
+
+    def duplicate_bytes(self):
+        return sum(os.path.getsize(os.path.join(self.directory, alias)) for alias, _ in self.aliases())
+
+    def url_patch(self):
+        """study_patches.py patch set pointing every alias at its canonical blob"""
+        return {
+            'FIXES': {alias: {'url': STUDIES_URL + canonical} for alias, canonical in self.aliases()},
+        }
+
+
+def study_pdf_path(study, directory, store=None):
+    """
+    Return the path of the PDF behind a study, or None.
+
+    Looks at a local document URL (which --apply points at the canonical
+    copy) and then at the id (the uploaded filename, possibly an alias), and
+    resolves the result to the canonical copy.
+    """
+    names = []
+    url = study.get('url', '')
+    if url.startswith(STUDIES_URL):
+        names.append(unquote(url[len(STUDIES_URL):]))
+    names.append(study.get('id', ''))
+    for name in names:
+        path = os.path.join(directory, name)
+        if name.lower().endswith('.pdf') and os.path.exists(path):
+            return store.canonical_path(path) if store else path
+    return None
+
+
+def url_forms(name):
+    """Every way a file name can appear in a URL: NFC/NFD, raw and percent-encoded"""
+    forms = set()
+    for form in ('NFC', 'NFD'):
+        normalized = unicodedata.normalize(form, name)
+        forms.update({STUDIES_URL + normalized, STUDIES_URL + quote(normalized)})
+    return forms
+
+
+def find_references(names, src_dir=CLIENT_SRC):
+    """Return {name: [files]} for the file names whose document URL occurs under src_dir"""
+    forms = {form: name for name in names for form in url_forms(name)}
+    found = {}
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = [d for d in dirs if d != 'node_modules']
+        for file_name in files:
+            if not file_name.endswith(SOURCE_EXTENSIONS):
+                continue
+            path = os.path.join(root, file_name)
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            if STUDIES_URL not in text:
+                continue
+            for form, name in forms.items():
+                if form in text and path not in found.get(name, []):
+                    found.setdefault(name, []).append(path)
+    return found
+
+
+def load_store(directory=STUDIES_DIR, manifest_path=MANIFEST_PATH, max_workers=None):
+    """Hash the PDFs of a directory (reusing unchanged hashes) and return the PdfStore"""
+    manifest = load_manifest(manifest_path)
+    paths = [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+             if name.lower().endswith('.pdf')]
+    hashes = hash_many(manifest, paths, max_workers)
+    # Forget files that no longer exist so the manifest does not grow forever
+    for path in set(manifest['files']) - set(paths):
+        del manifest['files'][path]
+    save_manifest(manifest, manifest_path)
+    return PdfStore(directory, {path: sha for path, (sha, _) in hashes.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find byte-identical study PDFs and point studies at one copy")
+    parser.add_argument('--dir', default=STUDIES_DIR, help="directory with the study PDFs")
+    parser.add_argument('--json', default=STUDIES_JSON, help="path to studies.json")
+    parser.add_argument('--plan', help="write the alias -> canonical URL patch file here")
+    parser.add_argument('--apply', action='store_true', help="rewrite studies.json to the canonical URLs")
+    parser.add_argument('--delete-aliases', action='store_true',
+                        help="with --apply: also delete the alias files once nothing under --src links to them")
+    parser.add_argument('--src', default=CLIENT_SRC, help="client sources to check for alias URLs")
+    args = parser.parse_args()
+    if args.delete_aliases and not args.apply:
+        parser.error("--delete-aliases needs --apply")
+
+    store = load_store(args.dir)
+    aliases = list(store.aliases())
+    for alias, canonical in aliases:
+        print(f"{alias} -> {canonical}")
+    print(f"{len(store.by_name)} PDFs, {len(store.blobs)} unique, "
+          f"{len(aliases)} duplicates ({store.duplicate_bytes() / 1e6:.1f} MB)")
+
+    plan_path = args.plan or (os.path.join(os.path.dirname(MANIFEST_PATH), 'pdf_store_plan.json') if args.apply else None)
+    if plan_path:
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            json.dump(store.url_patch(), f, indent=2, ensure_ascii=False)
+        print(f"URL patch written to {plan_path}")
+
+    if not (args.apply and aliases):
+        return
+    if run([plan_path], args.json, strict=True) != 0:
+        return
+    if not args.delete_aliases:
+        print("Alias files kept; run again with --delete-aliases to delete them")
+        return
+    references = find_references([alias for alias, _ in aliases], args.src)
+    if references:
+        for alias, files in sorted(references.items()):
+            print(f"Still referenced: {alias}")
+            for path in files:
+                print(f"    {path}")
+        print(f"{len(references)} alias files are still linked, nothing deleted")
+        sys.exit(1)
+    for alias, _ in aliases:
+        os.remove(os.path.join(args.dir, alias))
+    print(f"Deleted {len(aliases)} duplicate files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+PDF text extraction shared by analyze_pdfs.py and analyze_pdfs_v2.py.
+
+Text comes from a pluggable backend: `pdftotext` (poppler, one process per
+file) or `pypdf` (in-process, decodes only the requested pages). The backend
+is picked with the PDF_TEXT_BACKEND environment variable ("pdftotext",
+"pypdf" or "auto", the default), and a missing backend is an error rather
+than silently empty text.
+
+`extract_many` keeps a bounded number of extractions in flight and yields
+results as they finish so the title/summary heuristics can work while the
+remaining files are extracted.
+
+Extracted pages are kept in a content-addressed cache (`TextCache`) keyed by
+(PDF SHA-256, page, layout flag, extractor version), so re-running the
+analysis after a heuristic tweak does not open a single PDF again.
+"""
+
+import os
+import shutil
+import signal
+import sqlite3
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from file_manifest import sha256_file
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+DEFAULT_TIMEOUT = 30  # seconds per file
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'pdf_text.sqlite')
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ExtractionTimeout(BaseException):
+    """
+    An in-process extraction ran longer than its timeout.
+
+    A BaseException like KeyboardInterrupt, so pypdf's `except Exception`
+    handlers around page parsing cannot swallow it.
+    """
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Raise ExtractionTimeout in the block after `seconds`.
+
+    Uses SIGALRM, so it only applies in a main thread - which is where
+    process pool workers run their tasks - and is a no-op elsewhere.
+    """
+    if not seconds or not hasattr(signal, 'SIGALRM') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ExtractionTimeout(f"no result after {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class PdftotextBackend:
+    """Runs poppler's pdftotext in a subprocess per file"""
+
+    name = 'pdftotext'
+    # Bump when the extraction command or its flags change to invalidate cached pages
+    version = 'pdftotext-1'
+    in_process = False
+
+    @staticmethod
+    def available():
+        return shutil.which('pdftotext') is not None
+
+    def extract(self, pdf_path, first_page, last_page, layout=False, timeout=DEFAULT_TIMEOUT):
+        """Return the text of a page range, raising on failure or timeout"""
+        cmd = ['pdftotext', '-f', str(first_page), '-l', str(last_page)]
+        if layout:
+            cmd.append('-layout')
+        cmd += [pdf_path, '-']
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"pdftotext exited with {result.returncode}")
+        return result.stdout
+
+
+class PypdfBackend:
+    """
+    Extracts text in-process with pypdf.
+
+    Only the requested pages are decoded. Pages are terminated with a form
+    feed like pdftotext output so callers and the cache see the same shape.
+    The timeout interrupts the extraction with `time_limit`; extract_many runs
+    it in process pool workers, where that always applies.
+    """
+
+    name = 'pypdf'
+    in_process = True
+
+    @property
+    def version(self):
+        return f"pypdf-{pypdf.__version__}-1"
+
+    @staticmethod
+    def available():
+        return pypdf is not None
+
+    def extract(self, pdf_path, first_page, last_page, layout=False, timeout=DEFAULT_TIMEOUT):
+        """Return the text of a page range, raising on failure or timeout"""
+        with time_limit(timeout):
+            reader = pypdf.PdfReader(pdf_path)
+            mode = 'layout' if layout else 'plain'
+            pages = []
+            for page in reader.pages[first_page - 1:last_page]:
+                pages.append(page.extract_text(extraction_mode=mode) + '\f')
+            return ''.join(pages)
+
+
+BACKENDS = {
+    'pdftotext': PdftotextBackend,
+    'pypdf': PypdfBackend,
+}
+
+
+def get_backend(name=None):
+    """Return the named backend; "auto" picks the first one that is installed"""
+    name = name or os.environ.get('PDF_TEXT_BACKEND', 'auto')
+    if name == 'auto':
+        for backend_class in BACKENDS.values():
+            if backend_class.available():
+                return backend_class()
+        raise RuntimeError("No PDF text backend available: install poppler-utils (pdftotext) or pypdf")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF text backend '{name}'. Available: {', '.join(BACKENDS)}")
+    if not BACKENDS[name].available():
+        raise RuntimeError(f"PDF text backend '{name}' is not installed")
+    return BACKENDS[name]()
+
+
+def extract_uncached(pdf_path, first_page=1, last_page=2, layout=False,
+                     timeout=DEFAULT_TIMEOUT, backend_name=None):
+    """
+    Extract a page range, returning (text, ok) instead of raising.
+
+    Takes the backend by name so it can run in a worker process.
+    """
+    backend = get_backend(backend_name)
+    try:
+        return backend.extract(pdf_path, first_page, last_page, layout, timeout), True
+    except (subprocess.TimeoutExpired, ExtractionTimeout):
+        print(f"Timeout after {timeout}s reading {pdf_path}")
+    except Exception as e:
+        print(f"Error reading {pdf_path}: {e}")
+    return "", False
+
+
+def extract_text_from_pdf(pdf_path, first_page=1, last_page=2, layout=False,
+                          timeout=DEFAULT_TIMEOUT, cache=None, backend=None):
+    """Extract the text of a page range, using the page cache when given"""
+    backend = backend or get_backend()
+    sha = None
+    if cache is not None:
+        sha = cache.file_sha(pdf_path)
+        cached = cache.get(sha, first_page, last_page, layout, backend.version)
+        if cached is not None:
+            return cached
+    text, ok = extract_uncached(pdf_path, first_page, last_page, layout, timeout, backend.name)
+    # Failed extractions are not cached so they are retried next time
+    if cache is not None and ok:
+        cache.put(sha, first_page, last_page, layout, text, backend.version)
+    return text
+
+
+def split_pages(text):
+    """Split extracted text into pages (every page ends with a form feed)"""
+    pages = text.split('\f')
+    if pages and pages[-1] == '':
+        pages.pop()
+    return pages
+
+
+class TextCache:
+    """
+    Size-bounded, LRU-evicted page cache stored in SQLite.
+
+    Pages are cached individually, so overlapping ranges requested by
+    different scripts share entries as long as the layout flag matches.
+    Source files are hashed once and re-hashed only when size or mtime change.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, sha256 TEXT
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                sha256 TEXT, page INTEGER, layout INTEGER, version TEXT,
+                text TEXT, size INTEGER, last_used REAL,
+                PRIMARY KEY (sha256, page, layout, version)
+            );
+            CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used);
+        """)
+
+    def file_sha(self, pdf_path):
+        """Return the SHA-256 of a PDF without reading it if size and mtime are unchanged"""
+        stat = os.stat(pdf_path)
+        row = self.db.execute(
+            "SELECT size, mtime, sha256 FROM files WHERE path = ?", (pdf_path,)
+        ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        sha = sha256_file(pdf_path)
+        self.db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+            (pdf_path, stat.st_size, stat.st_mtime_ns, sha)
+        )
+        self.db.commit()
+        return sha
+
+    def get(self, sha, first_page, last_page, layout, version):
+        """Return the cached text of a page range, or None if any page is missing"""
+        rows = self.db.execute(
+            "SELECT page, text FROM pages WHERE sha256 = ? AND layout = ? AND version = ? "
+            "AND page BETWEEN ? AND ? ORDER BY page",
+            (sha, int(layout), version, first_page, last_page)
+        ).fetchall()
+        if len(rows) != last_page - first_page + 1:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.db.execute(
+            "UPDATE pages SET last_used = ? WHERE sha256 = ? AND layout = ? AND version = ? "
+            "AND page BETWEEN ? AND ?",
+            (time.time(), sha, int(layout), version, first_page, last_page)
+        )
+        self.db.commit()
+        # Pages past the end of the document are stored as NULL
+        return ''.join(text + '\f' for _, text in rows if text is not None)
+
+    def put(self, sha, first_page, last_page, layout, text, version):
+        """Store the pages of an extracted range and evict old entries if over budget"""
+        pages = split_pages(text)
+        now = time.time()
+        rows = []
+        for offset, page in enumerate(range(first_page, last_page + 1)):
+            page_text = pages[offset] if offset < len(pages) else None
+            size = len(page_text.encode('utf-8')) if page_text else 0
+            rows.append((sha, page, int(layout), version, page_text, size, now))
+        self.db.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self.db.commit()
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used pages until the cache fits in max_bytes"""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for rowid, size in self.db.execute("SELECT rowid, size FROM pages ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((rowid,))
+            total -= size
+        self.db.executemany("DELETE FROM pages WHERE rowid = ?", doomed)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+class ExtractionStats:
+    """Throughput counters for a batch of extractions"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.pdfs = 0
+        self.pages = 0
+        self.cached = 0
+
+    def add(self, text, cached=False):
+        self.pdfs += 1
+        self.cached += int(cached)
+        # Backends terminate every page with a form feed
+        self.pages += text.count('\f')
+
+    def report(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        print(f"Extracted {self.pdfs} PDFs / {self.pages} pages in {elapsed:.1f}s "
+              f"({self.pdfs / elapsed:.1f} PDFs/s, {self.pages / elapsed:.1f} pages/s, "
+              f"{self.cached} from cache)")
+
+
+def extract_many(pdf_paths, first_page=1, last_page=2, layout=False, max_workers=None,
+                 timeout=DEFAULT_TIMEOUT, stats=None, cache=None, backend=None):
+    """
+    Yield (pdf_path, text) for every path, in completion order.
+
+    Cached ranges are yielded straight away. For the rest, at most
+    `max_workers` extractions run at once and no more than twice that many
+    results are queued, so memory stays bounded however long the input list
+    is. Subprocess backends are driven from threads; in-process backends get
+    a process pool so they are not serialized by the GIL. The cache is only
+    touched from the calling thread.
+    """
+    backend = backend or get_backend()
+    workers = max_workers or os.cpu_count() or 4
+    executor_class = ProcessPoolExecutor if backend.in_process else ThreadPoolExecutor
+    paths = iter(pdf_paths)
+    pending = {}
+
+    with executor_class(max_workers=workers) as pool:
+        def submit_next():
+            """Submit the next uncached path, returning cache hits to be yielded"""
+            hits = []
+            for path in paths:
+                sha = None
+                if cache is not None:
+                    sha = cache.file_sha(path)
+                    cached = cache.get(sha, first_page, last_page, layout, backend.version)
+                    if cached is not None:
+                        hits.append((path, cached))
+                        continue
+                future = pool.submit(extract_uncached, path, first_page, last_page,
+                                     layout, timeout, backend.name)
+                pending[future] = (path, sha)
+                break
+            return hits
+
+        def emit(path, text, cached):
+            if stats is not None:
+                stats.add(text, cached)
+            return path, text
+
+        for _ in range(workers * 2):
+            for path, text in submit_next():
+                yield emit(path, text, True)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, sha = pending.pop(future)
+                text, ok = future.result()
+                if cache is not None and ok:
+                    cache.put(sha, first_page, last_page, layout, text, backend.version)
+                for hit_path, hit_text in submit_next():
+                    yield emit(hit_path, hit_text, True)
+                yield emit(path, text, False)
@@ -1,39 +1,132 @@
 import pandas as pd
 import json
 import os
+import sys
 import glob
-import re
 
-def clean_text(text):
-    if pd.isna(text):
-        return ""
-    return str(text).strip()
+from file_manifest import load_manifest, save_manifest, file_hash, fingerprint
+from study_index import primary_key
+
+BOOKS = [
+    {
+        "id": "book-lebot",
+        "title": "Kava: The Pacific Elixir - The Definitive Guide to Its Ethnobotany, History, and Chemistry",
+        "authors": "Vincent Lebot, Mark Merlin, Lamont Lindstrom",
+        "publication": "Yale University Press",
+        "year": "1997",
+        "summary": "Das Standardwerk über Kava. Umfassende Abhandlung über Botanik, Chemie, Ethnobotanik, Anthropologie und Ökonomie von Piper methysticum.",
+        "significance": "Das wichtigste wissenschaftliche Referenzwerk für Kava-Forschung.",
+        "url": "",
+        "type": "book",
+        "category": "Standard Works",
+        "featured": True
+    },
+    {
+        "id": "book-wurzel-der-ruhe",
+        "title": "Kava – Wurzel der Ruhe",
+        "authors": "User (Kava-mode.com)",
+        "publication": "Self-published",
+        "year": "2025",
+        "summary": "Ein umfassender Leitfaden zu Wirkung, Anwendung, Geschichte & Kultur.",
+        "significance": "Praxisnaher, moderner Leitfaden für deutschsprachige Anwender.",
+        "url": "",
+        "type": "book",
+        "category": "Standard Works",
+        "featured": True
+    }
+]
+
+# Excel export column -> study field
+EXCEL_COLUMNS = {
+    'DOI': 'id',
+    'Title': 'title',
+    'Authors': 'authors',
+    'Journal': 'publication',
+    'Abstract': 'summary', # Will need manual refinement or LLM summary later
+}
+PUBLICATION_DATE_COLUMN = 'Publication date'
+STREAM_CHUNK_ROWS = 5000
+
+def clean_column(series):
+    # NaN/NaT -> "", everything else stripped text. Going through object keeps
+    # a datetime column from turning its missing cells back into NaN
+    values = series.astype(object)
+    return values.where(values.notna(), "").astype(str).str.strip()
+
+def header_labels(header):
+    """
+    Column labels for a raw header row, named the way pd.read_excel names them.
+    
+    Empty cells become "Unnamed: <n>" and repeated labels get ".1", ".2", ...,
+    so the frame never has duplicate labels.
+    """
+    labels = []
+    seen = {}
+    for index, cell in enumerate(header):
+        label = f"Unnamed: {index}" if cell is None or str(cell).strip() == "" else str(cell)
+        if label in seen:
+            seen[label] += 1
+            label = f"{label}.{seen[label]}"
+        seen.setdefault(label, 0)
+        labels.append(label)
+    return labels
+
+def transform_frame(df):
+    """Turn a frame of export rows into study records, one column at a time"""
+    # reindex refuses duplicate labels; the first column of a name wins, as with read_excel
+    df = df.loc[:, ~df.columns.duplicated()]
+    df = df.reindex(columns=list(EXCEL_COLUMNS) + [PUBLICATION_DATE_COLUMN])
+    out = pd.DataFrame({field: clean_column(df[column]) for column, field in EXCEL_COLUMNS.items()})
+    
+    # Extract year from publication date ("2016-05-01", "2016-05-01 00:00:00" or just "2016")
+    pub_date = clean_column(df[PUBLICATION_DATE_COLUMN])
+    out['year'] = pub_date.str.split('-', n=1).str[0].fillna("")
+    
+    out['significance'] = "" # To be filled
+    out['url'] = ("https://doi.org/" + out['id']).where(out['id'] != "", "")
+    out['type'] = "scientific_paper"
+    out['category'] = "Pharmacology & Safety" # Default category, can be refined
+    
+    columns = ['id', 'title', 'authors', 'publication', 'year', 'summary', 'significance', 'url', 'type', 'category']
+    return out[columns].to_dict('records')
 
 def process_excel(file_path):
-    df = pd.read_excel(file_path)
+    # All sheets of the workbook, transformed column-wise
+    sheets = pd.read_excel(file_path, sheet_name=None)
     studies = []
-    
-    for _, row in df.iterrows():
-        # Extract year from publication date
-        pub_date = str(row.get('Publication date', ''))
-        year = pub_date.split('-')[0] if '-' in pub_date else pub_date
-        
-        study = {
-            "id": clean_text(row.get('DOI', '')),
-            "title": clean_text(row.get('Title', '')),
-            "authors": clean_text(row.get('Authors', '')),
-            "publication": clean_text(row.get('Journal', '')),
-            "year": year,
-            "summary": clean_text(row.get('Abstract', '')), # Will need manual refinement or LLM summary later
-            "significance": "", # To be filled
-            "url": f"https://doi.org/{clean_text(row.get('DOI', ''))}" if row.get('DOI') else "",
-            "type": "scientific_paper",
-            "category": "Pharmacology & Safety" # Default category, can be refined
-        }
-        studies.append(study)
+    for df in sheets.values():
+        studies.extend(transform_frame(df))
     return studies
 
-def process_pdfs(upload_dir):
+def stream_excel(file_path, chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    Yield studies from every sheet without loading the workbook into memory.
+    
+    Uses openpyxl's read-only mode and transforms `chunk_rows` rows at a
+    time, so memory stays flat however large the export is.
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                continue
+            header = header_labels(header)
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    yield from transform_frame(pd.DataFrame(chunk, columns=header))
+                    chunk = []
+            if chunk:
+                yield from transform_frame(pd.DataFrame(chunk, columns=header))
+    finally:
+        workbook.close()
+
+def process_pdfs(upload_dir, manifest=None):
     pdf_studies = []
     pdf_files = glob.glob(os.path.join(upload_dir, "*.pdf"))
     
@@ -43,6 +136,12 @@ def process_pdfs(upload_dir):
         # Skip the books as they are handled separately
         if "KavaBuch" in filename or "WurzelderRuhe" in filename:
             continue
+        
+        # In incremental mode only new or changed PDFs are ingested
+        if manifest is not None:
+            _, changed = file_hash(manifest, pdf_path)
+            if not changed:
+                continue
             
         # Simple extraction from filename - can be improved
         title = filename.replace('.pdf', '').replace('-', ' ').replace('_', ' ')
@@ -62,61 +161,112 @@ def process_pdfs(upload_dir):
         pdf_studies.append(study)
     return pdf_studies
 
+def study_key(study):
+    # Canonical DOI for Excel rows, normalized filename for PDFs; title for rows without either
+    return primary_key(study)
+
+def record_rows(manifest, studies):
+    for study in studies:
+        manifest['rows'][study_key(study)] = {
+            "fingerprint": fingerprint(study),
+            "fields": study
+        }
+
+def merge_studies(existing, ingested, manifest):
+    """
+    Merge freshly ingested studies into the existing records by stable id.
+    
+    A field is only overwritten when it still holds the value from the previous
+    ingest, so corrections applied later by the fix_studies_* scripts survive.
+    """
+    by_key = {study_key(s): s for s in existing}
+    rows = manifest['rows']
+    added = updated = 0
+    
+    for study in ingested:
+        key = study_key(study)
+        previous = rows.get(key)
+        if previous and previous['fingerprint'] == fingerprint(study):
+            continue
+        
+        current = by_key.get(key)
+        if current is None:
+            if previous:
+                # Ingested before and removed by curation since - keep it removed
+                rows[key] = {"fingerprint": fingerprint(study), "fields": study}
+                continue
+            existing.append(study)
+            by_key[key] = study
+            added += 1
+        else:
+            previous_fields = previous['fields'] if previous else {}
+            for field, value in study.items():
+                if field not in current:
+                    current[field] = value
+                elif field in previous_fields and current[field] == previous_fields[field]:
+                    current[field] = value
+            updated += 1
+        
+        rows[key] = {"fingerprint": fingerprint(study), "fields": study}
+    
+    return added, updated
+
 def main():
     excel_path = "/home/ubuntu/upload/2025-12-16_14-18-25_34_66650823.xlsx"
     upload_dir = "/home/ubuntu/upload"
     output_path = "/home/ubuntu/kava-wiki/client/src/data/studies.json"
+    manifest_path = "/home/ubuntu/kava-wiki/scripts/.cache/studies_manifest.json"
+    
+    # --incremental: only parse new/changed inputs and merge them into the existing studies.json
+    incremental = "--incremental" in sys.argv[1:] and os.path.exists(output_path)
+    # --stream: read the workbook row by row (read-only) for very large exports
+    stream = "--stream" in sys.argv[1:]
+    manifest = load_manifest(manifest_path)
+    if not incremental:
+        manifest['rows'] = {}
     
     all_studies = []
     
     # 1. Add Books (Featured)
-    books = [
-        {
-            "id": "book-lebot",
-            "title": "Kava: The Pacific Elixir - The Definitive Guide to Its Ethnobotany, History, and Chemistry",
-            "authors": "Vincent Lebot, Mark Merlin, Lamont Lindstrom",
-            "publication": "Yale University Press",
-            "year": "1997",
-            "summary": "Das Standardwerk über Kava. Umfassende Abhandlung über Botanik, Chemie, Ethnobotanik, Anthropologie und Ökonomie von Piper methysticum.",
-            "significance": "Das wichtigste wissenschaftliche Referenzwerk für Kava-Forschung.",
-            "url": "",
-            "type": "book",
-            "category": "Standard Works",
-            "featured": True
-        },
-        {
-            "id": "book-wurzel-der-ruhe",
-            "title": "Kava – Wurzel der Ruhe",
-            "authors": "User (Kava-mode.com)",
-            "publication": "Self-published",
-            "year": "2025",
-            "summary": "Ein umfassender Leitfaden zu Wirkung, Anwendung, Geschichte & Kultur.",
-            "significance": "Praxisnaher, moderner Leitfaden für deutschsprachige Anwender.",
-            "url": "",
-            "type": "book",
-            "category": "Standard Works",
-            "featured": True
-        }
-    ]
-    all_studies.extend(books)
+    all_studies.extend(BOOKS)
     
-    # 2. Process Excel
+    # 2. Process Excel (skipped in incremental mode when the export is unchanged)
     if os.path.exists(excel_path):
-        print(f"Processing Excel: {excel_path}")
-        excel_studies = process_excel(excel_path)
-        all_studies.extend(excel_studies)
+        _, changed = file_hash(manifest, excel_path)
+        if changed or not incremental:
+            print(f"Processing Excel: {excel_path}")
+            if stream:
+                all_studies.extend(stream_excel(excel_path))
+            else:
+                all_studies.extend(process_excel(excel_path))
+        else:
+            print(f"Excel unchanged, skipping: {excel_path}")
     
     # 3. Process PDFs
     print(f"Processing PDFs from: {upload_dir}")
-    pdf_studies = process_pdfs(upload_dir)
+    pdf_studies = process_pdfs(upload_dir, manifest if incremental else None)
     all_studies.extend(pdf_studies)
     
+    if incremental:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+        added, updated = merge_studies(existing, all_studies, manifest)
+        print(f"Incremental merge: {added} added, {updated} updated")
+        all_studies = existing
+    else:
+        if os.path.exists(upload_dir):
+            # Record PDF hashes so the next incremental run can skip them
+            for pdf_path in glob.glob(os.path.join(upload_dir, "*.pdf")):
+                file_hash(manifest, pdf_path)
+        record_rows(manifest, all_studies)
+    
     # Ensure directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
     # Write JSON
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(all_studies, f, indent=2, ensure_ascii=False)
+    save_manifest(manifest, manifest_path)
     
     print(f"Successfully wrote {len(all_studies)} entries to {output_path}")
 
@@ -0,0 +1,298 @@
+"""
+Near-duplicate detection for studies.json with MinHash and LSH.
+
+Every study gets two MinHash signatures: one over the character 4-grams of
+its normalized title (spaces removed, so a title rebuilt from a filename like
+"Assessmentoftheriskof..." still matches the real one) and one over the word
+3-grams of its abstract. Signatures are split into bands; studies that share
+a band bucket in either signature become candidate pairs, so the work grows
+with the number of studies plus the number of near-duplicates instead of with
+all pairs. Candidates are verified by the estimated Jaccard similarity of
+their signatures and grouped into clusters.
+
+The result is a merge plan for review: for every cluster the study to keep,
+the ones to remove, the fields the keeper takes over from them (a local PDF
+link, a real abstract, authors...) and the similarity scores. Clusters with
+a pair whose authors differ are only listed for review. Written with --plan,
+it is a study_patches.py patch file (REMOVE_LIST plus FIXES onto the
+keepers), so after review it is applied with
+
+    python study_patches.py studies_merge_plan.json
+
+Usage:
+    python study_dedup.py [--json studies.json] [--plan plan.json] [--threshold 0.6]
+"""
+
+import argparse
+import json
+import zlib
+
+import numpy as np
+
+from fuzzy_match import normalize
+from study_patches import STUDIES_JSON
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands of 4 rows: pairs from ~0.45 Jaccard on become candidates
+THRESHOLD = 0.6
+# Permutations are (a * x + b) mod P over 32-bit shingle hashes; a < 2**31
+# keeps a * x + b inside uint64
+PRIME = 4294967311
+CHUNK_SHINGLES = 100_000
+# Short titles ("Kava: Piper methysticum") share most 4-grams by chance,
+# so below this many shingles a title match has to be near exact
+SHORT_TITLE_SHINGLES = 20
+SHORT_TITLE_THRESHOLD = 0.9
+PLACEHOLDER_SUMMARIES = ("zusammenfassung wird generiert",)
+# Fields a keeper takes over from the studies it replaces when its own are empty
+MERGE_FIELDS = ('url', 'summary', 'authors', 'publication', 'year')
+LOCAL_DOCUMENTS = '/documents/studies/'
+
+
+def title_shingles(title, size=4):
+    """Character n-grams of the title with whitespace removed"""
+    text = normalize(title).replace(' ', '')
+    return {text[i:i + size] for i in range(len(text) - size + 1)} if len(text) >= size else set()
+
+
+def abstract_shingles(summary, size=3):
+    """Word n-grams of the abstract; placeholder summaries have none"""
+    text = normalize(summary)
+    if not text or any(text.startswith(p) for p in PLACEHOLDER_SUMMARIES):
+        return set()
+    words = text.split()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def author_tokens(authors):
+    return {w for w in normalize(authors).split() if len(w) > 2}
+
+
+class MinHasher:
+    """Computes MinHash signatures for many shingle sets in vectorized batches"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)[:, None]
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+
+    def signatures(self, shingle_sets):
+        """
+        Return (signatures, has_shingles): one row per set, num_perm columns.
+
+        Rows of empty sets are left at the maximum value and flagged False.
+        """
+        sigs = np.full((len(shingle_sets), self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        present = np.array([bool(s) for s in shingle_sets])
+        batch_rows, batch_hashes = [], []
+
+        def flush():
+            if not batch_rows:
+                return
+            hashes = np.fromiter((h for hs in batch_hashes for h in hs), dtype=np.uint64)
+            offsets = np.cumsum([0] + [len(hs) for hs in batch_hashes[:-1]])
+            values = (self.a * hashes[None, :] + self.b) % PRIME
+            sigs[batch_rows] = np.minimum.reduceat(values, offsets, axis=1).T
+            batch_rows.clear()
+            batch_hashes.clear()
+
+        pending = 0
+        for row, shingles in enumerate(shingle_sets):
+            if not shingles:
+                continue
+            batch_rows.append(row)
+            batch_hashes.append([zlib.crc32(s.encode('utf-8')) for s in shingles])
+            pending += len(shingles)
+            if pending >= CHUNK_SHINGLES:
+                flush()
+                pending = 0
+        flush()
+        return sigs, present
+
+
+def lsh_candidates(sigs, present, bands=BANDS):
+    """Yield candidate (i, j) pairs, i < j, that share a bucket in any band"""
+    rows = sigs.shape[1] // bands
+    seen = set()
+    for band in range(bands):
+        buckets = {}
+        chunk = np.ascontiguousarray(sigs[:, band * rows:(band + 1) * rows])
+        for i in np.flatnonzero(present):
+            buckets.setdefault(chunk[i].tobytes(), []).append(int(i))
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pair = (members[x], members[y])
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+
+def estimated_jaccard(sigs, i, j):
+    return float(np.count_nonzero(sigs[i] == sigs[j])) / sigs.shape[1]
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        self.parent[self.find(x)] = self.find(y)
+
+
+def keep_rank(study):
+    """Sort key for the study a cluster keeps: DOI, real summary, most fields, not a "(1)" copy"""
+    study_id = study.get('id', '')
+    return (
+        study_id.startswith('10.') or 'doi.org' in study.get('url', ''),
+        bool(abstract_shingles(study.get('summary', ''))),
+        sum(1 for v in study.values() if v),
+        '(1)' not in study_id,
+        -len(study_id),
+    )
+
+
+def merged_fields(keeper, removed):
+    """
+    Fields the keeper should take over from the removed studies of its cluster.
+
+    Empty fields are filled from the first removed study that has them; a
+    local PDF link also replaces an external one, and a real abstract a
+    placeholder.
+    """
+    fields = {}
+    for field in MERGE_FIELDS:
+        current = keeper.get(field) or ''
+        for study in removed:
+            value = study.get(field) or ''
+            if not value or value == current:
+                continue
+            if field == 'url' and LOCAL_DOCUMENTS in value and LOCAL_DOCUMENTS not in current:
+                fields[field] = value
+                break
+            if field == 'summary' and abstract_shingles(value) and not abstract_shingles(current):
+                fields[field] = value
+                break
+            if not current:
+                fields[field] = value
+                break
+    return fields
+
+
+def find_duplicates(studies, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """
+    Return the merge plan: [{'keep', 'remove', 'merge', 'review', 'pairs'}]
+    for every cluster.
+
+    A pair is a duplicate when the estimated Jaccard similarity of its
+    titles or of its abstracts reaches the threshold (short titles need
+    SHORT_TITLE_THRESHOLD). `review` is set when a pair's authors differ;
+    such clusters are not applied automatically.
+    """
+    hasher = MinHasher(num_perm)
+    titles = [title_shingles(s.get('title', '')) for s in studies]
+    title_sigs, has_title = hasher.signatures(titles)
+    abstract_sigs, has_abstract = hasher.signatures([abstract_shingles(s.get('summary', '')) for s in studies])
+
+    candidates = set(lsh_candidates(title_sigs, has_title, bands))
+    candidates.update(lsh_candidates(abstract_sigs, has_abstract, bands))
+
+    clusters = UnionFind(len(studies))
+    pairs = []
+    for i, j in sorted(candidates):
+        title_score = estimated_jaccard(title_sigs, i, j) if has_title[i] and has_title[j] else 0.0
+        abstract_score = estimated_jaccard(abstract_sigs, i, j) if has_abstract[i] and has_abstract[j] else 0.0
+        title_threshold = threshold
+        if min(len(titles[i]), len(titles[j])) < SHORT_TITLE_SHINGLES:
+            title_threshold = max(threshold, SHORT_TITLE_THRESHOLD)
+        if title_score < title_threshold and abstract_score < threshold:
+            continue
+        authors_i, authors_j = author_tokens(studies[i].get('authors', '')), author_tokens(studies[j].get('authors', ''))
+        pairs.append({
+            'studies': [studies[i].get('id'), studies[j].get('id')],
+            'title': round(title_score, 2),
+            'abstract': round(abstract_score, 2),
+            # Both sides name authors and none are shared: worth a closer look
+            'authors_differ': bool(authors_i and authors_j and not authors_i & authors_j),
+        })
+        clusters.union(i, j)
+
+    groups = {}
+    for i in range(len(studies)):
+        groups.setdefault(clusters.find(i), []).append(i)
+    pairs_by_id = {}
+    for pair in pairs:
+        pairs_by_id.setdefault(pair['studies'][0], []).append(pair)
+
+    plan = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        keeper = max(members, key=lambda m: keep_rank(studies[m]))
+        cluster_pairs = [p for m in members for p in pairs_by_id.get(studies[m].get('id'), [])]
+        plan.append({
+            'keep': studies[keeper].get('id'),
+            'remove': [studies[m].get('id') for m in members if m != keeper],
+            'merge': merged_fields(studies[keeper], [studies[m] for m in members if m != keeper]),
+            'review': any(p['authors_differ'] for p in cluster_pairs),
+            'titles': {studies[m].get('id'): studies[m].get('title', '') for m in members},
+            'pairs': cluster_pairs,
+        })
+    return plan
+
+
+def plan_patch(plan):
+    """study_patches.py patch set for the clusters that need no review"""
+    applied = [cluster for cluster in plan if not cluster['review']]
+    return {
+        '_clusters': plan,
+        'FIXES': {cluster['keep']: cluster['merge'] for cluster in applied if cluster['merge']},
+        'REMOVE_LIST': [study_id for cluster in applied for study_id in cluster['remove']],
+    }
+
+
+def print_plan(plan):
+    for cluster in plan:
+        if cluster['review']:
+            print("Review (authors differ, not in the patch):")
+        print(f"Keep:   {cluster['keep']}  ({cluster['titles'][cluster['keep']][:70]})")
+        for study_id in cluster['remove']:
+            print(f"Remove: {study_id}  ({cluster['titles'][study_id][:70]})")
+        for field, value in cluster['merge'].items():
+            print(f"Merge:  {field} = {value[:70]!r}")
+        for pair in cluster['pairs']:
+            flag = "  authors differ" if pair['authors_differ'] else ""
+            print(f"    title {pair['title']:.2f}  abstract {pair['abstract']:.2f}  "
+                  f"{pair['studies'][0]} ~ {pair['studies'][1]}{flag}")
+        print()
+    applied = [c for c in plan if not c['review']]
+    print(f"{len(plan)} duplicate clusters, {sum(len(c['remove']) for c in applied)} studies to remove, "
+          f"{len(plan) - len(applied)} clusters to review")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate studies and write a merge plan")
+    parser.add_argument('--json', default=STUDIES_JSON, help="path to studies.json")
+    parser.add_argument('--plan', help="write the plan as a study_patches.py patch file")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    with open(args.json, 'r', encoding='utf-8') as f:
+        studies = json.load(f)
+    plan = find_duplicates(studies, args.threshold)
+    print_plan(plan)
+    if args.plan:
+        with open(args.plan, 'w', encoding='utf-8') as f:
+            json.dump(plan_patch(plan), f, indent=2, ensure_ascii=False)
+        print(f"Merge plan written to {args.plan} - review it, then apply it with study_patches.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Shared lookup index for study records.
+
+Studies are referred to in many forms: a bare DOI, a doi.org URL, a local
+/documents/studies/... path, a PDF filename (sometimes URL-encoded or in
+decomposed Unicode), or another URL. `canonical_keys` maps every one of those
+forms to the same keys once, and `KeyIndex` keeps a dict from key to record,
+so matching a study is a handful of O(1) lookups instead of regex scans and
+linear searches over the fix lists.
+"""
+
+import re
+import unicodedata
+from urllib.parse import unquote, urlsplit
+
+DOI_PATTERN = re.compile(r'10\.\d{4,9}/[-._;()/:a-zA-Z0-9]+')
+
+
+def normalize_filename(name):
+    # URL-decode and compose accents so "O%CC%88ffentlich" == "Öffentlich"
+    return unicodedata.normalize('NFC', unquote(name)).strip().lower()
+
+
+def canonical_doi(value):
+    """Return the lower-cased DOI contained in a string, or None"""
+    match = DOI_PATTERN.search(unquote(value or ''))
+    if not match:
+        return None
+    return match.group(0).rstrip('.,;').lower()
+
+
+def canonical_keys(value):
+    """
+    Return the canonical keys for any study reference.
+
+    'doi:<doi>' for DOIs and DOI URLs, 'file:<name>' for PDF filenames and
+    local document paths, 'url:<host/path>' for other URLs and 'id:<slug>'
+    for other single-token ids ("who-hepatotoxicity-2007"). Values with
+    spaces that are none of these (title fragments, citations) get no keys.
+    """
+    value = (value or '').strip()
+    if not value:
+        return []
+    keys = []
+
+    doi = canonical_doi(value)
+    if doi:
+        keys.append(f"doi:{doi}")
+
+    path = urlsplit(value).path if '://' in value else value
+    if path.lower().endswith('.pdf'):
+        keys.append(f"file:{normalize_filename(path.rsplit('/', 1)[-1])}")
+    elif '://' in value and not doi:
+        parts = urlsplit(value)
+        keys.append(f"url:{parts.netloc.lower()}{parts.path.rstrip('/')}")
+    elif not doi and not any(c.isspace() for c in value):
+        keys.append(f"id:{value.lower()}")
+
+    return keys
+
+
+def study_keys(study):
+    """Return every canonical key a study can be found under (id, url, filename-like title)"""
+    keys = []
+    for field in ('id', 'url', 'title'):
+        for key in canonical_keys(study.get(field, '')):
+            # A title only counts when it is a filename
+            if key not in keys and (field != 'title' or key.startswith('file:')):
+                keys.append(key)
+    return keys
+
+
+def primary_key(study):
+    """Stable key of a study: its first canonical key, or its id/title as given"""
+    keys = study_keys(study)
+    return keys[0] if keys else (study.get('id') or study.get('title', ''))
+
+
+class KeyIndex:
+    """
+    Maps study references in any supported form to a record.
+
+    References without a canonical form (title fragments) are kept as
+    fragments and matched by substring against a study's id and url, the way
+    the fix scripts matched them before; there are only a handful of those.
+    """
+
+    def __init__(self):
+        self.by_key = {}
+        self.fragments = []
+
+    def add(self, reference, record):
+        """Index a record under a reference (DOI, URL, path, filename or fragment)"""
+        keys = canonical_keys(reference)
+        if not keys:
+            self.fragments.append((reference, record))
+        for key in keys:
+            self.by_key.setdefault(key, record)
+
+    def add_study(self, study):
+        """Index a study under all of its own keys"""
+        for key in study_keys(study):
+            self.by_key.setdefault(key, study)
+
+    def lookup(self, reference):
+        """Return the record for a reference, or None"""
+        for key in canonical_keys(reference):
+            if key in self.by_key:
+                return self.by_key[key]
+        return None
+
+    def lookup_study(self, study):
+        """Return the record matching any form of a study's id or url, or None"""
+        for key in study_keys(study):
+            if key in self.by_key:
+                return self.by_key[key]
+        study_id = study.get('id', '')
+        study_url = study.get('url', '')
+        for fragment, record in self.fragments:
+            if fragment in study_id or fragment in study_url:
+                return record
+        return None
+
+    def __contains__(self, reference):
+        return self.lookup(reference) is not None
+
+
+def index_studies(studies):
+    """Build a KeyIndex over a list of studies"""
+    index = KeyIndex()
+    for study in studies:
+        index.add_study(study)
+    return index
@@ -0,0 +1,257 @@
+"""
+One-pass patch engine for studies.json corrections.
+
+A patch set is a declarative file: a .json object or a Python module (the
+fix_studies_*.py / translate_*study*.py scripts) with any of these names:
+
+    FIXES            {reference: {field: value}} - reference is an id, DOI,
+                     URL, PDF filename or a title/citation fragment
+    TITLE_FIXES      {title: {field: value}} - matched against study titles
+    TITLE_MATCH      how TITLE_FIXES match: "contains" (normalized substring,
+                     the default) or "fuzzy" (trigram similarity)
+    REMOVE_LIST      [reference] - studies to delete, matched on id or on the
+                     whole title (normalized)
+    DUPLICATE_TITLE_MARKERS
+                     [text] - a study whose title repeats an earlier one and
+                     contains one of these is deleted
+
+Keys starting with "_" are notes for reviewers and are ignored.
+
+`compile_patch_sets` turns the patch sets into indexes (study_index.KeyIndex
+for references, fuzzy_match.TrigramIndex for fuzzy titles), and
+`apply_patches` walks the studies once, applying every patch set in order to
+each study. Two patch sets setting the same field of the same study to
+different values is a conflict: the later one wins and the conflict is
+reported, and so is a fuzzy TITLE_FIXES key that matched more than one
+study. The file is loaded once and written once, atomically.
+
+Usage:
+    python study_patches.py [--dry-run] [--strict] [patch files...]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+
+from fuzzy_match import TrigramIndex, normalize
+from study_index import KeyIndex
+
+STUDIES_JSON = "/home/ubuntu/kava-wiki/client/src/data/studies.json"
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# The historical fix scripts, in the order they used to be run one by one
+DEFAULT_PATCH_FILES = [
+    os.path.join(SCRIPTS_DIR, 'fix_studies_final.py'),
+    os.path.join(SCRIPTS_DIR, 'fix_studies_explicitly.py'),
+    os.path.join(SCRIPTS_DIR, 'fix_studies_translation.py'),
+    os.path.join(SCRIPTS_DIR, 'fix_studies_translation_2.py'),
+    os.path.join(SCRIPTS_DIR, '..', 'translate_single_study.py'),
+    os.path.join(SCRIPTS_DIR, '..', 'translate_specific_studies.py'),
+]
+
+PATCH_FIELDS = ('FIXES', 'TITLE_FIXES', 'TITLE_MATCH', 'REMOVE_LIST', 'DUPLICATE_TITLE_MARKERS')
+LOCAL_DOCUMENTS = '/documents/studies/'
+
+
+def load_patch_file(path):
+    """Load a patch set from a .json file or a Python module, as a dict with a 'name'"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = {k: v for k, v in json.load(f).items() if not k.startswith('_')}
+    else:
+        spec = importlib.util.spec_from_file_location(f"_patch_{name}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        data = {field: getattr(module, field) for field in PATCH_FIELDS if hasattr(module, field)}
+    unknown = set(data) - set(PATCH_FIELDS)
+    if unknown:
+        raise ValueError(f"{path}: unknown patch fields {sorted(unknown)}")
+    return {'name': name, **data}
+
+
+class CompiledPatch:
+    """A patch set with its references and titles indexed for lookups"""
+
+    def __init__(self, patch_set):
+        self.name = patch_set['name']
+        self.fix_references = list(patch_set.get('FIXES', {}))
+        self.fixes = KeyIndex()
+        for reference, fields in patch_set.get('FIXES', {}).items():
+            self.fixes.add(reference, (reference, fields))
+        self.removals = KeyIndex()
+        for reference in patch_set.get('REMOVE_LIST', []):
+            self.removals.add(reference, reference)
+        # KeyIndex only knows ids, DOIs, URLs and filenames; titles are compared whole
+        self.removal_titles = {normalize(reference) for reference in patch_set.get('REMOVE_LIST', [])} - {''}
+        self.title_match = patch_set.get('TITLE_MATCH', 'contains')
+        if self.title_match not in ('contains', 'fuzzy'):
+            raise ValueError(f"{self.name}: TITLE_MATCH must be 'contains' or 'fuzzy'")
+        title_fixes = patch_set.get('TITLE_FIXES', {})
+        if self.title_match == 'fuzzy':
+            self.titles = TrigramIndex()
+            for title, fields in title_fixes.items():
+                self.titles.add(title, (title, fields))
+        else:
+            self.titles = [(normalize(title), (title, fields)) for title, fields in title_fixes.items()]
+        self.duplicate_markers = [m.lower() for m in patch_set.get('DUPLICATE_TITLE_MARKERS', [])]
+        self.used = set()
+        self.ambiguous = {}
+        self.claims = {}  # fuzzy title key -> study titles it matched
+
+    def references(self):
+        """All FIXES and TITLE_FIXES keys, to report the ones that matched nothing"""
+        refs = set(self.fix_references)
+        if isinstance(self.titles, TrigramIndex):
+            refs.update(self.titles.keys)
+        else:
+            refs.update(title for _, (title, _) in self.titles)
+        return refs
+
+    def removes(self, study, seen_titles):
+        if study.get('id') in self.removals or normalize(study.get('title', '')) in self.removal_titles:
+            return True
+        title = study.get('title', '').strip().lower()
+        return title in seen_titles and any(m in title for m in self.duplicate_markers)
+
+    def field_patches(self, study):
+        """Yield (reference, fields) of every patch in this set that applies to the study"""
+        match = self.fixes.lookup_study(study)
+        if match:
+            yield match
+        title = study.get('title', '')
+        if isinstance(self.titles, TrigramIndex):
+            result = self.titles.match(title)
+            if result:
+                self.claims.setdefault(result.key, []).append(title)
+                yield result.value
+            elif result.status == 'ambiguous':
+                self.ambiguous[title] = result.candidates
+        else:
+            normalized = normalize(title)
+            for fragment, patch in self.titles:
+                if fragment and fragment in normalized:
+                    yield patch
+
+
+def compile_patch_sets(patch_sets):
+    return [CompiledPatch(patch_set) for patch_set in patch_sets]
+
+
+def patch_value(study, field, value):
+    """The value a patch actually sets; external URLs never replace an existing link"""
+    if field == 'url' and LOCAL_DOCUMENTS not in value and study.get('url'):
+        return study['url']
+    return value
+
+
+def apply_patches(studies, plan):
+    """
+    Apply compiled patch sets to the studies in one pass.
+
+    Returns (patched studies, report). The report lists removed studies,
+    changed fields, conflicts between patch sets and patches that matched
+    nothing.
+    """
+    report = {'removed': [], 'changed': 0, 'conflicts': [], 'unused': {}, 'ambiguous': {}, 'shared': {}}
+    patched = []
+    seen_titles = set()
+
+    for study in studies:
+        if any(patch.removes(study, seen_titles) for patch in plan):
+            report['removed'].append(study.get('title') or study.get('id'))
+            continue
+
+        written = {}  # field -> (patch name, value)
+        for patch in plan:
+            for reference, fields in patch.field_patches(study):
+                patch.used.add(reference)
+                for field, value in fields.items():
+                    value = patch_value(study, field, value)
+                    if field in written and written[field][1] != value:
+                        report['conflicts'].append({
+                            'study': study.get('id') or study.get('title'),
+                            'field': field,
+                            'patches': [written[field][0], patch.name],
+                        })
+                    if study.get(field) != value:
+                        study[field] = value
+                        report['changed'] += 1
+                    written[field] = (patch.name, value)
+
+        patched.append(study)
+        seen_titles.add(study.get('title', '').strip().lower())
+
+    for patch in plan:
+        unused = sorted(patch.references() - patch.used)
+        if unused:
+            report['unused'][patch.name] = unused
+        if patch.ambiguous:
+            report['ambiguous'][patch.name] = patch.ambiguous
+        shared = {key: titles for key, titles in patch.claims.items() if len(titles) > 1}
+        if shared:
+            report['shared'][patch.name] = shared
+    return patched, report
+
+
+def write_json_atomic(path, data):
+    """Write JSON through a fsync'd temporary file and a rename, so readers see the old or the new file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def print_report(report):
+    for title in report['removed']:
+        print(f"Removed: {title}")
+    for conflict in report['conflicts']:
+        print(f"Conflict: {conflict['study']} field '{conflict['field']}' "
+              f"set by {' and '.join(conflict['patches'])} (last one wins)")
+    for name, titles in report['ambiguous'].items():
+        for title, candidates in titles.items():
+            print(f"Ambiguous in {name}, not applied: {title}")
+            for key, score in candidates:
+                print(f"    {score:.2f} {key}")
+    for name, keys in report['shared'].items():
+        for key, titles in keys.items():
+            print(f"Warning in {name}: '{key}' matched {len(titles)} studies: {titles}")
+    for name, references in report['unused'].items():
+        for reference in references:
+            print(f"Unused patch in {name}: {reference}")
+    print(f"Removed {len(report['removed'])} studies, changed {report['changed']} fields, "
+          f"{len(report['conflicts'])} conflicts")
+
+
+def run(patch_files, json_path=STUDIES_JSON, dry_run=False, strict=False):
+    """Load studies.json once, apply all patch files and write it back once"""
+    plan = compile_patch_sets(load_patch_file(path) for path in patch_files)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        studies = json.load(f)
+    patched, report = apply_patches(studies, plan)
+    print_report(report)
+    if strict and report['conflicts']:
+        print("Conflicts found, studies.json not written (--strict)")
+        return 1
+    if not dry_run:
+        write_json_atomic(json_path, patched)
+        print(f"Successfully processed studies.json. Total entries: {len(patched)}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply declarative patch sets to studies.json in one pass")
+    parser.add_argument('patch_files', nargs='*', default=DEFAULT_PATCH_FILES)
+    parser.add_argument('--json', default=STUDIES_JSON, help="path to studies.json")
+    parser.add_argument('--dry-run', action='store_true', help="report only, do not write")
+    parser.add_argument('--strict', action='store_true', help="do not write if patch sets conflict")
+    args = parser.parse_args()
+    sys.exit(run(args.patch_files, args.json, args.dry_run, args.strict))
+
+
+if __name__ == "__main__":
+    main()
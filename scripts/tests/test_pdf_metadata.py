@@ -0,0 +1,28 @@
+import pdf_metadata
+from pdf_metadata import decode_pdf_string, read_pdf_metadata
+
+
+def write_pdf(tmp_path, data):
+    path = tmp_path / "study.pdf"
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_odd_length_hex_string_pads_last_digit():
+    assert decode_pdf_string(b"<4B617>") == "Kap"
+
+
+def test_title_comes_from_info_object_not_outline(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_metadata, 'pypdf', None)
+    path = write_pdf(tmp_path, b"%PDF-1.4\n"
+                     b"5 0 obj <</Title (Chapter 1 Introduction) /Parent 4 0 R>> endobj\n"
+                     b"12 0 obj <</Title (Kava and the liver) /Author (A. Author)>> endobj\n"
+                     b"trailer <</Root 1 0 R /Info 12 0 R>>\n%%EOF")
+    assert read_pdf_metadata(path) == {'title': "Kava and the liver", 'author': "A. Author"}
+
+
+def test_several_titles_without_info_reference_are_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_metadata, 'pypdf', None)
+    path = write_pdf(tmp_path, b"%PDF-1.4\n5 0 obj <</Title (Chapter 1)>> endobj\n"
+                     b"6 0 obj <</Title (Chapter 2)>> endobj\n")
+    assert read_pdf_metadata(path) == {}
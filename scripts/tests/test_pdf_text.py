@@ -0,0 +1,22 @@
+import time
+from types import SimpleNamespace
+
+import pdf_text
+from pdf_text import extract_uncached
+
+
+def test_pypdf_timeout_survives_generic_exception_handlers(monkeypatch):
+    def reader(path):
+        # Like pypdf's page parsing: carry on after any Exception
+        deadline = time.monotonic() + 3
+        while time.monotonic() < deadline:
+            try:
+                time.sleep(0.01)
+            except Exception:
+                pass
+        raise RuntimeError("the timeout did not interrupt the reader")
+
+    monkeypatch.setattr(pdf_text, 'pypdf', SimpleNamespace(PdfReader=reader, __version__='test'))
+    started = time.monotonic()
+    assert extract_uncached('hanging.pdf', timeout=0.2, backend_name='pypdf') == ("", False)
+    assert time.monotonic() - started < 2
@@ -0,0 +1,52 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from process_studies import clean_column, header_labels, stream_excel, transform_frame
+
+
+def test_clean_column_blanks_missing_values():
+    series = pd.Series([" Kava ", np.nan, None, 12], dtype=object)
+    assert clean_column(series).tolist() == ["Kava", "", "", "12"]
+
+
+def test_clean_column_blanks_missing_dates():
+    series = pd.Series(pd.to_datetime(["2016-05-01", None]))
+    assert clean_column(series).tolist() == ["2016-05-01 00:00:00", ""]
+
+
+def test_year_from_datetime_column_with_gaps():
+    df = pd.DataFrame({
+        'DOI': ["10.1000/a", "10.1000/b"],
+        'Title': ["A", "B"],
+        'Publication date': pd.to_datetime(["2016-05-01", None]),
+    })
+    studies = transform_frame(df)
+    assert [s['year'] for s in studies] == ["2016", ""]
+    json.dumps(studies, allow_nan=False)
+
+
+def test_header_labels_match_read_excel():
+    assert header_labels(["DOI", None, "Title", None, "DOI", ""]) == \
+        ["DOI", "Unnamed: 1", "Title", "Unnamed: 3", "DOI.1", "Unnamed: 5"]
+
+
+def test_transform_frame_tolerates_duplicate_labels():
+    df = pd.DataFrame([["10.1000/a", "x", "y", "A"]], columns=["DOI", None, None, "Title"])
+    assert transform_frame(df)[0]['title'] == "A"
+
+
+def test_stream_excel_with_empty_header_cells(tmp_path):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["DOI", None, "Title", None, "Publication date"])
+    sheet.append(["10.1000/a", 1, "A", 2, "2019-03-04"])
+    sheet.append(["10.1000/b", 3, "B", 4, None])
+    path = tmp_path / "export.xlsx"
+    workbook.save(path)
+
+    studies = list(stream_excel(str(path)))
+    assert [(s['id'], s['title'], s['year']) for s in studies] == [("10.1000/a", "A", "2019"), ("10.1000/b", "B", "")]
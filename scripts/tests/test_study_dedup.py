@@ -0,0 +1,42 @@
+from study_dedup import find_duplicates, plan_patch
+
+ABSTRACT = ("Kava extracts were given to forty patients with generalized anxiety disorder for eight weeks "
+            "and compared with placebo on the Hamilton anxiety scale, with no signs of liver injury.")
+
+STUDIES = [
+    {'id': 'who-hepatotoxicity-2007', 'title': "Assessment of the Risk of Hepatotoxicity with Kava Products",
+     'authors': "World Health Organization", 'summary': ABSTRACT, 'url': ""},
+    {'id': 'Assessmentoftheriskofhepatotoxicitywithkavaproducts.pdf',
+     'title': "Assessmentoftheriskofhepatotoxicitywithkavaproducts", 'authors': "",
+     'summary': "Zusammenfassung wird generiert...",
+     'url': "/documents/studies/Assessmentoftheriskofhepatotoxicitywithkavaproducts.pdf"},
+    {'id': '10.1080/10590500801907407', 'title': "Toxicity of Kava Kava", 'authors': "Ming W. Fu, Peter Xia",
+     'summary': "", 'url': "https://doi.org/10.1080/10590500801907407"},
+    {'id': 'ToxicityofKavaKava.pdf', 'title': "Toxicity of Kava Kava", 'authors': "Jane Doe",
+     'summary': "", 'url': "/documents/studies/ToxicityofKavaKava.pdf"},
+    {'id': '10.1000/unrelated', 'title': "Kavalactone pharmacokinetics in healthy volunteers",
+     'authors': "A. Author", 'summary': "", 'url': "https://doi.org/10.1000/unrelated"},
+]
+
+
+def clusters_by_keeper():
+    return {cluster['keep']: cluster for cluster in find_duplicates(STUDIES)}
+
+
+def test_clusters_near_duplicate_titles_only():
+    clusters = clusters_by_keeper()
+    assert set(clusters) == {'who-hepatotoxicity-2007', '10.1080/10590500801907407'}
+    assert clusters['who-hepatotoxicity-2007']['remove'] == ['Assessmentoftheriskofhepatotoxicitywithkavaproducts.pdf']
+
+
+def test_keeper_takes_over_local_pdf_link():
+    merge = clusters_by_keeper()['who-hepatotoxicity-2007']['merge']
+    assert merge == {'url': "/documents/studies/Assessmentoftheriskofhepatotoxicitywithkavaproducts.pdf"}
+
+
+def test_clusters_with_different_authors_are_not_applied():
+    plan = find_duplicates(STUDIES)
+    patch = plan_patch(plan)
+    assert clusters_by_keeper()['10.1080/10590500801907407']['review']
+    assert patch['REMOVE_LIST'] == ['Assessmentoftheriskofhepatotoxicitywithkavaproducts.pdf']
+    assert list(patch['FIXES']) == ['who-hepatotoxicity-2007']
@@ -0,0 +1,32 @@
+import os
+import unicodedata
+
+from study_patches import SCRIPTS_DIR, apply_patches, compile_patch_sets, load_patch_file
+
+STUDIES = [
+    {'id': 'a', 'title': "Toxicity of Kava Kava"},
+    {'id': 'x.pdf', 'title': "X"},
+    {'id': 'b', 'title': "Kava and anxiety"},
+    {'id': 'c', 'title': "Kava and Anxiety."},
+    {'id': 'd', 'title': "Other"},
+]
+
+
+def test_remove_list_matches_whole_titles_and_ids():
+    plan = compile_patch_sets([{'name': 'removals', 'REMOVE_LIST': ["Toxicity of  Kava Kava", "x.pdf", "Kava"]}])
+    patched, report = apply_patches([dict(s) for s in STUDIES], plan)
+    assert [s['id'] for s in patched] == ['b', 'c', 'd']
+    assert report['removed'] == ["Toxicity of Kava Kava", "X"]
+
+
+def test_fuzzy_title_key_matching_several_studies_is_reported():
+    plan = compile_patch_sets([{'name': 'summaries', 'TITLE_MATCH': 'fuzzy',
+                                'TITLE_FIXES': {"Kava and anxiety": {'summary': "s"}}}])
+    _, report = apply_patches([dict(s) for s in STUDIES], plan)
+    assert report['shared'] == {'summaries': {"Kava and anxiety": ["Kava and anxiety", "Kava and Anxiety."]}}
+
+
+def test_decomposed_document_url_is_kept():
+    fixes = load_patch_file(os.path.join(SCRIPTS_DIR, 'fix_studies_final.py'))['FIXES']
+    urls = [fields['url'] for key, fields in fixes.items() if 'ffentlichesGutachten' in key]
+    assert urls and all(unicodedata.is_normalized('NFD', url) for url in urls)
@@ -0,0 +1,48 @@
+from translation_journal import Journal
+
+
+def journal_lines(path):
+    return path.read_text(encoding='utf-8').splitlines()
+
+
+def test_replay_resumes_recorded_units(tmp_path):
+    path = tmp_path / "run.jsonl"
+    journal = Journal(str(path))
+    journal.record('es', {'a': "Hallo", 'b': "Welt"}, {'a': "Hola", 'b': "Mundo"})
+    journal.close()
+
+    journal = Journal(str(path))
+    assert journal.lookup('es', {'a': "Hallo", 'b': "Welt (neu)"}) == {'a': "Hola"}
+    journal.close()
+
+
+def test_torn_last_line_is_cut_off(tmp_path):
+    path = tmp_path / "run.jsonl"
+    journal = Journal(str(path))
+    journal.record('es', {'a': "Hallo"}, {'a': "Hola"})
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"lang": "fr", "items": {"a": ["x", "Bon')
+
+    journal = Journal(str(path))
+    assert len(journal) == 1
+    journal.record('fr', {'a': "Hallo"}, {'a': "Bonjour"})
+    journal.close()
+    assert len(journal_lines(path)) == 2
+    assert len(Journal(str(path))) == 2
+
+
+def test_parseable_last_line_without_newline_is_torn(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_text('{"lang": "es", "items": {"a": ["0", "Hola"]}}\n'
+                    '{"lang": "fr", "items": {"a": ["0", "Salut"]}}', encoding='utf-8')
+
+    journal = Journal(str(path))
+    assert set(journal.entries) == {('es', 'a')}
+    journal.record('fr', {'a': "Hallo"}, {'a': "Bonjour"})
+    journal.close()
+
+    replayed = Journal(str(path))
+    assert set(replayed.entries) == {('es', 'a'), ('fr', 'a')}
+    assert len(journal_lines(path)) == 2
+    replayed.close()
@@ -0,0 +1,63 @@
+import asyncio
+import email.utils
+import time
+from types import SimpleNamespace
+
+from translation_scheduler import Job, RateLimiter, Scheduler, retry_after_seconds
+
+
+def api_error(**headers):
+    return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+
+def test_retry_after_seconds_and_milliseconds():
+    assert retry_after_seconds(api_error(**{'retry-after': '7'})) == 7.0
+    assert retry_after_seconds(api_error(**{'retry-after-ms': '1500', 'retry-after': '7'})) == 1.5
+
+
+def test_retry_after_http_date():
+    value = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= retry_after_seconds(api_error(**{'retry-after': value})) <= 30
+
+
+def test_retry_after_garbage_falls_back_to_backoff():
+    assert retry_after_seconds(api_error(**{'retry-after': 'soon'})) is None
+    assert retry_after_seconds(api_error()) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+
+
+class FakeCompletions:
+    def __init__(self, replies):
+        self.replies = replies
+
+    async def create(self, messages, **kwargs):
+        reply = self.replies[messages[0]['content']]
+        if reply is None:
+            return SimpleNamespace(choices=[], usage=None)
+        content, finish_reason = reply
+        message = SimpleNamespace(content=content, refusal=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)],
+                               usage=SimpleNamespace(total_tokens=10, prompt_tokens=5, completion_tokens=5))
+
+
+def run_jobs(replies):
+    client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(replies)))
+    scheduler = Scheduler(client=client, limiter=RateLimiter(60_000, 10_000_000))
+    jobs = [Job(key, [{'role': 'user', 'content': key}]) for key in replies]
+    return asyncio.run(scheduler.run(jobs)), scheduler
+
+
+def test_reply_without_content_fails_only_its_job():
+    jobs, scheduler = run_jobs({'filtered': (None, 'content_filter'), 'fine': ('{"a": "b"}', 'stop')})
+    filtered, fine = jobs
+    assert not filtered.ok and filtered.attempts == 1 and 'content_filter' in filtered.error
+    assert fine.ok and fine.result == {'a': 'b'}
+    assert scheduler.stats.failed == 1
+
+
+def test_reply_without_choices_fails_only_its_job():
+    jobs, scheduler = run_jobs({'empty': None, 'fine': ('{"a": "b"}', 'stop')})
+    empty, fine = jobs
+    assert not empty.ok and empty.attempts == 1 and 'no choices' in empty.error
+    assert fine.ok
+    assert scheduler.stats.failed == 1
@@ -0,0 +1,250 @@
+"""
+Token-budget packing of translation requests.
+
+Strings to translate come in as one flat {request key: text} object per
+target language, keys like "kultur/page.title" (namespace, then the key
+path). The keys form a tree; every subtree whose estimated reply fits the
+budget stays together as one unit, larger subtrees are split into their
+children down to single strings. Units are then packed first-fit decreasing
+into batches close to the budget, across namespaces, so small sections share
+a request and no request is planned past the output limit.
+
+Token counts are estimated offline: with tiktoken when it is installed,
+otherwise from the character count. Replies are longer than the German input
+for some scripts (Georgian, Greek, Cyrillic), so the estimate is per target
+language. A batch whose reply is cut off anyway (finish_reason "length") is
+split in half and sent again instead of falling back to the source text.
+
+With several languages per request the German text is sent once for a group
+of target languages and the reply holds one object per language code. Every
+language of a reply is checked on its own; only the languages (and keys)
+that are missing or invalid are sent again, in a smaller request.
+"""
+
+import re
+
+from translation_scheduler import Job, CHARS_PER_TOKEN
+from translation_validation import check_reply, salvage_reply, summarize
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # not installed, or the encoding cannot be downloaded
+    tiktoken = None
+    _ENCODING = None
+
+# Planned reply size; far enough below the model's output limit that a
+# wrong estimate does not truncate
+DEFAULT_BUDGET = 6000
+MAX_OUTPUT_TOKENS = 16384
+# Reply tokens per source token (keys included), by target language
+OUTPUT_RATIO = {
+    'ka': 3.0,
+    'el': 2.0,
+    'bg': 1.6,
+    'ru': 1.6,
+    'ja': 1.3,
+    'zh': 1.1,
+}
+DEFAULT_OUTPUT_RATIO = 1.2
+# Quotes, colon, comma and indentation around every key/value pair
+PAIR_OVERHEAD = 6
+KEY_SEPARATOR = re.compile(r'[/.]')
+
+
+def count_tokens(text):
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def reply_tokens(key, text, lang):
+    """Estimated tokens of one "key": "translation" pair in the reply"""
+    return count_tokens(key) + int(count_tokens(text) * OUTPUT_RATIO.get(lang, DEFAULT_OUTPUT_RATIO)) + PAIR_OVERHEAD
+
+
+def language_groups(langs, per_request=1):
+    """
+    Group target languages for multi-language requests.
+
+    Languages with similar reply sizes go together, so a group of Latin
+    script languages is not held back by Georgian.
+    """
+    ordered = sorted(langs, key=lambda lang: OUTPUT_RATIO.get(lang, DEFAULT_OUTPUT_RATIO))
+    return [tuple(ordered[i:i + per_request]) for i in range(0, len(ordered), per_request)]
+
+
+def describe_targets(langs, names):
+    """Target language phrase for a prompt: "French" or "each of these languages: es (Spanish), ..." """
+    if len(langs) == 1:
+        return names[langs[0]]
+    return "each of these languages: " + ', '.join(f"{lang} ({names[lang]})" for lang in langs)
+
+
+def reply_format(langs):
+    """Prompt rule describing the reply for one or several languages"""
+    if len(langs) == 1:
+        return "Return ONLY valid JSON, no markdown or explanations"
+    codes = ', '.join(f'"{lang}"' for lang in langs)
+    return (f"Return ONLY valid JSON, no markdown or explanations: one object with the keys {codes}, "
+            f"each holding the complete translated JSON in that language")
+
+
+class Batch:
+    """Strings for one request: {request key: text} into one or more target languages"""
+
+    def __init__(self, langs, items=None, attempt=1):
+        self.langs = (langs,) if isinstance(langs, str) else tuple(langs)
+        self.items = {}
+        self.tokens = 0
+        self.attempt = attempt
+        self.add(items or {})
+
+    def add(self, items, tokens=None):
+        self.items.update(items)
+        self.tokens += tokens if tokens is not None else sum(
+            reply_tokens(key, text, lang) for key, text in items.items() for lang in self.langs)
+
+    @property
+    def max_tokens(self):
+        """Output limit for the request: twice the estimate, within the model's limit"""
+        return min(MAX_OUTPUT_TOKENS, 2 * self.tokens + 256)
+
+    def split(self):
+        """Two halves of the batch: by keys, or by languages for a single string"""
+        if len(self.items) == 1:
+            middle = len(self.langs) // 2
+            return [Batch(part, self.items, self.attempt) for part in (self.langs[:middle], self.langs[middle:])]
+        keys = list(self.items)
+        middle = len(keys) // 2
+        return [Batch(self.langs, {key: self.items[key] for key in part}, self.attempt)
+                for part in (keys[:middle], keys[middle:])]
+
+    def replies(self, result):
+        """Split a parsed reply into {lang: {key: text}} (None for a language that is missing)"""
+        if len(self.langs) == 1:
+            return {self.langs[0]: result if isinstance(result, dict) else None}
+        if not isinstance(result, dict):
+            return {lang: None for lang in self.langs}
+        return {lang: result[lang] if isinstance(result.get(lang), dict) else None for lang in self.langs}
+
+
+def subtree_units(items, langs, budget, depth=0):
+    """
+    Split {key: text} into units of (items, tokens) that fit the budget.
+
+    Keys sharing their first `depth` + 1 segments are kept together while
+    they fit; a single string over the budget is a unit of its own.
+    """
+    tokens = sum(reply_tokens(key, text, lang) for key, text in items.items() for lang in langs)
+    if tokens <= budget or len(items) == 1:
+        return [(items, tokens)]
+    groups = {}
+    for key, text in items.items():
+        segments = KEY_SEPARATOR.split(key)
+        prefix = tuple(segments[:depth + 1]) if depth + 1 < len(segments) else tuple(segments)
+        groups.setdefault(prefix, {})[key] = text
+    if len(groups) == 1:
+        # One deeper segment did not split anything; go further down
+        return subtree_units(items, langs, budget, depth + 1)
+    units = []
+    for group in groups.values():
+        units.extend(subtree_units(group, langs, budget, depth + 1))
+    return units
+
+
+def plan_batches(items, langs, budget=DEFAULT_BUDGET):
+    """Pack {request key: text} for one language or a group of languages into batches near the budget"""
+    langs = (langs,) if isinstance(langs, str) else tuple(langs)
+    batches = []
+    units = sorted(subtree_units(items, langs, budget), key=lambda unit: -unit[1])
+    for unit_items, tokens in units:
+        for batch in batches:
+            if batch.tokens + tokens <= budget:
+                batch.add(unit_items, tokens)
+                break
+        else:
+            batch = Batch(langs)
+            batch.add(unit_items, tokens)
+            batches.append(batch)
+    return batches
+
+
+def plan_groups(needs, groups, budget=DEFAULT_BUDGET):
+    """
+    Plan batches for language groups from {lang: {key: text}} still needed.
+
+    Within a group, keys are batched with exactly the languages that need
+    them, so a string one language already has is not requested for it again.
+    """
+    batches = []
+    for group in groups:
+        by_langs = {}
+        for lang in group:
+            for key, text in needs.get(lang, {}).items():
+                by_langs.setdefault(key, [text, []])[1].append(lang)
+        subsets = {}
+        for key, (text, langs) in by_langs.items():
+            subsets.setdefault(tuple(langs), {})[key] = text
+        for langs, items in subsets.items():
+            batches.extend(plan_batches(items, langs, budget))
+    return batches
+
+
+def print_plan(batches):
+    sizes = [batch.tokens for batch in batches]
+    if sizes:
+        print(f"{len(batches)} requests, {sum(len(b.items) * len(b.langs) for b in batches)} strings, "
+              f"~{sum(sizes)} reply tokens (fullest {max(sizes)}, emptiest {min(sizes)})")
+
+
+async def run_batches(scheduler, batches, make_messages, on_done, max_requeue=2):
+    """
+    Send all batches through the scheduler.
+
+    on_done(lang, items, reply, error) is called as strings come back:
+    `items` are the {key: text} of one language that are finished, `reply`
+    the translations of those that succeeded and `error` why the others
+    failed (None if none did). Every key is reported exactly once per
+    language of its batch.
+
+    Truncated replies are split and sent again until the halves fit. Every
+    language of a reply is checked against the source (translation_validation)
+    and a reply that is not valid JSON is salvaged; languages or keys that are
+    missing or invalid are sent again on their own, up to `max_requeue` times.
+    """
+    pending = list(batches)
+    while pending:
+        jobs = [Job(i, make_messages(batch), max_tokens=batch.max_tokens,
+                    salvage=lambda text, langs=batch.langs: salvage_reply(text, langs))
+                for i, batch in enumerate(pending)]
+        retry = []
+
+        def done(job, pending=pending, retry=retry):
+            batch = pending[job.key]
+            if job.truncated and (len(batch.items) > 1 or len(batch.langs) > 1):
+                print(f"  Reply for {len(batch.items)} strings x {len(batch.langs)} languages was cut off, splitting")
+                retry.extend(batch.split())
+                return
+            if not job.ok:
+                for lang in batch.langs:
+                    on_done(lang, batch.items, {}, job.error)
+                return
+            # Languages that failed the same keys are asked again together
+            failed = {}
+            for lang, reply in batch.replies(job.result).items():
+                good, problems = check_reply(batch.items, reply)
+                if problems and batch.attempt <= max_requeue:
+                    failed.setdefault(tuple(problems), ([], problems))[0].append(lang)
+                    on_done(lang, {key: batch.items[key] for key in good}, good, None)
+                else:
+                    error = f"{summarize(problems)} after {batch.attempt} attempts" if problems else None
+                    on_done(lang, batch.items, good, error)
+            for keys, (langs, problems) in failed.items():
+                salvaged = " from a malformed reply" if job.salvaged else ""
+                print(f"  {', '.join(langs)}: {len(batch.items) - len(keys)} strings kept{salvaged}, "
+                      f"asking again for {len(keys)} ({summarize(problems)})")
+                retry.append(Batch(langs, {key: batch.items[key] for key in keys}, batch.attempt + 1))
+
+        await scheduler.run(jobs, done)
+        pending = retry
@@ -0,0 +1,175 @@
+"""
+Benchmark of the translation pipeline: per-language versus multi-language requests.
+
+Translates namespaces of locales/de (--namespace all for the whole site)
+into every target language once per mode (--modes 1 4 means one language
+per request, then four) and compares requests, requests/s, prompt and
+completion tokens as reported by the API and wall-clock time. Nothing is
+written to the locales: every mode starts from an empty translation memory
+in a temporary directory and the results are thrown away.
+
+--mock runs the same pipeline against the local mock server
+(mock_llm_server.py) in-process, once per named fault profile, and also
+checks correctness: the mock marks every string with its language, so each
+key that came back must be exactly "[<lang>] <German text>". Point
+--base-url at any other OpenAI-compatible endpoint instead; against the real
+API a run costs roughly one full translation of the namespaces per mode.
+
+Usage:
+    python translation_benchmark.py [--namespace kultur ...] [--modes 1 4] [--lang xx ...]
+        [--mock clean flaky limited | --base-url URL]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from locale_diff import LANGUAGES, LOCALES_DIR, api_key_from_env, build_units, namespaces, plan_units, translate_units
+from mock_llm_server import MockServer, Profile, mark
+from translation_batches import DEFAULT_BUDGET, print_plan
+from translation_memory import TranslationMemory, is_translatable
+from translation_scheduler import (
+    RateLimiter, Scheduler,
+    DEFAULT_CONCURRENCY, DEFAULT_MODEL, DEFAULT_REQUESTS_PER_MIN, DEFAULT_TOKENS_PER_MIN,
+)
+
+# Fault profiles for --mock; latencies in seconds before the first token. 'clean'
+# and 'flaky' generate fast to measure the pipeline, 'slow' is near a real model
+MOCK_PROFILES = {
+    'clean': dict(latency=0.2, tokens_per_sec=2000),
+    'flaky': dict(latency=0.2, tokens_per_sec=2000, rate_429=0.05, rate_500=0.02, rate_truncate=0.03,
+                  rate_fence=0.1, rate_malformed=0.03),
+    'limited': dict(latency=0.2, tokens_per_sec=2000, rpm=120),
+    'slow': dict(latency=1.0, tokens_per_sec=100),
+}
+
+
+def check_unit(unit):
+    """(correct, wrong) keys of a finished unit against the mock's marked translation"""
+    # Strings without letters are copied, never sent
+    correct = sum(1 for key, text in unit.request.items()
+                  if unit.updates.get(key) == (mark(text, unit.lang) if is_translatable(text) else text))
+    wrong = sum(1 for key in unit.request if key in unit.updates) - correct
+    return correct, wrong
+
+
+async def run_mode(args, names, languages, per_request, api_key, base_url, label):
+    """Translate the namespaces once with `per_request` languages per request and return the measurements"""
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = TranslationMemory(os.path.join(tmp, 'tm.sqlite'))
+        # Empty snapshots: every string of the namespaces counts as added
+        snapshots = {name: {lang: {} for lang in languages} for name in names}
+        units = build_units(args.locales, names, languages, snapshots, memory, DEFAULT_MODEL)
+        batches = plan_units(units, args.budget, per_request)
+        print(f"\n{label}, {per_request} language(s) per request:")
+        print_plan(batches)
+
+        scheduler = Scheduler(
+            limiter=RateLimiter(args.rpm, args.tpm),
+            concurrency=args.concurrency,
+            base_url=base_url,
+            api_key=api_key,
+        )
+        failed = []
+        checked = {'correct': 0, 'wrong': 0}
+
+        def save(unit, failed_keys):
+            failed.extend(failed_keys)
+            correct, wrong = check_unit(unit)
+            checked['correct'] += correct
+            checked['wrong'] += wrong
+
+        started = time.perf_counter()
+        try:
+            await translate_units(units, batches, scheduler, memory, save)
+        finally:
+            elapsed = time.perf_counter() - started
+            scheduler.stats.report(scheduler.limiter)
+            await scheduler.close()
+            memory.close()
+        stats = scheduler.stats
+        return {
+            'label': label,
+            'mode': per_request,
+            'strings': sum(len(unit.request) for unit in units),
+            'requests': stats.requests,
+            'prompt': stats.prompt_tokens,
+            'completion': stats.completion_tokens,
+            'seconds': elapsed,
+            'failed': len(failed),
+            **checked,
+        }
+
+
+def print_table(results, checked=False):
+    correctness = f" {'correct':>8} {'wrong':>6}" if checked else ""
+    print(f"\n{'run':>10} {'lang/req':>8} {'requests':>9} {'req/s':>6} {'prompt tok':>11} {'compl. tok':>11} "
+          f"{'total tok':>10} {'seconds':>8} {'failed':>7}{correctness}")
+    for r in results:
+        correctness = (f" {r['correct'] / max(r['strings'], 1):>8.1%} {r['wrong']:>6}" if checked else "")
+        print(f"{r['label']:>10} {r['mode']:>8} {r['requests']:>9} {r['requests'] / max(r['seconds'], 1e-9):>6.1f} "
+              f"{r['prompt']:>11} {r['completion']:>11} {r['prompt'] + r['completion']:>10} "
+              f"{r['seconds']:>8.1f} {r['failed']:>7}{correctness}")
+    base = results[0]
+    for r in results[1:]:
+        if r['label'] != base['label']:
+            base = r
+            continue
+        if base['prompt'] and base['seconds']:
+            print(f"{r['label']}: {r['mode']} vs {base['mode']}: prompt tokens x{r['prompt'] / base['prompt']:.2f}, "
+                  f"total tokens x{(r['prompt'] + r['completion']) / max(base['prompt'] + base['completion'], 1):.2f}, "
+                  f"time x{r['seconds'] / base['seconds']:.2f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare per-language and multi-language translation requests")
+    parser.add_argument('--namespace', action='append',
+                        help="namespace of locales/de to translate (repeatable, 'all' for every one; default kultur)")
+    parser.add_argument('--modes', type=int, nargs='+', default=[1, 4], help="languages per request to compare")
+    parser.add_argument('--lang', action='append', help="only this target language (repeatable)")
+    parser.add_argument('--locales', default=LOCALES_DIR, help="path to client/src/locales")
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help="planned reply tokens per request")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rpm', type=int, default=DEFAULT_REQUESTS_PER_MIN, help="requests per minute")
+    parser.add_argument('--tpm', type=int, default=DEFAULT_TOKENS_PER_MIN, help="tokens per minute")
+    parser.add_argument('--base-url', help="OpenAI-compatible endpoint, e.g. a local mock server")
+    parser.add_argument('--mock', nargs='+', choices=MOCK_PROFILES,
+                        help="run against the in-process mock server, once per fault profile, and check the replies")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    languages = args.lang or [lang for lang in LANGUAGES if lang != 'en']
+    requested = args.namespace or ['kultur']
+    names = namespaces(args.locales, None if 'all' in requested else requested)
+
+    if args.mock:
+        results = []
+        for name in args.mock:
+            server = MockServer(Profile(seed=0, **MOCK_PROFILES[name])).start()
+            try:
+                results += [asyncio.run(run_mode(args, names, languages, mode, 'mock', server.base_url, name))
+                            for mode in args.modes]
+            finally:
+                server.stop()
+            print(f"mock server: {server.state.counts}")
+        print_table(results, checked=True)
+        return
+
+    api_key = api_key_from_env(args.base_url)
+    if not api_key:
+        print("Error: OPENAI_API_KEY environment variable not set")
+        sys.exit(1)
+
+    label = 'mock' if args.base_url else 'api'
+    results = [asyncio.run(run_mode(args, names, languages, mode, api_key, args.base_url, label))
+               for mode in args.modes]
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
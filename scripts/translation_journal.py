@@ -0,0 +1,109 @@
+"""
+Append-only journal of finished translation units.
+
+Every unit that comes back from the API - the strings of one batch in one
+language - is appended to a JSONL file and fsync'd before anything else
+happens with it. A run that crashes, times out or is interrupted leaves the
+journal behind; the next run reads it, skips every string it already has and
+only requests the rest. Entries carry a digest of their German source, so a
+string that was edited in the meantime is requested again.
+
+There is one journal per script, prompt version and model under
+scripts/.cache/journals. It is deleted once a run has assembled every
+target file.
+"""
+
+import hashlib
+import json
+import os
+
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'journals')
+
+
+def source_digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def fsync_dir(path):
+    """Make a rename or a new file in a directory durable"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """{(lang, key): (source digest, translation)} backed by an fsync'd JSONL file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.replay()
+        self.file = open(path, 'a', encoding='utf-8')
+        fsync_dir(os.path.dirname(path))
+
+    @classmethod
+    def open(cls, name, prompt_version, model, directory=JOURNAL_DIR):
+        safe = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in f"{name}-{prompt_version}-{model}")
+        return cls(os.path.join(directory, f"{safe}.jsonl"))
+
+    def replay(self):
+        """
+        Load the entries; a line torn by a crash is cut off so new entries start clean.
+
+        A record counts once its newline is written: a last line without one
+        is torn even if it happens to parse, or the next append would run on
+        from it.
+        """
+        if not os.path.exists(self.path):
+            return
+        good = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                    entries = {(record['lang'], key): (digest, text)
+                               for key, (digest, text) in record['items'].items()}
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    break
+                self.entries.update(entries)
+                good += len(line)
+        if good < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(good)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, lang, items):
+        """Return {key: translation} for the {key: source text} already in the journal"""
+        found = {}
+        for key, text in items.items():
+            entry = self.entries.get((lang, key))
+            if entry and entry[0] == source_digest(text):
+                found[key] = entry[1]
+        return found
+
+    def record(self, lang, items, reply):
+        """Durably append the translations in `reply` of the {key: source text} in `items`"""
+        done = {key: (source_digest(items[key]), reply[key]) for key in reply if key in items}
+        if not done:
+            return
+        self.file.write(json.dumps({'lang': lang, 'items': done}, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        for key, entry in done.items():
+            self.entries[(lang, key)] = entry
+
+    def close(self):
+        self.file.close()
+
+    def remove(self):
+        """Close and delete the journal after a complete run"""
+        self.close()
+        os.remove(self.path)
+        self.entries = {}
@@ -0,0 +1,232 @@
+"""
+Persistent string-level translation memory for the translation scripts.
+
+Locale files are translated leaf by leaf: every string value of the source
+JSON is looked up by (SHA-256 of the string, source language, target
+language, prompt version, model). Only the misses are sent to the API, as a
+flat {"path.to.key": "text"} object, and their translations are stored, so a
+re-run after editing one paragraph sends that one paragraph.
+
+Bump a script's PROMPT_VERSION when its prompt or glossary changes; entries
+made with an older prompt or another model are not reused.
+
+Storage is a SQLite file: contexts (languages, prompt version, model) are
+interned once and every entry is a 16-byte digest plus the translated text in
+a WITHOUT ROWID table.
+
+Usage:
+    python translation_memory.py            # entries and hit rates per context
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+TM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'translation_memory.sqlite')
+CHARS_PER_TOKEN = 4
+
+
+def source_digest(text):
+    return hashlib.sha256(text.encode('utf-8')).digest()[:16]
+
+
+def is_translatable(text):
+    """Strings without letters (numbers, punctuation, empty) are copied as they are"""
+    return any(c.isalpha() for c in text)
+
+
+def flatten(value, path=()):
+    """Yield (path tuple, string) for every string leaf of a JSON value"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten(item, path + (key,))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from flatten(item, path + (index,))
+    elif isinstance(value, str):
+        yield path, value
+
+
+def path_key(path):
+    return '.'.join(str(part) for part in path)
+
+
+def assemble(value, translations, path=()):
+    """Copy of a JSON value with every string leaf replaced from {path tuple: text}"""
+    if isinstance(value, dict):
+        return {key: assemble(item, translations, path + (key,)) for key, item in value.items()}
+    if isinstance(value, list):
+        return [assemble(item, translations, path + (index,)) for index, item in enumerate(value)]
+    if isinstance(value, str):
+        return translations.get(path, value)
+    return value
+
+
+class MemoryStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.hit_chars = 0
+        self.miss_chars = 0
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        print(f"Translation memory: {self.hits}/{total} strings from cache ({rate:.0f}%), "
+              f"{self.miss_chars // CHARS_PER_TOKEN} source tokens sent, "
+              f"~{self.hit_chars // CHARS_PER_TOKEN} saved")
+
+
+class TranslationMemory:
+    """SQLite-backed memory of translated strings"""
+
+    def __init__(self, path=TM_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.stats = MemoryStats()
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS contexts (
+                id INTEGER PRIMARY KEY, source_lang TEXT, target_lang TEXT,
+                prompt_version TEXT, model TEXT, hits INTEGER DEFAULT 0, misses INTEGER DEFAULT 0,
+                UNIQUE (source_lang, target_lang, prompt_version, model)
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                context INTEGER, digest BLOB, target TEXT, created REAL,
+                PRIMARY KEY (context, digest)
+            ) WITHOUT ROWID;
+        """)
+        self.contexts = {}
+
+    def context_id(self, source_lang, target_lang, prompt_version, model):
+        key = (source_lang, target_lang, prompt_version, model)
+        if key not in self.contexts:
+            self.db.execute("INSERT OR IGNORE INTO contexts (source_lang, target_lang, prompt_version, model) "
+                            "VALUES (?, ?, ?, ?)", key)
+            self.contexts[key] = self.db.execute(
+                "SELECT id FROM contexts WHERE source_lang = ? AND target_lang = ? "
+                "AND prompt_version = ? AND model = ?", key
+            ).fetchone()[0]
+        return self.contexts[key]
+
+    def get_many(self, context, texts):
+        """Return {source text: translation} for the texts that are in memory"""
+        found = {}
+        by_digest = {source_digest(text): text for text in texts}
+        digests = list(by_digest)
+        for start in range(0, len(digests), 500):
+            chunk = digests[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT digest, target FROM entries WHERE context = ? AND digest IN ({','.join('?' * len(chunk))})",
+                [context, *chunk]
+            )
+            for digest, target in rows:
+                found[by_digest[digest]] = target
+        return found
+
+    def put_many(self, context, pairs):
+        """Store {source text: translation}"""
+        now = time.time()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            [(context, source_digest(source), target, now) for source, target in pairs.items()]
+        )
+        self.db.commit()
+
+    def record(self, context, hits, misses):
+        self.db.execute("UPDATE contexts SET hits = hits + ?, misses = misses + ? WHERE id = ?",
+                        (hits, misses, context))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def split_json(memory, source_json, source_lang, target_lang, prompt_version, model, refresh=()):
+    """
+    Look up every string of a JSON document.
+
+    Returns (context, translations, missing): translations maps path tuples
+    to cached or copied strings, missing is the flat {path key: text} object
+    still to be translated, one entry per distinct string. Texts in `refresh`
+    are not taken from the memory (their stored translation is known bad).
+    """
+    context = memory.context_id(source_lang, target_lang, prompt_version, model)
+    leaves = list(flatten(source_json))
+    texts = {text for _, text in leaves if is_translatable(text)}
+    cached = memory.get_many(context, texts - set(refresh))
+
+    translations = {}
+    missing = {}
+    requested = set()
+    for path, text in leaves:
+        if not is_translatable(text):
+            translations[path] = text
+        elif text in cached:
+            translations[path] = cached[text]
+            memory.stats.hits += 1
+            memory.stats.hit_chars += len(text)
+        elif text not in requested:
+            requested.add(text)
+            missing[path_key(path)] = text
+            memory.stats.misses += 1
+            memory.stats.miss_chars += len(text)
+    memory.record(context, len(texts & cached.keys()), len(requested))
+    return context, translations, missing
+
+
+def merge_json(memory, context, source_json, translations, missing, translated):
+    """
+    Store the API's translation of `missing` and return the assembled document.
+
+    Keys the API dropped or returned as non-strings keep the source text and
+    are not stored, so they are requested again next time.
+    """
+    learned = {}
+    for key, text in missing.items():
+        value = translated.get(key) if isinstance(translated, dict) else None
+        if isinstance(value, str) and value.strip():
+            learned[text] = value
+    memory.put_many(context, learned)
+    for path, text in flatten(source_json):
+        if path not in translations and text in learned:
+            translations[path] = learned[text]
+    return assemble(source_json, translations)
+
+
+def translate_json_cached(memory, source_json, source_lang, target_lang, prompt_version, model, translate_fn):
+    """
+    Translate a JSON document through the memory.
+
+    `translate_fn(flat_json)` gets {path key: text} for the strings that are
+    not in memory and returns the same keys translated; it is not called at
+    all when everything is cached.
+    """
+    context, translations, missing = split_json(memory, source_json, source_lang, target_lang,
+                                                prompt_version, model)
+    translated = translate_fn(missing) if missing else {}
+    return merge_json(memory, context, source_json, translations, missing, translated)
+
+
+def main():
+    if not os.path.exists(TM_PATH):
+        print(f"No translation memory at {TM_PATH}")
+        return
+    memory = TranslationMemory()
+    rows = memory.db.execute("""
+        SELECT c.source_lang, c.target_lang, c.prompt_version, c.model, c.hits, c.misses, COUNT(e.digest)
+        FROM contexts c LEFT JOIN entries e ON e.context = c.id
+        GROUP BY c.id ORDER BY c.prompt_version, c.target_lang
+    """).fetchall()
+    for source_lang, target_lang, version, model, hits, misses, entries in rows:
+        total = hits + misses
+        rate = hits / total * 100 if total else 0.0
+        print(f"{version:<28} {model:<14} {source_lang}->{target_lang:<4} "
+              f"{entries:6d} entries  {rate:5.1f}% hit rate ({hits}/{total})")
+    print(f"{os.path.getsize(TM_PATH) / 1e6:.1f} MB")
+    memory.close()
+
+
+if __name__ == "__main__":
+    main()
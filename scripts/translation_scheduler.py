@@ -0,0 +1,333 @@
+"""
+Concurrent translation scheduler for locale_diff.py.
+
+Work is split into jobs - one chat completion each, typically one
+(language, section) unit - and run concurrently on a single AsyncOpenAI
+client, so every request reuses the same connection pool. At most
+`concurrency` requests are in flight.
+
+`RateLimiter` keeps two token buckets, requests/min and tokens/min. A job
+reserves its estimated tokens before it is sent and the difference to the
+reported usage is settled afterwards. A 429 pauses every job for the
+server's Retry-After (or an exponential backoff when there is none) and
+halves the effective rate; successes slowly restore it. Timeouts, connection
+errors and 5xx responses are retried with backoff; a job that still fails is
+reported as failed instead of stopping the run. A reply cut off at max_tokens
+is not retried - the same request would be cut off again - but marked
+`truncated`, so the caller can split it. A reply without choices or content
+(content filter, refusal) fails its job without a retry.
+
+The client honours OPENAI_BASE_URL or an explicit base_url, so the whole
+pipeline can run against a local mock server.
+"""
+
+import asyncio
+import email.utils
+import json
+import random
+import time
+
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError
+
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_CONCURRENCY = 8
+# Tier-1 style defaults; override per account
+DEFAULT_REQUESTS_PER_MIN = 500
+DEFAULT_TOKENS_PER_MIN = 200_000
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0   # seconds, doubled per attempt
+BACKOFF_MAX = 60.0
+# Rough size of a token for estimates before the API reports usage
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(messages, output_ratio=1.3):
+    """Estimate prompt plus completion tokens; a translation is about as long as its input"""
+    prompt = sum(len(m['content']) for m in messages) // CHARS_PER_TOKEN
+    return prompt + int(prompt * output_ratio)
+
+
+def parse_json_reply(text):
+    """Parse a JSON reply, tolerating a ```json fence around it"""
+    result = text.strip()
+    if result.startswith('```'):
+        lines = result.split('\n')
+        if lines[-1].strip() == '```':
+            result = '\n'.join(lines[1:-1])
+        else:
+            result = '\n'.join(lines[1:])
+    if result.startswith('json'):
+        result = result[4:].strip()
+    return json.loads(result)
+
+
+def retry_after_seconds(error):
+    """Seconds from a Retry-After / retry-after-ms header of an API error, or None"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    if headers.get('retry-after-ms'):
+        try:
+            return float(headers['retry-after-ms']) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):  # neither seconds nor an HTTP date: use the backoff
+        return None
+    return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+def backoff(attempt):
+    """Exponential backoff with jitter for the given (1-based) attempt"""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+    return delay * (0.5 + random.random() / 2)
+
+
+class TruncatedReply(Exception):
+    """The reply stopped at max_tokens"""
+
+
+class EmptyReply(Exception):
+    """The reply has no choices or no content (content filter or refusal)"""
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, holding at most one minute's worth"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, scale):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60 * scale)
+        self.updated = now
+
+    def wait_time(self, amount, scale):
+        """Seconds until `amount` is available (0 if it is); oversized amounts wait for a full bucket"""
+        self.refill(scale)
+        needed = min(amount, self.capacity) - self.tokens
+        return max(0.0, needed / (self.capacity / 60 * scale))
+
+    def take(self, amount):
+        # May go negative for oversized requests; the debt is paid by the refill
+        self.tokens -= amount
+
+    def settle(self, difference):
+        """Correct an earlier take by the difference between actual and estimated use"""
+        self.tokens = min(self.capacity, self.tokens - difference)
+
+
+class RateLimiter:
+    """
+    Requests/min and tokens/min limits with a shared pause for 429s.
+
+    The effective rate is scaled down on every 429 and recovers by 5% per
+    `recover_after` consecutive successes, so the scheduler settles just
+    below the limit the server actually enforces.
+    """
+
+    def __init__(self, requests_per_min=DEFAULT_REQUESTS_PER_MIN, tokens_per_min=DEFAULT_TOKENS_PER_MIN,
+                 min_scale=0.1, recover_after=10):
+        self.requests = TokenBucket(requests_per_min)
+        self.tokens = TokenBucket(tokens_per_min)
+        self.scale = 1.0
+        self.min_scale = min_scale
+        self.recover_after = recover_after
+        self.successes = 0
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+        self.throttled = 0
+
+    async def acquire(self, tokens):
+        """Wait until one request with `tokens` tokens may be sent"""
+        # The lock makes waiters line up in order instead of racing for each refill
+        async with self.lock:
+            while True:
+                delay = max(self.paused_until - time.monotonic(),
+                            self.requests.wait_time(1, self.scale),
+                            self.tokens.wait_time(tokens, self.scale))
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+    def settle(self, estimated, actual):
+        if actual:
+            self.tokens.settle(actual - estimated)
+
+    def success(self):
+        self.successes += 1
+        if self.successes >= self.recover_after and self.scale < 1.0:
+            self.scale = min(1.0, self.scale * 1.05)
+            self.successes = 0
+
+    def throttle(self, retry_after, attempt):
+        """Pause everyone after a 429 and slow down"""
+        self.throttled += 1
+        self.successes = 0
+        self.scale = max(self.min_scale, self.scale / 2)
+        delay = retry_after if retry_after is not None else backoff(attempt)
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+
+class Job:
+    """One chat completion; `result` is the parsed JSON reply once it succeeded"""
+
+    def __init__(self, key, messages, max_tokens=8000, temperature=0.2, salvage=None):
+        self.key = key
+        self.messages = messages
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.estimated_tokens = estimate_tokens(messages)
+        self.attempts = 0
+        self.result = None
+        self.error = None
+        self.usage = 0
+        self.elapsed = 0.0
+        self.truncated = False
+        # salvage(text) -> what can be used of a reply that is not valid JSON, or a falsy value
+        self.salvage = salvage
+        self.salvaged = False
+
+    @property
+    def ok(self):
+        return self.error is None and self.result is not None
+
+
+class SchedulerStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.done = 0
+        self.failed = 0
+        self.retries = 0
+        self.truncated = 0
+        self.tokens = 0
+        # Answered requests and their reported usage, retries included
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def report(self, limiter=None):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        throttled = f", {limiter.throttled} rate-limited" if limiter else ""
+        truncated = f", {self.truncated} cut off" if self.truncated else ""
+        print(f"{self.done} jobs in {elapsed:.1f}s ({self.done / elapsed:.2f} jobs/s, "
+              f"{self.tokens / elapsed * 60:.0f} tokens/min), {self.failed} failed, "
+              f"{self.retries} retries{throttled}{truncated}")
+
+
+class Scheduler:
+    """Runs jobs concurrently on one shared client under a RateLimiter"""
+
+    def __init__(self, client=None, limiter=None, concurrency=DEFAULT_CONCURRENCY,
+                 model=DEFAULT_MODEL, max_attempts=MAX_ATTEMPTS, timeout=60, base_url=None, api_key=None):
+        # One client for all jobs: every request goes through the same connection pool.
+        # The SDK's own retries are off so 429s reach the shared limiter.
+        self.client = client or AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.limiter = limiter or RateLimiter()
+        self.concurrency = concurrency
+        self.model = model
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.stats = SchedulerStats()
+
+    async def call(self, job):
+        await self.limiter.acquire(job.estimated_tokens)
+        started = time.perf_counter()
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=job.messages,
+            temperature=job.temperature,
+            max_tokens=job.max_tokens,
+            timeout=self.timeout,
+        )
+        job.elapsed = time.perf_counter() - started
+        usage = getattr(response, 'usage', None)
+        job.usage = getattr(usage, 'total_tokens', 0) or 0
+        self.stats.requests += 1
+        self.stats.prompt_tokens += getattr(usage, 'prompt_tokens', 0) or 0
+        self.stats.completion_tokens += getattr(usage, 'completion_tokens', 0) or 0
+        self.limiter.settle(job.estimated_tokens, job.usage)
+        if not response.choices:
+            raise EmptyReply("no choices in the response")
+        choice = response.choices[0]
+        if choice.finish_reason == 'length':
+            raise TruncatedReply(f"reply cut off at max_tokens={job.max_tokens}")
+        if choice.message.content is None:
+            refusal = getattr(choice.message, 'refusal', None)
+            raise EmptyReply(f"no content (finish_reason={choice.finish_reason})" + (f": {refusal}" if refusal else ""))
+        try:
+            return parse_json_reply(choice.message.content)
+        except ValueError:
+            salvaged = job.salvage(choice.message.content) if job.salvage else None
+            if not salvaged:
+                raise
+            job.salvaged = True
+            return salvaged
+
+    async def run_job(self, job):
+        while job.attempts < self.max_attempts:
+            job.attempts += 1
+            try:
+                job.result = await self.call(job)
+                job.error = None
+                self.limiter.success()
+                return job
+            except APIStatusError as e:
+                job.error = f"HTTP {e.status_code}: {e.message}"
+                if e.status_code == 429:
+                    self.limiter.throttle(retry_after_seconds(e), job.attempts)
+                elif e.status_code < 500 and e.status_code != 408:
+                    return job  # a bad request does not get better by retrying
+                else:
+                    await asyncio.sleep(retry_after_seconds(e) or backoff(job.attempts))
+            except TruncatedReply as e:
+                job.error = str(e)
+                job.truncated = True
+                return job
+            except EmptyReply as e:
+                job.error = f"Empty reply: {e}"
+                return job  # a filtered or refused request gets the same answer again
+            except (APITimeoutError, APIConnectionError) as e:
+                job.error = f"{type(e).__name__}: {e}"
+                await asyncio.sleep(backoff(job.attempts))
+            except ValueError as e:  # truncated or otherwise invalid JSON
+                job.error = f"Invalid JSON reply: {e}"
+                await asyncio.sleep(backoff(job.attempts))
+            self.stats.retries += 1
+        self.stats.retries -= 1  # the last failed attempt is not a retry
+        return job
+
+    async def run(self, jobs, on_done=None):
+        """
+        Run all jobs and return them once they are finished.
+
+        `on_done(job)` is called as each job finishes, in completion order.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def worker(job):
+            async with semaphore:
+                await self.run_job(job)
+            self.stats.done += 1
+            self.stats.failed += int(not job.ok and not job.truncated)
+            self.stats.truncated += int(job.truncated)
+            self.stats.tokens += job.usage
+            if on_done:
+                on_done(job)
+            return job
+
+        return await asyncio.gather(*(worker(job) for job in jobs))
+
+    async def close(self):
+        await self.client.close()
@@ -0,0 +1,118 @@
+"""
+Validation and salvage of translation replies.
+
+A reply is checked leaf by leaf against the strings that were sent: every key
+must come back as a non-empty string with the same HTML tags and the same
+interpolation placeholders as its German source. Replies that re-nest the
+dotted keys ({"page": {"title": ...}} for "page.title") are flattened back
+first. Leaves that fail are re-requested on their own; the others are kept.
+
+A reply that is not valid JSON at all - one stray quote, a cut-off tail - is
+salvaged: every complete "key": "value" pair that can still be read is
+recovered, so only the unreadable part is asked for again.
+"""
+
+import json
+import re
+from collections import Counter
+
+# <strong>, </em>, <a href="...">, <br/>; attributes are not compared
+TAG_PATTERN = re.compile(r'<\s*(/?)\s*([a-zA-Z][a-zA-Z0-9]*)\b[^<>]*?(/?)\s*>')
+# i18next {{count}}, $t(key), ICU/format {name}, printf %s / %1$s
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*[^{}]+?\s*\}\}|\$t\([^)]*\)|\{[A-Za-z_][A-Za-z0-9_]*\}|%(?:\d+\$)?[sdif]')
+STRING = r'"((?:[^"\\]|\\.)*)"'
+# A pair only counts between separators, so a value broken by a stray quote is not cut short
+PAIR_PATTERN = re.compile(r'[{,]\s*' + STRING + r'\s*:\s*' + STRING + r'(?=\s*[,}])')
+LANGUAGE_OBJECT = re.compile(STRING + r'\s*:\s*\{')
+
+
+def tags(text):
+    return Counter((closing, name.lower(), self_closing) for closing, name, self_closing in TAG_PATTERN.findall(text))
+
+
+def placeholders(text):
+    return Counter(match.replace(' ', '') for match in PLACEHOLDER_PATTERN.findall(text))
+
+
+def leaf_problem(source, translation):
+    """Why a translated leaf is not acceptable, or None"""
+    if not isinstance(translation, str) or not translation.strip():
+        return "missing"
+    if tags(source) != tags(translation):
+        return "HTML tags differ"
+    if placeholders(source) != placeholders(translation):
+        return "placeholders differ"
+    return None
+
+
+def flatten_reply(reply, prefix=''):
+    """Flatten a reply that re-nested dotted keys back into {dotted key: value}"""
+    flat = {}
+    for key, value in reply.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten_reply(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+
+def check_reply(items, reply):
+    """
+    Compare a reply for one language with the {key: source text} that was sent.
+
+    Returns (good, problems): the translations that pass, and
+    {key: reason} for every key that has to be asked for again.
+    """
+    flat = flatten_reply(reply) if isinstance(reply, dict) else {}
+    good, problems = {}, {}
+    for key, source in items.items():
+        problem = leaf_problem(source, flat.get(key))
+        if problem:
+            problems[key] = problem
+        else:
+            good[key] = flat[key]
+    return good, problems
+
+
+def _unquote(raw):
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return None
+
+
+def salvage_pairs(text):
+    """Every readable "key": "string" pair of a broken JSON text"""
+    pairs = {}
+    for raw_key, raw_value in PAIR_PATTERN.findall(text):
+        key, value = _unquote(raw_key), _unquote(raw_value)
+        if key is not None and value is not None:
+            pairs[key] = value
+    return pairs
+
+
+def salvage_reply(text, langs):
+    """
+    Recover what can be read from a reply that is not valid JSON.
+
+    For a single language that is the flat pairs; for several it is the pairs
+    found after each '"<lang>": {' up to the next language. Returns {} if
+    nothing could be read.
+    """
+    if len(langs) == 1:
+        return salvage_pairs(text)
+    starts = sorted((match.start(), match.end(), _unquote(match.group(1)))
+                    for match in LANGUAGE_OBJECT.finditer(text) if _unquote(match.group(1)) in langs)
+    result = {}
+    for i, (_, end, lang) in enumerate(starts):
+        stop = starts[i + 1][0] if i + 1 < len(starts) else len(text)
+        pairs = salvage_pairs(text[end - 1:stop])  # from the opening brace
+        if pairs:
+            result[lang] = pairs
+    return result
+
+
+def summarize(problems):
+    """'2 HTML tags differ, 1 missing' for a {key: reason} dict"""
+    return ', '.join(f"{count} {reason}" for reason, count in Counter(problems.values()).most_common())
@@ -1,15 +1,11 @@
-import json
 import os
+import sys
 
-# Path to the studies database
-studies_path = '/home/ubuntu/kava-wiki/client/src/data/studies.json'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from study_patches import run
 
-# Load the database
-with open(studies_path, 'r', encoding='utf-8') as f:
-    studies = json.load(f)
-
-# Dictionary mapping titles (or parts of titles) to their German translations
-translations = {
+# Dictionary mapping titles to their German translations
+TITLE_FIXES = {
     "Inhibition of Human Cytochrome P450 Activities by Kava Extract and Kavalactones": {
         "summary": "Diese Studie untersucht die hemmende Wirkung von Kava-Extrakt und einzelnen Kavalactonen auf menschliche Cytochrom-P450-Enzyme. Die Ergebnisse zeigen, dass Kava signifikante Wechselwirkungen mit bestimmten CYP-Enzymen haben kann, was für das Verständnis potenzieller Arzneimittelwechselwirkungen von Bedeutung ist."
     },
@@ -60,51 +56,8 @@ translations = {
     }
 }
 
-# Normalize titles for easier matching (lowercase, remove extra spaces)
-def normalize(text):
-    return " ".join(text.lower().split())
-
-# Create a normalized mapping
-normalized_translations = {normalize(k): v for k, v in translations.items()}
-
-updated_count = 0
-not_found = []
-
-for study in studies:
-    title = normalize(study.get('title', ''))
-    
-    # Try exact match first
-    if title in normalized_translations:
-        study['summary'] = normalized_translations[title]['summary']
-        updated_count += 1
-        print(f"Updated: {study['title']}")
-        continue
-        
-    # Try partial match if exact match fails
-    matched = False
-    for key, val in normalized_translations.items():
-        if key in title or title in key:
-            # Check if similarity is high enough to be sure (simple heuristic)
-            if len(key) > 10 and (key in title or title in key):
-                study['summary'] = val['summary']
-                updated_count += 1
-                print(f"Updated (partial match): {study['title']}")
-                matched = True
-                break
-    
-    if not matched:
-        # Check if this is one of the target titles but wasn't matched
-        for target_title in translations.keys():
-            if normalize(target_title) == title:
-                 # This should have been caught by exact match, but just in case
-                 study['summary'] = translations[target_title]['summary']
-                 updated_count += 1
-                 print(f"Updated (fallback): {study['title']}")
-                 matched = True
-                 break
-
-# Save the updated database
-with open(studies_path, 'w', encoding='utf-8') as f:
-    json.dump(studies, f, indent=2, ensure_ascii=False)
+# Titles are matched by trigram similarity; ambiguous matches are reported, not applied
+TITLE_MATCH = "fuzzy"
 
-print(f"\nTotal studies updated: {updated_count}")
+if __name__ == "__main__":
+    run([__file__])